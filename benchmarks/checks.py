@@ -0,0 +1,478 @@
+# Behaviour checks for the engine's optimizations: each one compares a fast path against the plain one, or checks a case
+# that used to break. Run all of them, or only some by name:
+#   python benchmarks/checks.py
+#   python benchmarks/checks.py tunnelling
+# The script exits with 1 when a check fails
+import argparse
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import infinova
+import pygame
+
+checks = {}
+
+def check(function):
+    checks[function.__name__] = function
+    return function
+
+def createBody(geometry: infinova.Geometry, isStatic: bool = False):
+    return infinova.GameObject(geometry, components=[infinova.physics.Rigidbody(infinova.physics.Material(), isStatic)])
+
+# Boxes, rotated boxes, circles and capsules dropped on a floor and onto each other
+def createPile(layer, count: int = 60, seed: int = 0):
+    random.seed(seed)
+    layer.SetGravity((0, 400))
+    layer.AddObject(createBody(infinova.Geometry(320, 460, (600, 40)), True))
+    bodies = []
+    for i in range(count):
+        x, y = 60 + (i % 12) * 44 + random.uniform(-4, 4), 400 - (i // 12) * 44
+        match i % 4:
+            case 0: geometry = infinova.Geometry(x, y, (34, 30))
+            case 1: geometry = infinova.Geometry(x, y, 16)
+            case 2: geometry = infinova.Geometry(x, y, (30, 26)); geometry.Rotate(random.uniform(0, 90))
+            case 3: geometry = infinova.Geometry(x, y, 10, 16)
+        bodies.append(createBody(geometry))
+        layer.AddObject(bodies[-1])
+    return bodies
+
+def stepPositions(layer, bodies: list, frames: int):
+    for _ in range(frames):
+        layer.Update(1 / 60)
+    return [(body.geometry.position.x, body.geometry.position.y, body.geometry.angle) for body in bodies]
+
+def largestDistance(a: list, b: list):
+    return max(max(abs(x - y) for x, y in zip(first, second)) for first, second in zip(a, b))
+
+# Every broad phase has to find the same pairs as checking all of them, so the bodies end up in exactly the same places
+@check
+def broadPhases():
+    results = {}
+    for name in ("bruteforce", "grid", "sap", "tree"):
+        layer = infinova.layer.PhysicsLayer(name)
+        layer.SetBroadPhase(name)
+        bodies = createPile(layer, 36)
+        results[name] = stepPositions(layer, bodies, 90)
+    return [f"{name}: bodies are up to {largestDistance(positions, results['bruteforce'])} away from the brute force ones" 
+            for name, positions in results.items() if positions != results["bruteforce"]]
+
+# Scene queries through every broad phase have to give the same answers as brute force, also after bodies were moved
+@check
+def sceneQueries():
+    def answerQueries(name: str):
+        random.seed(1)
+        layer = infinova.layer.PhysicsLayer(name)
+        layer.SetBroadPhase(name)
+        bodies = []
+        for i in range(300):
+            x, y = random.uniform(0, 2000), random.uniform(0, 2000)
+            bodies.append(createBody(infinova.Geometry(x, y, random.uniform(5, 30)) if i % 2 else infinova.Geometry(x, y, (random.uniform(10, 60), random.uniform(10, 60)))))
+            layer.AddObject(bodies[-1])
+
+        indices = {body: i for i, body in enumerate(bodies)}
+        answers = []
+        for _ in range(3):
+            for _ in range(40):
+                x, y = random.uniform(0, 2000), random.uniform(0, 2000)
+                answers.append(sorted(indices[body] for body in layer.QueryAABB((x, y, random.uniform(10, 400), random.uniform(10, 400)))))
+                answers.append(sorted(indices[body] for body in layer.QueryPoint((x, y))))
+                answers.append(sorted(indices[body] for body in layer.OverlapShape(infinova.Geometry(x, y, random.uniform(10, 80)))))
+                hit = layer.RayCast((x, y), (random.uniform(0, 2000), random.uniform(0, 2000)))
+                answers.append((indices[hit.gameObject], round(hit.fraction, 9)) if hit else None)
+
+            for body in random.sample(bodies, 60):
+                body.geometry.Move((random.uniform(-300, 300), random.uniform(-300, 300)))
+        return answers
+
+    expected = answerQueries("bruteforce")
+    failures = []
+    for name in ("grid", "sap", "tree"):
+        wrong = sum(answer != expectedAnswer for answer, expectedAnswer in zip(answerQueries(name), expected))
+        if wrong:
+            failures.append(f"{name}: {wrong} of {len(expected)} answers differ from brute force")
+    return failures
+
+# The axis-aligned fast paths of "IntersectGeometries" have to agree with the separating axis test on the box's vertices
+@check
+def shapeFastPaths():
+    collisions = infinova.geometry.collisions
+    random.seed(4)
+    failures = []
+    for i in range(3000):
+        box = infinova.Geometry(random.uniform(-40, 40), random.uniform(-40, 40), (random.uniform(5, 60), random.uniform(5, 60)))
+        if i % 2:
+            other = infinova.Geometry(random.uniform(-40, 40), random.uniform(-40, 40), (random.uniform(5, 60), random.uniform(5, 60)))
+            fast = collisions.IntersectGeometries(box, other)
+            plain = collisions.IntersectPolygons(box.GetTransformedVertices(), box.position, other.GetTransformedVertices(), other.position)
+        else:
+            other = infinova.Geometry(random.uniform(-40, 40), random.uniform(-40, 40), random.uniform(3, 30))
+            fast = collisions.IntersectGeometries(box, other)
+            plain = collisions.IntersectPolygonCircle(box.GetTransformedVertices(), box.position, other.radius, other.position, True)
+
+        if fast[0] != plain[0] or (fast[0] and ((fast[1] - plain[1]).length() > 1e-6 or abs(fast[2] - plain[2]) > 1e-6)):
+            failures.append(f"{box} and {other}: {fast} instead of {plain}")
+    return failures[:5]
+
+# The NumPy separating axis test of many polygon pairs at once has to match the test of one pair at a time
+@check
+def batchedSeparatingAxes():
+    collisions = infinova.geometry.collisions
+    random.seed(5)
+    geometries = []
+    for i in range(2000):
+        x, y = random.uniform(-40, 40), random.uniform(-40, 40)
+        if i % 3:
+            geometry = infinova.Geometry(x, y, (random.uniform(5, 60), random.uniform(5, 60)))
+        else:
+            geometry = infinova.Geometry(x, y, [(random.uniform(-25, 25), random.uniform(-25, 25)) for _ in range(random.randint(3, 6))])
+        geometry.Rotate(random.uniform(0, 360))
+        geometries.append(geometry)
+
+    pairs = list(zip(geometries[::2], geometries[1::2]))
+    batched = collisions.IntersectPolygonsBatch([first.GetTransformedVertices() for first, _ in pairs], [first.position for first, _ in pairs],
+                                                [second.GetTransformedVertices() for _, second in pairs], [second.position for _, second in pairs])
+    failures = []
+    for (first, second), fast in zip(pairs, batched):
+        plain = collisions.IntersectPolygons(first.GetTransformedVertices(), first.position, second.GetTransformedVertices(), second.position)
+        if fast[0] != plain[0] or (fast[0] and ((fast[1] - plain[1]).length() > 1e-6 or abs(fast[2] - plain[2]) > 1e-6)):
+            failures.append(f"{first} and {second}: {fast} instead of {plain}")
+
+    # Through a layer the bodies end up in exactly the same places
+    results = []
+    for batched in (False, True):
+        layer = infinova.layer.PhysicsLayer("Batched Narrow Phase")
+        if batched:
+            layer.EnableBatchedNarrowPhase()
+        bodies = createPile(layer, 36)
+        results.append(stepPositions(layer, bodies, 90))
+    if results[0] != results[1]:
+        failures.append(f"layer: bodies are up to {largestDistance(*results)} away from the unbatched ones")
+    return failures[:5]
+
+# Islands stepped in worker processes have to end up exactly where the layer puts them alone, for any number of workers
+@check
+def parallelIslands():
+    def stepPiles(workers: int):
+        random.seed(6)
+        layer = infinova.layer.PhysicsLayer("Islands")
+        layer.SetBroadPhase("grid")
+        layer.EnableFixedTimestep(60, interpolation=False)
+        bodies = []
+        for pile in range(6):
+            layer.AddObject(createBody(infinova.Geometry(pile * 200, 600, (160, 40)), True))
+            for i in range(8):
+                bodies.append(createBody(infinova.Geometry(pile * 200 + (i % 4) * 32 - 48 + random.uniform(-2, 2), 560 - (i // 4) * 32, (30, 30))))
+                layer.AddObject(bodies[-1])
+
+        if workers:
+            layer.EnableParallelIslands(workers, minBodies=0)
+        positions = stepPositions(layer, bodies, 90)
+        layer.DisableParallelIslands()
+        return positions
+
+    serial = stepPiles(0)
+    failures = []
+    for workers in (1, 3):
+        positions = stepPiles(workers)
+        if positions != serial:
+            failures.append(f"{workers} workers: bodies are up to {largestDistance(positions, serial)} away from the serial ones")
+    return failures
+
+# Bodies integrated by a "RigidbodyBatch" have to end up exactly where they get integrated one by one,
+# with the frame's time step and with a fixed one
+@check
+def batchedIntegration():
+    failures = []
+    for fixed in (False, True):
+        results = []
+        for batched in (False, True):
+            layer = infinova.layer.PhysicsLayer("Batched Integration")
+            if fixed:
+                layer.EnableFixedTimestep(60, interpolation=False)
+            bodies = createPile(layer, 36)
+            if batched:
+                layer.EnableBatchedIntegration(0)
+            results.append(stepPositions(layer, bodies, 90))
+        if results[0] != results[1]:
+            failures.append(f"{'fixed' if fixed else 'frame'} time step: bodies are up to {largestDistance(*results)} away from the unbatched ones")
+    return failures
+
+# With a fixed time step the bodies don't depend on how the time is split into frames. The frame times are binary fractions,
+# so the accumulator counts the same steps for both splits
+@check
+def fixedTimestep():
+    results = []
+    for frameTimes in ([1 / 64] * 120, [3 / 128, 1 / 128] * 60):
+        layer = infinova.layer.PhysicsLayer("Fixed Timestep")
+        layer.EnableFixedTimestep(64, interpolation=False)
+        bodies = createPile(layer, 36)
+        for dt in frameTimes:
+            layer.Update(dt)
+        results.append([(body.geometry.position.x, body.geometry.position.y, body.geometry.angle) for body in bodies])
+    if results[0] != results[1]:
+        return [f"bodies are up to {largestDistance(*results)} away from the ones stepped with even frames"]
+    return []
+
+# A fast body must stop at a thin wall with continuous collision, whichever way the layer integrates bodies
+@check
+def tunnelling():
+    failures = []
+    for mode in ("frame", "fixed", "iterative"):
+        layer = infinova.layer.PhysicsLayer("Tunnelling")
+        layer.SetGravity((0, 0))
+        layer.AddObject(createBody(infinova.Geometry(300, 100, (4, 200)), True))
+        bullet = createBody(infinova.Geometry(100, 100, 5))
+        layer.AddObject(bullet)
+        rigidbody = bullet.GetComponent(infinova.physics.Rigidbody)
+        rigidbody.linearVelocity = (1500, 0)
+        rigidbody.EnableContinuousCollision()
+        if mode == "fixed":
+            layer.EnableFixedTimestep(60, interpolation=False)
+        elif mode == "iterative":
+            layer.EnableIterativeSolver()
+
+        for _ in range(60):
+            layer.Update(1 / 60)
+        if bullet.geometry.position.x > 300:
+            failures.append(f"{mode}: the body went through the wall to x = {bullet.geometry.position.x:.1f}")
+    return failures
+
+# Shape casts must leave the cast geometry as it was, also when it belongs to a body of the layer
+@check
+def shapeCast():
+    layer = infinova.layer.PhysicsLayer("Shape Cast")
+    layer.AddObject(createBody(infinova.Geometry(300, 100, (20, 200)), True))
+    body = createBody(infinova.Geometry(100, 100, (30, 20)))
+    body.geometry.Rotate(20)
+    layer.AddObject(body)
+
+    failures = []
+    for geometry in (body.geometry, infinova.Geometry(100, 160, 10), infinova.Geometry(100, 160, 8, 20)):
+        version, position, aabb = geometry.version, geometry.position, geometry.GetAABB()
+        aabb = (tuple(aabb.min), tuple(aabb.max))
+        hit = layer.ShapeCast(geometry, (500, position.y))
+        if hit is None or not 250 < hit.point.x < 300:
+            failures.append(f"{geometry.GetStringShape()}: the cast missed the wall, {hit}")
+        if geometry.version != version or geometry.position != position or (tuple(geometry.GetAABB().min), tuple(geometry.GetAABB().max)) != aabb:
+            failures.append(f"{geometry.GetStringShape()}: the cast changed the geometry")
+    return failures
+
+# Images with the same original and transform share cached or baked surfaces, drawing on "Image.current" of one of them
+# must not show up on the others
+@check
+def sharedSurfaces():
+    failures = []
+    for baked in (False, True):
+        original = infinova.Image("shared", 20, 20)
+        original.Fill((40, 40, 200))
+        if baked:
+            original.BakeRotations(8)
+        images = [original.Copy() for _ in range(3)]
+        for image in images:
+            image.rotation = 45
+            image.GetSurface()
+
+        pygame.draw.rect(images[0].current, (255, 0, 0), (0, 0, 5, 5))
+        if images[0].GetSurface().get_at((2, 2))[:3] != (255, 0, 0):
+            failures.append(f"baked = {baked}: the drawing is missing from the drawn image")
+        for image in images[1:]:
+            if image.GetSurface().get_at((2, 2))[:3] == (255, 0, 0):
+                failures.append(f"baked = {baked}: the drawing shows up on another image")
+        images[1].rotation = 0
+        images[1].rotation = 45
+        if images[1].GetSurface().get_at((2, 2))[:3] == (255, 0, 0):
+            failures.append(f"baked = {baked}: the drawing shows up on the surface taken from the cache again")
+    return failures
+
+def renderLayer(layer, cameraPosition: tuple[float, float]):
+    surface = pygame.Surface((640, 480))
+    surface.fill((255, 255, 255))
+    layer.Render(surface, pygame.Vector2(cameraPosition))
+    return surface
+
+def countDifferentPixels(a: pygame.Surface, b: pygame.Surface):
+    mask = pygame.mask.from_threshold(a, (0, 0, 0), (1, 1, 1, 255), b, 1)
+    return a.width * a.height - mask.count()
+
+CAMERAS = [(0, 0), (37.5, -21), (37.4, -21.3), (-250.7, 160.2)]
+
+# Baked chunks have to look the same as the objects drawn one by one, also at float positions and with a fractional camera.
+# Only without a zoom, zoomed chunks are scaled as a whole
+@check
+def baking():
+    random.seed(2)
+    images = []
+    for color in ((200, 40, 40), (40, 200, 40), (40, 40, 200)):
+        image = infinova.Image("baked", 21, 13)
+        image.Fill(color)
+        image.DrawRect((255, 255, 0), (3, 3, 7, 5))
+        images.append(image)
+
+    layer = infinova.layer.ObjectsLayer("Baking")
+    for i in range(300):
+        gameObject = infinova.GameObject(infinova.Geometry(random.uniform(-700, 700), random.uniform(-500, 500), (21, 13)))
+        gameObject.image = images[i % 3].Copy()
+        gameObject.image.rotation = random.choice([0, 0, 30])
+        layer.AddObject(gameObject)
+
+    failures = []
+    for cameraPosition in CAMERAS:
+        layer.DisableStaticBaking()
+        plain = renderLayer(layer, cameraPosition)
+        layer.EnableStaticBaking(128)
+        baked = renderLayer(layer, cameraPosition)
+        difference = countDifferentPixels(plain, baked)
+        if difference:
+            failures.append(f"camera {cameraPosition}: {difference} pixels differ")
+    return failures
+
+# The same for the chunks of a tilemap, with tiles of a fractional size and images sticking out of their cells
+@check
+def tilemapBaking():
+    # "Tilemap" is not exported by "infinova.layer" yet
+    from infinova.__infinova import Tilemap, TileType
+
+    random.seed(3)
+    tileTypes = []
+    for ID, color, offset in (("a", (200, 40, 40), (0, 0)), ("b", (40, 200, 40), (-3.5, 2.25)), ("c", (40, 40, 200), (6, -4))):
+        image = infinova.assets.Assets().CreateImage(f"tile {ID}", 23, 17)
+        image.Fill(color)
+        image.DrawRect((255, 255, 0), (2, 2, 6, 4))
+        tileTypes.append(TileType(ID, image.name, offset))
+
+    tilemap = Tilemap("Tilemap", 20.5, tileTypes, chunkSize=8)
+    for y in range(-30, 30):
+        for x in range(-40, 40):
+            if random.random() < 0.6:
+                tilemap.SetTile(x, y, random.choice("abc"))
+    tilemap.SetTile(3, 3, "b", {"special": True})
+
+    failures = []
+    for cameraPosition in CAMERAS:
+        tilemap.DisableStaticBaking()
+        plain = renderLayer(tilemap, cameraPosition)
+        tilemap.EnableStaticBaking()
+        baked = renderLayer(tilemap, cameraPosition)
+        difference = countDifferentPixels(plain, baked)
+        if difference:
+            failures.append(f"camera {cameraPosition}: {difference} pixels differ")
+    return failures
+
+def createScatteredObjects(layer, count: int, seed: int, spread: tuple[float, float] = (1500, 1000)):
+    random.seed(seed)
+    image = infinova.Image("scattered", 24, 24)
+    image.Fill((40, 160, 40))
+    image.DrawRect((200, 40, 40), (6, 6, 12, 12))
+    objects = []
+    for i in range(count):
+        gameObject = infinova.GameObject(infinova.Geometry(random.uniform(-spread[0], spread[0]), random.uniform(-spread[1], spread[1]), (24, 24)))
+        gameObject.image = image.Copy()
+        gameObject.image.rotation = random.choice([0, 0, 30, 90])
+        layer.AddObject(gameObject)
+        objects.append(gameObject)
+    return objects
+
+# Spatial culling may only skip objects that are out of view, also after objects moved
+@check
+def culling():
+    plainLayer, culledLayer = infinova.layer.ObjectsLayer("Plain"), infinova.layer.ObjectsLayer("Culling")
+    culledLayer.EnableSpatialCulling()
+    plainObjects, culledObjects = createScatteredObjects(plainLayer, 1500, 7), createScatteredObjects(culledLayer, 1500, 7)
+    failures = []
+    for step, cameraPosition in enumerate(CAMERAS + [(900.5, -600.25)]):
+        for i in range(step, len(plainObjects), 7):
+            offset = (random.uniform(-200, 200), random.uniform(-200, 200))
+            plainObjects[i].geometry.Move(offset)
+            culledObjects[i].geometry.Move(offset)
+        difference = countDifferentPixels(renderLayer(plainLayer, cameraPosition), renderLayer(culledLayer, cameraPosition))
+        if difference:
+            failures.append(f"camera {cameraPosition}: {difference} pixels differ")
+    return failures
+
+# A scene redrawing only its dirty rectangles has to show the same frames as a scene drawn from scratch every frame.
+# Both scenes get the same objects and the same changes: moves, rotations, redrawn images, removed and added objects and a camera move
+@check
+def dirtyRendering():
+    scenes, layers, sceneObjects = [], [], []
+    for dirty in (False, True):
+        scene = infinova.scene.Scene("Dirty" if dirty else "Full")
+        layer = infinova.layer.ObjectsLayer("Objects")
+        interface = infinova.layer.ObjectsLayer("Interface")
+        interface.renderWithZoomAndRotation = False
+        scene.AddLayer(layer)
+        scene.AddLayer(interface)
+        panel = infinova.GameObject(infinova.Geometry(0, -200, (200, 40)))
+        panel.image = infinova.Image("panel", 200, 40)
+        panel.image.Fill((0, 0, 255))
+        interface.AddObject(panel)
+        if dirty:
+            scene.EnableDirtyRendering()
+        scenes.append(scene)
+        layers.append(layer)
+        sceneObjects.append(createScatteredObjects(layer, 300, 8, (360, 280)))
+
+    failures = []
+    partialFrames = 0
+    for frame in range(30):
+        for scene, layer, objects in zip(scenes, layers, sceneObjects):
+            for gameObject in objects[::10]:
+                gameObject.geometry.Move((3, 1))
+            if frame % 5 == 0:
+                objects[0].image.rotation += 15
+            if frame == 7:
+                layer.RemoveObject(objects[5])
+            if frame == 9:
+                objects[6].image.Fill((255, 255, 0))
+            if frame == 12:
+                layer.AddObject(objects[5])
+            if frame == 20:
+                scene.camera.position += (5, 0)
+            scene._render()
+
+        partialFrames += scenes[1].GetDirtyRects() != [scenes[1]._screenSurface.get_rect()]
+        difference = countDifferentPixels(scenes[0]._screenSurface, scenes[1]._screenSurface)
+        if difference:
+            failures.append(f"frame {frame}: {difference} pixels differ")
+    if not partialFrames:
+        failures.append("every frame was drawn from scratch")
+    return failures
+
+# Without a zoom, layers drawn straight on the screen have to look the same as drawn on the camera surface.
+# Zoomed images are scaled one by one instead of with the whole surface, so zoomed frames are not compared
+@check
+def directRendering():
+    layer = infinova.layer.ObjectsLayer("Objects")
+    createScatteredObjects(layer, 600, 9, (600, 450))
+    scene = infinova.scene.Scene("Direct")
+    scene.AddLayer(layer)
+    failures = []
+    for cameraPosition in CAMERAS:
+        scene.camera.position = pygame.Vector2(cameraPosition)
+        frames = []
+        for direct in (False, True):
+            (scene.camera.EnableDirectRendering if direct else scene.camera.DisableDirectRendering)()
+            scene._render()
+            frames.append(scene._screenSurface.copy())
+        difference = countDifferentPixels(*frames)
+        if difference:
+            failures.append(f"camera {cameraPosition}: {difference} pixels differ")
+    return failures
+
+parser = argparse.ArgumentParser()
+parser.add_argument("names", nargs="*", help="checks to run, all of them by default")
+arguments = parser.parse_args()
+
+infinova.init(640, 480, "Infinova Checks")
+
+failed = False
+for name in arguments.names or checks:
+    failures = checks[name]()
+    print(f"{name:<24}{'FAIL' if failures else 'ok'}")
+    for failure in failures:
+        print(f"    {failure}")
+    failed = failed or bool(failures)
+
+sys.exit(1 if failed else 0)
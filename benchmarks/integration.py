@@ -0,0 +1,90 @@
+# Per-body integration against "PhysicsLayer.EnableBatchedIntegration", to find the body count where batching pays off.
+# The first table times one integration pass alone, the second one whole frames: "falling" bodies never touch,
+# "pile" bodies fall onto each other and "settled" bodies rest in the pile, so every body is solved in every step.
+# Physics runs with a fixed time step and every body is batched, whatever the count
+import argparse
+import os
+import random
+import time
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import infinova
+
+parser = argparse.ArgumentParser()
+parser.add_argument("counts", nargs="?", default="5,10,20,50,100,200,500,1000,2000,5000", help="comma separated body counts")
+parser.add_argument("--frames", type=int, default=30)
+parser.add_argument("--settle", type=int, default=240, help="frames the \"settled\" pile gets before it's measured")
+arguments = parser.parse_args()
+
+infinova.init(320, 240, "Infinova Benchmark")
+
+def createBody(geometry: infinova.Geometry, isStatic: bool = False):
+    return infinova.GameObject(geometry, components=[infinova.physics.Rigidbody(infinova.physics.Material(), isStatic)])
+
+def createLayer(scene: str, count: int, batched: bool):
+    random.seed(0)
+    layer = infinova.layer.PhysicsLayer("Integration")
+    layer.SetBroadPhase("grid")
+    if scene in ("pile", "settled"):
+        width = int(count ** 0.5) + 1
+        layer.AddObject(createBody(infinova.Geometry(width * 12, width * 24 + 20, (width * 24 + 200, 40)), True))
+        for i in range(count):
+            layer.AddObject(createBody(infinova.Geometry(20 + (i % width) * 22 + random.uniform(-2, 2), width * 24 - (i // width) * 22, 10)))
+    else:
+        for i in range(count):
+            layer.AddObject(createBody(infinova.Geometry(random.uniform(0, 4000), random.uniform(0, 1900), 5 if i % 2 else (10, 10))))
+
+    layer.EnableFixedTimestep(60, interpolation=False)
+    if batched:
+        layer.EnableBatchedIntegration(0)
+    return layer
+
+def measurePass(count: int):
+    layer = createLayer("falling", count, False)
+    # Without a fixed time step "Rigidbody.Update" integrates the bodies
+    layer.DisableFixedTimestep()
+    rigidbodies = [gameObject.GetComponent(infinova.physics.Rigidbody) for gameObject in layer._getObjects()]
+    number = max(20000 // count, 10)
+
+    def integrateBodies():
+        for rigidbody in rigidbodies:
+            rigidbody.Update(1 / 60)
+    perBody = min(timeit.repeat(integrateBodies, number=number, repeat=5)) / number * 1000000
+
+    batch = infinova.physics.RigidbodyBatch(count)
+    for rigidbody in rigidbodies:
+        batch.Add(rigidbody)
+    batched = min(timeit.repeat(lambda: batch.Integrate(layer._gravity, 1 / 60), number=number, repeat=5)) / number * 1000000
+    batch.Clear()
+    return perBody, batched
+
+# The first frames are skipped, then the best of two runs is kept
+def measureFrames(scene: str, count: int, batched: bool):
+    best = None
+    for _ in range(2):
+        layer = createLayer(scene, count, batched)
+        for _ in range(arguments.settle if scene == "settled" else arguments.frames):
+            layer.Update(1 / 60)
+
+        start = time.perf_counter()
+        for _ in range(arguments.frames):
+            layer.Update(1 / 60)
+        elapsed = (time.perf_counter() - start) / arguments.frames * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+counts = list(map(int, arguments.counts.split(",")))
+
+print(f"{'integration pass':<16}{'bodies':>7}{'per body (us)':>15}{'batched (us)':>14}{'ratio':>8}")
+for count in counts:
+    perBody, batched = measurePass(count)
+    print(f"{'':<16}{count:>7}{perBody:>15.1f}{batched:>14.1f}{batched / perBody:>8.2f}", flush=True)
+
+print(f"{'frame':<16}{'bodies':>7}{'per body (ms)':>15}{'batched (ms)':>14}{'ratio':>8}")
+for scene in ("falling", "pile", "settled"):
+    for count in counts:
+        perBody = measureFrames(scene, count, False)
+        batched = measureFrames(scene, count, True)
+        print(f"{scene:<16}{count:>7}{perBody:>15.2f}{batched:>14.2f}{batched / perBody:>8.2f}", flush=True)
@@ -0,0 +1,67 @@
+# Separate piles of boxes stepped by "PhysicsLayer.EnableParallelIslands" against the same layer stepped alone.
+# Every pile is an island, so with enough cores the piles are solved at the same time. The last column is the largest
+# distance to where the serial layer puts the bodies, it must not depend on the number of workers. It is only zero
+# without "--warm": warm started impulses of an island start over when it merges with another one.
+# Physics runs with a fixed time step, each worker keeps the layers of its islands between frames
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import infinova
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--piles", type=int, default=16)
+parser.add_argument("--boxes", type=int, default=16, help="boxes per pile")
+parser.add_argument("--workers", default="1,2,4", help="comma separated worker counts")
+parser.add_argument("--frames", type=int, default=60)
+parser.add_argument("--warm", action="store_true", help="enable warm starting")
+arguments = parser.parse_args()
+
+infinova.init(320, 240, "Infinova Benchmark")
+
+def createBody(geometry: infinova.Geometry, isStatic: bool = False):
+    return infinova.GameObject(geometry, components=[infinova.physics.Rigidbody(infinova.physics.Material(), isStatic)])
+
+def createLayer(workers: int):
+    random.seed(0)
+    layer = infinova.layer.PhysicsLayer("Islands")
+    layer.SetBroadPhase("grid")
+    layer.EnableFixedTimestep(60, interpolation=False)
+    if arguments.warm:
+        layer.EnableWarmStarting()
+    for pile in range(arguments.piles):
+        x = pile * 200
+        layer.AddObject(createBody(infinova.Geometry(x, 600, (160, 40)), True))
+        for i in range(arguments.boxes):
+            layer.AddObject(createBody(infinova.Geometry(x + (i % 4) * 32 - 48 + random.uniform(-2, 2), 560 - (i // 4) * 32, (30, 30))))
+
+    if workers:
+        layer.EnableParallelIslands(workers, minBodies=0)
+    return layer
+
+# The first frames are skipped while the boxes settle into their piles, they also start the workers
+def measure(workers: int):
+    layer = createLayer(workers)
+    for _ in range(60):
+        layer.Update(1 / 60)
+
+    start = time.perf_counter()
+    for _ in range(arguments.frames):
+        layer.Update(1 / 60)
+    elapsed = (time.perf_counter() - start) / arguments.frames * 1000
+
+    positions = [gameObject.geometry.position for gameObject in layer._getObjects()]
+    layer.DisableParallelIslands()
+    return elapsed, positions
+
+print(f"{os.cpu_count()} cores, {arguments.piles} piles of {arguments.boxes} boxes{', warm starting' if arguments.warm else ''}")
+print(f"{'workers':<10}{'ms/frame':>10}{'speedup':>10}{'max distance (px)':>20}")
+serial, serialPositions = measure(0)
+print(f"{'serial':<10}{serial:>10.2f}{1:>10.2f}{0:>20.6f}", flush=True)
+for workers in map(int, arguments.workers.split(",")):
+    elapsed, positions = measure(workers)
+    distance = max((a - b).length() for a, b in zip(positions, serialPositions))
+    print(f"{workers:<10}{elapsed:>10.2f}{serial / elapsed:>10.2f}{distance:>20.6f}", flush=True)
@@ -0,0 +1,89 @@
+# Memory and attribute access of the engine's hot objects.
+# To compare two versions, run the script on the older one with "--save" and on the newer one with "--compare":
+#   git worktree add ../baseline <commit>
+#   PYTHONPATH=<dir with "infinova" linked to ../baseline/source> python benchmarks/objects.py --save baseline.json
+#   PYTHONPATH=<dir with "infinova" linked to ./source> python benchmarks/objects.py --compare baseline.json
+import argparse
+import json
+import os
+import timeit
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import infinova
+import infinova.particle
+import pygame
+
+parser = argparse.ArgumentParser()
+parser.add_argument("count", type=int, nargs="?", default=10000)
+parser.add_argument("--save", help="write the results to a json file")
+parser.add_argument("--compare", help="print the results next to the ones saved in a json file")
+arguments = parser.parse_args()
+
+infinova.init(320, 240, "Infinova Benchmark")
+
+COUNT = arguments.count
+
+# AABB is not exported, it is reached through the geometry which returns it
+AABB = type(infinova.Geometry(0, 0, (16, 16)).GetAABB())
+template = infinova.particle.ParticleTemplate(1, pygame.Surface((1, 1)), [(255, 255, 255)])
+
+factories = {
+    "Geometry": lambda i: infinova.Geometry(i, i, (16, 16)),
+    "AABB": lambda i: AABB(pygame.Vector2(i, i), pygame.Vector2(i + 16, i + 16)),
+    "Rigidbody": lambda i: infinova.physics.Rigidbody(infinova.physics.Material()),
+    "Particle": lambda i: infinova.particle.Particle(1, pygame.Vector2(i, i), template, None),
+    "Image": lambda i: infinova.Image("image", 1, 1),
+    "GameObject": lambda i: infinova.GameObject(infinova.Geometry(i, i, (16, 16))),
+}
+
+# Surfaces are allocated by SDL, so only Python objects show up in the measured memory
+def measureMemory(factory):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / COUNT
+
+geometry = factories["Geometry"](0)
+rigidbody = factories["Rigidbody"](0)
+aabb = factories["AABB"](0)
+
+accesses = {
+    "Geometry.collisionMask": (geometry, "target.collisionMask"),
+    "Geometry.positionView": (geometry, "target.positionView"),
+    "Rigidbody.invMass": (rigidbody, "target.invMass"),
+    "AABB.min": (aabb, "target.min"),
+}
+
+results = {
+    "memory": {name: measureMemory(factory) for name, factory in factories.items()},
+    "reads": {name: min(timeit.repeat(statement, globals={"target": target}, number=1000000, repeat=5)) * 1000
+              for name, (target, statement) in accesses.items()},
+}
+
+baseline = None
+if arguments.compare:
+    with open(arguments.compare) as file:
+        baseline = json.load(file)
+
+def printTable(title, key):
+    print(title)
+    for name, value in results[key].items():
+        line = f"  {name:<26}{value:>10.1f}"
+        if baseline and name in baseline[key]:
+            line += f"{baseline[key][name]:>10.1f}{value / baseline[key][name]:>8.2f}x"
+        print(line)
+
+header = "  (current, baseline, current / baseline)" if baseline else ""
+printTable(f"Memory per instance, {COUNT} instances (bytes){header}", "memory")
+printTable(f"Attribute reads (ns){header}", "reads")
+
+if arguments.save:
+    with open(arguments.save, "w") as file:
+        json.dump(results, file, indent=4)
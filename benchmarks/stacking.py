@@ -0,0 +1,68 @@
+# Resting contacts of warm started solvers: boxes stacked on the ground have to stay still and fall asleep.
+# Towers are 40 px boxes with their centers moved sideways at random by up to "jitter" pixels.
+# Physics runs with a fixed time step, so every solver integrates bodies once per step
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import infinova
+
+infinova.init(320, 240, "Infinova Benchmark")
+
+FRAMES = 600
+
+def createTower(count: int, gravity: float, jitter: float):
+    random.seed(1)
+    layer = infinova.layer.PhysicsLayer("Stacking")
+    layer.SetGravity((0, gravity))
+    layer.AddObject(infinova.GameObject(infinova.Geometry(400, 580, (800, 40)), components=[infinova.physics.Rigidbody(infinova.physics.Material(), True)]))
+
+    boxes = []
+    for i in range(count):
+        box = infinova.GameObject(infinova.Geometry(400 + random.uniform(-jitter, jitter), 540 - 40 * i, (40, 40)),
+                                  components=[infinova.physics.Rigidbody(infinova.physics.Material())])
+        layer.AddObject(box)
+        boxes.append(box)
+    return layer, boxes
+
+def measure(solver: str, iterations: int, count: int, gravity: float, jitter: float):
+    layer, boxes = createTower(count, gravity, jitter)
+    if solver == "iterative":
+        layer.EnableIterativeSolver(iterations)
+    else:
+        layer.SetPhysicsIterations(iterations)
+    layer.EnableWarmStarting()
+    layer.EnableSleeping()
+    layer.EnableFixedTimestep(60, interpolation=False)
+
+    start = boxes[-1].geometry.position
+    previous = [box.geometry.position for box in boxes]
+    maxMovement = 0
+    asleepAt = None
+    for frame in range(FRAMES):
+        layer.Update(1 / 60)
+        current = [box.geometry.position for box in boxes]
+        # Only the last two seconds count, the boxes first settle onto each other
+        if frame >= FRAMES - 120:
+            maxMovement = max(maxMovement, max((a - b).length() for a, b in zip(current, previous)))
+        previous = current
+        if asleepAt is None and layer.GetSleepStatistics()["sleeping"] == count:
+            asleepAt = frame
+
+    drift = boxes[-1].geometry.position - start
+    return drift, maxMovement, layer.GetSleepStatistics()["sleeping"], asleepAt
+
+cases = [
+    ("substep", 4, 10, 100, 0),
+    ("substep", 4, 10, 400, 0),
+    ("substep", 4, 20, 400, 2),
+    ("iterative", 4, 10, 100, 0),
+    ("iterative", 4, 10, 400, 0),
+    ("iterative", 4, 20, 400, 2),
+]
+
+print(f"{'solver':<10}{'iterations':>11}{'boxes':>7}{'gravity':>9}{'jitter':>8}{'top drift (px)':>22}{'max px/frame':>14}{'asleep':>8}{'at frame':>10}")
+for solver, iterations, count, gravity, jitter in cases:
+    drift, maxMovement, sleeping, asleepAt = measure(solver, iterations, count, gravity, jitter)
+    print(f"{solver:<10}{iterations:>11}{count:>7}{gravity:>9}{jitter:>8}{f'({drift.x:.1f}, {drift.y:.1f})':>22}{maxMovement:>14.3f}{sleeping:>8}{str(asleepAt):>10}")
@@ -1,11 +1,25 @@
 from random import randint
 import pygame as pg
 from typing import overload
+from itertools import chain
+from collections import OrderedDict
+from array import array
+from threading import Thread
+from multiprocessing import Process, Pipe, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import ctypes
+import pickle
+import weakref
 import math
 import json
 import sys
 import os
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 """
 
 Infinova by Faratos
@@ -52,6 +66,10 @@ SHAPE_CIRCLE = 2
 SHAPE_CAPSULE = 3
 SHAPE_POLYGON = 4
 
+# x, y, angle, linear velocity, angular velocity, force, torque, static, sleeping, frozen rotations and continuous collision
+# of a body in the shared island state
+ISLAND_STATE_STRIDE = 13
+
 
 class ErrorHandler:
     @staticmethod
@@ -86,11 +104,130 @@ class ErrorHandler:
         ErrorHandler.__basicMessage(name, className, function, variable, message, "Warning")
 
 
+class SurfaceCache:
+    # Least recently used transformed surfaces. Images that share an original share its entries, 
+    # so many objects with the same sprite and angle cost a single rotation
+    def __init__(self, maxSize: int = 512, angleStep: float = 1):
+        self.__surfaces: OrderedDict[tuple, pg.Surface] = OrderedDict()
+        self.__maxSize = max(maxSize, 1)
+        self.__angleStep = angleStep
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    @property
+    def maxSize(self):
+        return self.__maxSize
+
+    @property
+    def angleStep(self):
+        return self.__angleStep
+
+    def SetMaxSize(self, value: int):
+        self.__maxSize = max(value, 1)
+        while len(self.__surfaces) > self.__maxSize:
+            self.__surfaces.popitem(last=False)
+
+    def SetAngleStep(self, value: float):
+        # 0 keeps exact angles
+        if value < 0:
+            ErrorHandler.Throw("ValueError", "SurfaceCache", "SetAngleStep", "value", "Angle step can't be negative")
+
+        self.__angleStep = value
+        self.Clear()
+
+    def QuantizeAngle(self, angle: float):
+        if not self.__angleStep:
+            return angle % 360
+        
+        return round(angle / self.__angleStep) * self.__angleStep % 360
+
+    def GetSurface(self, source: object, original: pg.Surface, rotation: float, size: tuple, flipX: bool, flipY: bool, opacity: float):
+        rotation = self.QuantizeAngle(rotation)
+        alpha = round(opacity * 255)
+        key = (source, rotation, size, flipX, flipY, alpha)
+
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.__surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = pg.transform.flip(original, flipX, flipY)
+        surface = pg.transform.scale(surface, size)
+        if rotation:
+            surface = pg.transform.rotate(surface, -rotation)
+        surface.set_alpha(alpha)
+
+        self.__surfaces[key] = surface
+        if len(self.__surfaces) > self.__maxSize:
+            self.__surfaces.popitem(last=False)
+        return surface
+
+    def ResetCounters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def Clear(self):
+        self.__surfaces.clear()
+
+
+imageSurfaceCache = SurfaceCache()
+
+class RotationSheet:
+    # Surface rotated into evenly spaced steps ahead of time, frames are picked by the nearest angle
+    def __init__(self, surface: pg.Surface, steps: int, key: tuple):
+        self.__surface = surface
+        self.__steps = steps
+        self.__frames: list[pg.Surface] = []
+        self.__ready = False
+        self._key = key
+
+    @property
+    def steps(self):
+        return self.__steps
+
+    @property
+    def isReady(self):
+        return self.__ready
+
+    def Bake(self):
+        alpha = self.__surface.get_alpha()
+        frames = []
+        for i in range(self.__steps):
+            frame = pg.transform.rotate(self.__surface, -360 * i / self.__steps)
+            frame.set_alpha(alpha)
+            frames.append(frame)
+
+        self.__frames = frames
+        self.__ready = True
+
+    def BakeInBackground(self):
+        thread = Thread(target=self.Bake, daemon=True)
+        thread.start()
+        return thread
+
+    def GetFrame(self, rotation: float):
+        return self.__frames[round(rotation * self.__steps / 360) % self.__steps]
+
 class Image:
+    __slots__ = ("name", "__original", "__current", "__currentShared", "drawingOffset", "__rotationOffset", "__pivotOffset", "__rotation", "__size", 
+                 "__opacity", "__flipX", "__flipY", "__surfaceUpdateRequired", "__source", "__sharesOriginal", "__surfaceCache", "__rotationSheet", "__scaledSurface")
+
     def __init__(self, name: str, width: int, height: int, surface: pg.Surface = None):
         self.name = name
         self.__original = (surface if surface else pg.Surface((width, height), pg.SRCALPHA)).convert_alpha()
-        self.current = self.__original.copy()
+        # Identifies the original's content in the surface cache, it changes whenever the original is drawn on
+        self.__source = object()
+        self.__sharesOriginal = False
+        self.__surfaceCache: SurfaceCache = imageSurfaceCache
+        self.__rotationSheet: RotationSheet = None
+        self.__scaledSurface: tuple[float, pg.Surface, pg.Surface] = None
+        self.__current = self.__original.copy()
+        self.__currentShared = False
         self.drawingOffset = pg.Vector2()
         self.__rotationOffset = pg.Vector2()
         self.__pivotOffset = pg.Vector2()
@@ -105,6 +242,19 @@ class Image:
     def size(self):
         return self.__size
     
+    @property
+    def current(self):
+        # Cached and baked surfaces are shared with other images, a shared one is copied before it's handed out to be drawn on
+        if self.__currentShared:
+            self.__current = self.__current.copy()
+            self.__currentShared = False
+        return self.__current
+    
+    @current.setter
+    def current(self, surface: pg.Surface):
+        self.__current = surface
+        self.__currentShared = False
+
     @property
     def center(self):
         return pg.Vector2(self.GetSurface().size) / 2 
@@ -120,8 +270,9 @@ class Image:
     
     @rotation.setter
     def rotation(self, value: float):
-        self.__rotation = value
-        self.UpdateSurface()
+        if value != self.__rotation:
+            self.__rotation = value
+            self.UpdateSurface()
 
     def RotateWithPivotOffset(self, value: float, pivotOffset: tuple[int, int] | pg.Vector2):
         self.rotation += value
@@ -147,9 +298,55 @@ class Image:
     @originalSurface.setter
     def originalSurface(self, surface: pg.Surface):
         self.__original = surface.convert_alpha()
+        self.__sharesOriginal = False
+        self.__source = object()
+        self.__rotationSheet = None
+        self.UpdateSurface()
+
+    def __detachOriginal(self):
+        # Shared originals are copied before they are drawn on
+        if self.__sharesOriginal:
+            self.__original = self.__original.copy()
+            self.__sharesOriginal = False
+        self.__source = object()
+        self.__rotationSheet = None
+
+    def GetSurfaceCache(self):
+        return self.__surfaceCache
+
+    def SetSurfaceCache(self, cache: SurfaceCache = None):
+        # Without a cache the surface is transformed again on every change
+        self.__surfaceCache = cache
+        self.UpdateSurface()
+
+    def __getSheetKey(self):
+        return (self.__source, self.__size, self.__flipX, self.__flipY, round(self.__opacity * 255))
+
+    def BakeRotations(self, steps: int = 64, background: bool = False):
+        # Until a background bake is finished, and after the size, flip, opacity or original change, 
+        # the image is rotated on demand again
+        if steps < 1:
+            ErrorHandler.Throw("ValueError", "Image", "BakeRotations", "steps", "Rotation steps count must be positive")
+
+        surface = pg.transform.scale(pg.transform.flip(self.__original, self.__flipX, self.__flipY), self.__size)
+        surface.set_alpha(round(self.__opacity * 255))
+        self.__rotationSheet = RotationSheet(surface, steps, self.__getSheetKey())
+        if background:
+            self.__rotationSheet.BakeInBackground()
+        else:
+            self.__rotationSheet.Bake()
+        self.UpdateSurface()
+        return self.__rotationSheet
+
+    def GetRotationSheet(self):
+        return self.__rotationSheet
+
+    def ClearRotations(self):
+        self.__rotationSheet = None
         self.UpdateSurface()
 
     def CropToGeometry(self, geometry):
+        self.__detachOriginal()
         if geometry.shapeType == SHAPE_BOX:
             self.__original = pg.transform.scale(self.__original, (geometry.width, geometry.height)).convert_alpha()
 
@@ -192,13 +389,23 @@ class Image:
 
     def GetSurface(self):
         if not self.__surfaceUpdateRequired:
-            return self.current
+            return self.__current
         
-        self.current = pg.transform.flip(self.__original, self.__flipX, self.__flipY)
-        self.current = pg.transform.scale(self.current, self.__size)
-        self.current = pg.transform.rotate(self.current, -self.__rotation)
+        # Surfaces of the rotation sheet and of the cache are shared, the one returned here is only meant to be drawn
+        sheet = self.__rotationSheet
+        self.__currentShared = True
+        if sheet is not None and sheet.isReady and sheet._key == self.__getSheetKey():
+            self.__current = sheet.GetFrame(self.__rotation)
+        elif self.__surfaceCache is not None:
+            self.__current = self.__surfaceCache.GetSurface(self.__source, self.__original, self.__rotation, self.__size, 
+                                                            self.__flipX, self.__flipY, self.__opacity)
+        else:
+            self.__currentShared = False
+            self.__current = pg.transform.flip(self.__original, self.__flipX, self.__flipY)
+            self.__current = pg.transform.scale(self.__current, self.__size)
+            self.__current = pg.transform.rotate(self.__current, -self.__rotation)
 
-        self.current.set_alpha(round(self.__opacity * 255))
+            self.__current.set_alpha(round(self.__opacity * 255))
 
         self.__rotationOffset = -self.__pivotOffset
         self.__rotationOffset.rotate_ip(self.__rotation)
@@ -207,17 +414,48 @@ class Image:
 
         self.__surfaceUpdateRequired = False
 
-        return self.current
+        return self.__current
     
     def Copy(self):
         copy = Image(self.name, self.__original.width, self.__original.height, self.__original)
-        copy.offset = self.offset.copy()
+        copy.drawingOffset = self.drawingOffset.copy()
+        copy.__original, copy.__source = self.__original, self.__source
+        copy.__surfaceCache = self.__surfaceCache
+        copy.__rotationSheet = self.__rotationSheet
+        self.__sharesOriginal = copy.__sharesOriginal = True
         return copy
 
+    def GetScaledSurface(self, zoom: float):
+        # Surface for a camera zoom, kept until the zoom or the current surface changes
+        surface = self.GetSurface()
+        if zoom == 1:
+            return surface
+        
+        scaled = self.__scaledSurface
+        if scaled is not None and scaled[0] == zoom and scaled[1] is surface:
+            return scaled[2]
+        
+        if self.__surfaceCache is not None:
+            size = (max(round(self.__size[0] * zoom), 1), max(round(self.__size[1] * zoom), 1))
+            result = self.__surfaceCache.GetSurface(self.__source, self.__original, self.__rotation, size, 
+                                                    self.__flipX, self.__flipY, self.__opacity)
+        else:
+            result = pg.transform.scale(surface, (max(round(surface.width * zoom), 1), max(round(surface.height * zoom), 1)))
+            result.set_alpha(surface.get_alpha())
+
+        self.__scaledSurface = (zoom, surface, result)
+        return result
+
+    def GetBlitPosition(self, center: pg.typing.Point, zoom: float = 1):
+        surface = self.GetScaledSurface(zoom)
+        return (center[0] + (self.drawingOffset.x + self.__rotationOffset.x) * zoom - surface.width / 2,
+                center[1] + (self.drawingOffset.y + self.__rotationOffset.y) * zoom - surface.height / 2)
+
     def RenderOn(self, surface: pg.Surface, center: pg.Vector2):
-        surface.blit(self.GetSurface(), center + self.drawingOffset + self.__rotationOffset - self.center)
+        surface.blit(self.GetSurface(), self.GetBlitPosition(center))
 
     def Fill(self, color):
+        self.__detachOriginal()
         self.__original.fill(color)
         self.UpdateSurface()
 
@@ -225,6 +463,7 @@ class Image:
         rect = pg.Rect(rect)
         rect.w *= self.__original.size[0] / self.__size[0]
         rect.h *= self.__original.size[1] / self.__size[1]
+        self.__detachOriginal()
         pg.draw.rect(self.__original, color, rect, width, borderRadius)
         self.UpdateSurface()
 
@@ -240,6 +479,8 @@ def TransformVector(vector: pg.Vector2, position: pg.Vector2, sin: float, cos: f
                       sin * vector.x + cos * vector.y + position.y)
 
 class AABB:
+    __slots__ = ("min", "max", "size", "width", "height")
+
     def __init__(self, min: pg.Vector2, max: pg.Vector2):
         self.min = pg.Vector2(min)
         self.max = pg.Vector2(max)
@@ -248,6 +489,13 @@ class AABB:
         self.width, self.height = tuple(self.size)
 
 class Geometry:
+    __slots__ = ("__shapeType", "__radius", "__width", "__height", "__area", "__position", "__angle", 
+                 "__transformUpdateRequired", "__aabbUpdateRequired", "__anchorsUpdateRequired", "__version", 
+                 "_vertices", "__aabb", "__anchors", "__transformedAnchors", "__transformedVertices", "__pivotOffset", "__lastPivotOffset", 
+                 "collisionCategory", "collisionMask", "_cannotCollideWith", "_movedGeometries")
+    # Slot names as they are stored, the private ones are mangled
+    __stateNames = tuple("_Geometry" + name if name.startswith("__") else name for name in __slots__)
+
     @overload
     def __init__(self, x: float, y: float, radius: float): 
         """Circle geometry""" 
@@ -299,9 +547,10 @@ class Geometry:
         self.__transformUpdateRequired = True
         self.__aabbUpdateRequired = True
         self.__anchorsUpdateRequired = True
+        self.__version = 0
 
         self._vertices: list[pg.Vector2] = []
-        self.__aabb: AABB = None
+        self.__aabb = AABB(pg.Vector2(), pg.Vector2())
 
         self.__anchors: list[pg.Vector2] = []
         self.__transformedAnchors: list[pg.Vector2] = []
@@ -328,12 +577,17 @@ class Geometry:
 
             self.__area = self.__calculateAreaForPolygon(self._vertices)
 
-        self.__transformedVertices: list[pg.Vector2] = [pg.Vector2() for _ in range(len(self._vertices))]
+        # Storage that most geometries never or only later need is created on first use
+        self.__transformedVertices: list[pg.Vector2] = None
 
-        self.__pivotOffset = pg.Vector2(0, 0)
-        self.__lastPivotOffset = pg.Vector2(0, 0)
+        self.__pivotOffset: pg.Vector2 = None
+        self.__lastPivotOffset: pg.Vector2 = None
 
-        self.cannotCollideWith = []
+        self.collisionCategory = 1
+        self.collisionMask = 0xFFFFFFFF
+        self._cannotCollideWith: set[Geometry] = None
+        # Set of the layer that culls this geometry with a spatial index, the geometry adds itself to it when it moves
+        self._movedGeometries: set[Geometry] = None
     
     def __calculateAreaForPolygon(self, vertices: list[pg.Vector2]):
         area = 0
@@ -348,6 +602,16 @@ class Geometry:
     def shapeType(self):
         return self.__shapeType
 
+    @property
+    def cannotCollideWith(self):
+        if self._cannotCollideWith is None:
+            self._cannotCollideWith = set()
+        return self._cannotCollideWith
+
+    @cannotCollideWith.setter
+    def cannotCollideWith(self, value: set):
+        self._cannotCollideWith = set(value)
+
     @property
     def area(self):
         return self.__area
@@ -373,10 +637,47 @@ class Geometry:
         
         ErrorHandler.Throw("InvalidProperty", "Geometry", None, "height", "You cannot get the \"height\" property of \"Circle\" or \"Polygon\" Geometry")
 
-    def Update(self):
-        self.__anchorsUpdateRequired = True
+    @property
+    def version(self):
+        return self.__version
+
+    def __invalidateTransform(self):
+        # Every real change of the shape bumps the version, so caches built from it know when to rebuild
         self.__transformUpdateRequired = True
+        self.__anchorsUpdateRequired = True
         self.__aabbUpdateRequired = True
+        self.__version += 1
+        if self._movedGeometries is not None:
+            self._movedGeometries.add(self)
+
+    def __getstate__(self):
+        # Copies don't belong to the layer of the original
+        state = {name: getattr(self, name) for name in Geometry.__stateNames if hasattr(self, name)}
+        state["_movedGeometries"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def Update(self):
+        self.__invalidateTransform()
+
+    def Copy(self):
+        # The copy shares no vectors with the original, so moving one leaves the other alone. It belongs to no layer
+        self.GetTransformedVertices()
+        copy = Geometry.__new__(Geometry)
+        copy.__setstate__(self.__getstate__())
+        copy.__position = pg.Vector2(self.__position)
+        copy._vertices = [pg.Vector2(vertex) for vertex in self._vertices]
+        copy.__aabb = AABB(pg.Vector2(), pg.Vector2())
+        copy.__transformedVertices = None
+        copy.__anchors = [pg.Vector2(anchor) for anchor in self.__anchors]
+        copy.__transformedAnchors = [pg.Vector2() for _ in self.__anchors]
+        copy.__lastPivotOffset = pg.Vector2(self.__lastPivotOffset) if self.__lastPivotOffset is not None else None
+        copy._cannotCollideWith = set(self._cannotCollideWith) if self._cannotCollideWith is not None else None
+        copy.__transformUpdateRequired = copy.__aabbUpdateRequired = copy.__anchorsUpdateRequired = True
+        return copy
 
     def _createBoxVertices(self, width: int, height: int):
         left =  -width / 2
@@ -399,19 +700,21 @@ class Geometry:
     def Move(self, value: pg.Vector2 | tuple[int, int]):
         if not (value[0] == 0 and value[1] == 0):
             self.__position += pg.Vector2(value)
-            self.__transformUpdateRequired = True
-            self.__aabbUpdateRequired = True
+            self.__invalidateTransform()
 
     @property
     def position(self):
         return pg.Vector2(self.__position)
     
+    @property
+    def positionView(self):
+        # Not a copy, it must only be read
+        return self.__position
+    
     def SetPosition(self, value: tuple | pg.Vector2):
         if not (value[0] == self.__position[0] and value[1] == self.__position[1]):
             self.__position = pg.Vector2(value[0], value[1])
-            self.__transformUpdateRequired = True
-            self.__anchorsUpdateRequired = True
-            self.__aabbUpdateRequired = True
+            self.__invalidateTransform()
 
     @property
     def angle(self):
@@ -427,9 +730,8 @@ class Geometry:
     def RotateRadians(self, value: int, pivotOffset: tuple[int, int] | pg.Vector2 = (0, 0)):
         if value != 0:
             self.__angle += value
-            self.__pivotOffset = pg.Vector2(pivotOffset)
-            self.__transformUpdateRequired = True
-            self.__aabbUpdateRequired = True
+            self.__pivotOffset = pg.Vector2(pivotOffset) if pivotOffset[0] or pivotOffset[1] else None
+            self.__invalidateTransform()
 
     def SetAngle(self, value: int):
         self.SetAngleRadians(math.radians(value))
@@ -438,8 +740,7 @@ class Geometry:
         radiansValue = value
         if radiansValue != self.__angle:
             self.__angle = radiansValue
-            self.__transformUpdateRequired = True
-            self.__aabbUpdateRequired = True
+            self.__invalidateTransform()
 
     def ScaleBy(self, value: float):
         if self.shapeType == SHAPE_BOX:
@@ -457,34 +758,37 @@ class Geometry:
             self.__radius *= value
             self.__height *= value
 
+        if value != 1:
+            self.__invalidateTransform()
+
     def GetAABB(self):
+        # The same AABB is updated in place, so it has to be copied to be kept after the geometry moves
         if self.__aabbUpdateRequired:
-            min = pg.Vector2(1e+20, 1e+20)
-            max = pg.Vector2(-1e+20, -1e+20)
-
             if self.shapeType == SHAPE_CIRCLE:
-                min.x = self.__position.x - self.radius
-                min.y = self.__position.y - self.radius
-
-                max.x = self.__position.x + self.radius
-                max.y = self.__position.y + self.radius
+                x, y, radius = self.__position.x, self.__position.y, self.__radius
+                minX, minY, maxX, maxY = x - radius, y - radius, x + radius, y + radius
 
             else:
                 vertices = self.GetTransformedVertices()
+                minX = minY = 1e+20
+                maxX = maxY = -1e+20
 
-                for i in range(len(vertices)):
-                    vert = vertices[i]
-
-                    if vert.x < min.x: min.x = vert.x  # noqa: E701
-                    if vert.x > max.x: max.x = vert.x  # noqa: E701
-                    if vert.y < min.y: min.y = vert.y  # noqa: E701
-                    if vert.y > max.y: max.y = vert.y  # noqa: E701
+                for vert in vertices:
+                    x, y = vert.x, vert.y
+                    if x < minX: minX = x  # noqa: E701
+                    if x > maxX: maxX = x  # noqa: E701
+                    if y < minY: minY = y  # noqa: E701
+                    if y > maxY: maxY = y  # noqa: E701
 
                 if self.shapeType == SHAPE_CAPSULE:
-                    min -= pg.Vector2(self.radius, self.radius)
-                    max += pg.Vector2(self.radius, self.radius)
+                    radius = self.__radius
+                    minX, minY, maxX, maxY = minX - radius, minY - radius, maxX + radius, maxY + radius
 
-            self.__aabb = AABB(min, max)
+            aabb = self.__aabb
+            aabb.min.update(minX, minY)
+            aabb.max.update(maxX, maxY)
+            aabb.size.update(maxX - minX, maxY - minY)
+            aabb.width, aabb.height = maxX - minX, maxY - minY
 
             self.__aabbUpdateRequired = False
         
@@ -495,16 +799,21 @@ class Geometry:
             sin = math.sin(self.__angle)
             cos = math.cos(self.__angle)
 
-            if not self.__pivotOffset.xy == (0, 0):
+            if self.__pivotOffset is not None:
+                if self.__lastPivotOffset is None:
+                    self.__lastPivotOffset = pg.Vector2()
                 self.__position += self.__lastPivotOffset
                 self.__pivotOffset.rotate_rad_ip(self.__angle)
                 self.__lastPivotOffset.xy = self.__pivotOffset.xy
                 self.__position -= self.__pivotOffset
-                self.__pivotOffset.xy = (0, 0)
+                self.__pivotOffset = None
 
-            for i in range(len(self._vertices)):
-                vector = self._vertices[i]
-                self.__transformedVertices[i] = TransformVector(vector, self.__position, sin, cos)
+            if self.__transformedVertices is None:
+                self.__transformedVertices = [pg.Vector2() for _ in range(len(self._vertices))]
+
+            x, y = self.__position.x, self.__position.y
+            for vector, transformed in zip(self._vertices, self.__transformedVertices):
+                transformed.update(cos * vector.x - sin * vector.y + x, sin * vector.x + cos * vector.y + y)
 
             self.__transformUpdateRequired = False
         
@@ -536,20 +845,20 @@ class Geometry:
             return
         ErrorHandler.Throw("IndexOutOfRange", "Geometry", "RemoveAnchor", None, "Anchor index is out of anchors list range")
 
-    def DrawOnScreen(self, screen: pg.Surface, color: str | pg.Color | tuple[int, int, int], width: int, cameraPosition: pg.Vector2):
-        camPos = cameraPosition - pg.Vector2(screen.size) / 2
-        position = self.__position - camPos
+    def DrawOnScreen(self, screen: pg.Surface, color: str | pg.Color | tuple[int, int, int], width: int, cameraPosition: pg.Vector2, zoom: float = 1):
+        halfSize = pg.Vector2(screen.size) / 2
+        position = (self.__position - cameraPosition) * zoom + halfSize
 
         if self.shapeType == SHAPE_CIRCLE:
-            pg.draw.circle(screen, color, position, self.radius, width)
+            pg.draw.circle(screen, color, position, self.radius * zoom, width)
 
         if self.shapeType in [SHAPE_BOX, SHAPE_POLYGON]:
-            vertices = [i - camPos for i in self.GetTransformedVertices()]
+            vertices = [(i - cameraPosition) * zoom + halfSize for i in self.GetTransformedVertices()]
             pg.draw.polygon(screen, color, vertices, width)
 
         if self.shapeType == SHAPE_CAPSULE:
-            radius = self.radius
-            height = self.height
+            radius = self.radius * zoom
+            height = self.height * zoom
 
             heightLine = pg.Vector2(0, height / 2)
             heightLine.rotate_rad_ip(self.__angle)
@@ -558,7 +867,7 @@ class Geometry:
 
             radiusLine = pg.Vector2(radius, 0)
             radiusLine.rotate_rad_ip(self.__angle)
-            vertices = [i - camPos for i in self.GetTransformedVertices()]
+            vertices = [(i - cameraPosition) * zoom + halfSize for i in self.GetTransformedVertices()]
             pg.draw.line(screen, color, vertices[0] + radiusLine, vertices[1] + radiusLine, width)
             pg.draw.line(screen, color, vertices[0] - radiusLine, vertices[1] - radiusLine, width)
 
@@ -731,6 +1040,20 @@ class collisions:
 
     @staticmethod
     def FindContactPoints(first: Geometry, second: Geometry):
+        return collisions.FindContactFeatures(first, second)[:3]
+
+    @staticmethod
+    def FindContactFeatures(first: Geometry, second: Geometry, contactTolerance: float = 0):
+        # Same as "FindContactPoints", plus a feature id for every contact: (owner of the point, its vertex, edge it touches).
+        # Feature ids stay the same while two shapes keep touching the same way, so contacts can be matched between steps.
+        # With "contactTolerance" two polygon contacts are kept while their distances differ by less than it in pixels
+        def isSecondContact(distance: float, minDist: float, point: pg.Vector2, contact: pg.Vector2):
+            if vectorsNearlyEqual(point, contact):
+                return False
+            if contactTolerance:
+                return abs(math.sqrt(distance) - math.sqrt(minDist)) < contactTolerance
+            return valuesNearlyEqual(distance, minDist)
+
         if (first.shapeType == SHAPE_CIRCLE and second.shapeType == SHAPE_CAPSULE) or (second.shapeType == SHAPE_CIRCLE and first.shapeType == SHAPE_CAPSULE):
             circle, capsule = (first, second) if first.shapeType == SHAPE_CIRCLE else (second, first)
 
@@ -740,7 +1063,7 @@ class collisions:
 
             direction = circle.position - closestPoint
 
-            return closestPoint + direction.normalize() * capsule.radius, None, 1
+            return closestPoint + direction.normalize() * capsule.radius, None, 1, (0, 0, 0), None
         
         if (first.shapeType == SHAPE_CAPSULE and second.shapeType in [SHAPE_BOX, SHAPE_POLYGON]) or (second.shapeType == SHAPE_CAPSULE and first.shapeType in [SHAPE_BOX, SHAPE_POLYGON]):
             capsule, box = (first, second) if first.shapeType == SHAPE_CAPSULE else (second, first)
@@ -750,6 +1073,7 @@ class collisions:
             contact1 = pg.Vector2()
             contact2 = pg.Vector2()
             contactCount = 0
+            feature1 = feature2 = None
 
             minDist = 1.0e+10
             for i in range(len(verticesA)):
@@ -760,11 +1084,13 @@ class collisions:
                 if valuesNearlyEqual(distance, minDist) and not vectorsNearlyEqual(closestPoint, contact1):
                     contact2 = closestPoint
                     contactCount = 2
+                    feature2 = (0, i, 0)
 
                 if distance < minDist:
                     minDist = distance
                     contact1 = vert
                     contactCount = 1
+                    feature1 = (0, i, 0)
 
             for i in range(len(verticesB)):
                 point = verticesB[i]
@@ -775,21 +1101,24 @@ class collisions:
                     if valuesNearlyEqual(distance, minDist) and not vectorsNearlyEqual(closestPoint, contact1):
                         contact2 = closestPoint
                         contactCount = 2
+                        feature2 = (1, i, j)
 
                     if distance < minDist:
                         minDist = distance
                         contact1 = closestPoint
                         contactCount = 1
+                        feature1 = (1, i, j)
 
-            return contact1, contact2, contactCount
+            return pg.Vector2(contact1), pg.Vector2(contact2), contactCount, feature1, feature2
 
         if first.shapeType == SHAPE_CIRCLE and second.shapeType == SHAPE_CIRCLE:
-            return first.position + (second.position - first.position).normalize() * first.radius, None, 1
+            return first.position + (second.position - first.position).normalize() * first.radius, None, 1, (0, 0, 0), None
         
         if first.shapeType in [SHAPE_BOX, SHAPE_POLYGON] and second.shapeType in [SHAPE_BOX, SHAPE_POLYGON]:
             contact1 = pg.Vector2()
             contact2 = pg.Vector2()
             contactCount = 0
+            feature1 = feature2 = None
 
             verticesA = first.GetTransformedVertices()
             verticesB = second.GetTransformedVertices()
@@ -805,14 +1134,20 @@ class collisions:
 
                     closestPoint, distance = collisions.PointSegmentDistanceSquared(point, vertA, vertB)
 
-                    if valuesNearlyEqual(distance, minDist) and not vectorsNearlyEqual(closestPoint, contact1):
-                        contact2 = closestPoint
+                    isSecond = isSecondContact(distance, minDist, closestPoint, contact1)
+                    if isSecond:
+                        if distance < minDist and contactTolerance:
+                            contact2, feature2 = contact1, feature1
+                        else:
+                            contact2, feature2 = closestPoint, (0, i, j)
                         contactCount = 2
 
                     if distance < minDist:
+                        if not (isSecond and contactTolerance):
+                            contactCount = 1
                         minDist = distance
-                        contactCount = 1
                         contact1 = closestPoint
+                        feature1 = (0, i, j)
 
             for i in range(len(verticesB)):
                 point = verticesB[i]
@@ -823,22 +1158,29 @@ class collisions:
 
                     closestPoint, distance = collisions.PointSegmentDistanceSquared(point, vertA, vertB)
 
-                    if valuesNearlyEqual(distance, minDist) and not vectorsNearlyEqual(closestPoint, contact1):
-                        contact2 = closestPoint
+                    isSecond = isSecondContact(distance, minDist, closestPoint, contact1)
+                    if isSecond:
+                        if distance < minDist and contactTolerance:
+                            contact2, feature2 = contact1, feature1
+                        else:
+                            contact2, feature2 = closestPoint, (1, i, j)
                         contactCount = 2
 
                     if distance < minDist:
+                        if not (isSecond and contactTolerance):
+                            contactCount = 1
                         minDist = distance
-                        contactCount = 1
                         contact1 = closestPoint
+                        feature1 = (1, i, j)
 
-            return contact1, contact2, contactCount
+            return pg.Vector2(contact1), pg.Vector2(contact2), contactCount, feature1, feature2
         
         if (first.shapeType == SHAPE_CIRCLE and second.shapeType in [SHAPE_BOX, SHAPE_POLYGON]) or (second.shapeType == SHAPE_CIRCLE and first.shapeType in [SHAPE_BOX, SHAPE_POLYGON]):
             circle, box = (first, second) if first.shapeType == SHAPE_CIRCLE else (second, first)
             vertices = box.GetTransformedVertices()
 
             point = pg.Vector2()
+            feature = None
 
             minDist = 1.0e+10
             for i in range(len(vertices)):
@@ -850,10 +1192,11 @@ class collisions:
                 if distance < minDist:
                     minDist = distance
                     point = contact
+                    feature = (1, 0, i)
 
-            return point, None, 1
+            return point, None, 1, feature, None
         
-        return None, None, 0
+        return None, None, 0, None, None
 
     @staticmethod
     def IntersectCircles(firstPosition: pg.Vector2, firstRadius: float, secondPosition: pg.Vector2, secondRadius: int):
@@ -1049,39 +1392,167 @@ class collisions:
         isCollided = True
 
         return isCollided, normal, depth
-        
+    
     @staticmethod
-    def IntersectGeometries(first: Geometry, second: Geometry):
-        isCollided, normal, depth = False, pg.Vector2(), 0
+    def IntersectPolygonsBatch(verticesA: list[list[pg.Vector2]], positionsA: list[pg.Vector2], verticesB: list[list[pg.Vector2]], positionsB: list[pg.Vector2]):
+        # Same as "IntersectPolygons" for many pairs at once. Pairs are grouped by vertex counts so every group is a regular array
+        results: list[tuple[bool, pg.Vector2, float]] = [None] * len(verticesA)
+        groups: dict[tuple[int, int], list[int]] = {}
+        for i in range(len(verticesA)):
+            groups.setdefault((len(verticesA[i]), len(verticesB[i])), []).append(i)
 
-        if second in first.cannotCollideWith or first in second.cannotCollideWith:
-            return isCollided, normal, depth
+        for (countA, countB), indices in groups.items():
+            count = len(indices)
+            polygonsA = np.fromiter(chain.from_iterable(chain.from_iterable(verticesA[i] for i in indices)), float, count * countA * 2).reshape(count, countA, 2)
+            polygonsB = np.fromiter(chain.from_iterable(chain.from_iterable(verticesB[i] for i in indices)), float, count * countB * 2).reshape(count, countB, 2)
+
+            edges = np.concatenate((np.roll(polygonsA, -1, axis=1) - polygonsA, np.roll(polygonsB, -1, axis=1) - polygonsB), axis=1)
+            axes = np.stack((-edges[..., 1], edges[..., 0]), axis=-1)
+            axes /= np.linalg.norm(axes, axis=-1, keepdims=True)
+
+            # Vertices go first so min and max reduce over a handful of contiguous arrays
+            projectionsA = np.einsum("pak,pvk->vpa", axes, polygonsA)
+            projectionsB = np.einsum("pak,pvk->vpa", axes, polygonsB)
+            minA, maxA = projectionsA.min(axis=0), projectionsA.max(axis=0)
+            minB, maxB = projectionsB.min(axis=0), projectionsB.max(axis=0)
+
+            separated = ((minA >= maxB) | (minB >= maxA)).any(axis=1)
+            depths = np.minimum(maxB - minA, maxA - minB)
+            bestAxes = depths.argmin(axis=1)
+            rows = np.arange(count)
+            normals = axes[rows, bestAxes]
+            depths = depths[rows, bestAxes]
+
+            directions = np.fromiter(chain.from_iterable(positionsB[i] - positionsA[i] for i in indices), float, count * 2).reshape(count, 2)
+            normals[(directions * normals).sum(axis=1) < 0] *= -1
+
+            for i, isSeparated, normal, depth in zip(indices, separated.tolist(), normals.tolist(), depths.tolist()):
+                results[i] = (False, pg.Vector2(), 0) if isSeparated else (True, pg.Vector2(normal), depth)
+
+        return results
         
-        if (first.shapeType == SHAPE_CIRCLE and second.shapeType == SHAPE_CIRCLE):
-            isCollided, normal, depth = collisions.IntersectCircles(first.position, first.radius, second.position, second.radius)
+    @staticmethod
+    def IntersectAxisAlignedBoxes(centerA: pg.Vector2, sizeA: pg.typing.Point, centerB: pg.Vector2, sizeB: pg.typing.Point):
+        # Matches "IntersectPolygons" for two boxes with zero angle, including which axis wins a tie
+        leftA = centerA.x - sizeA[0] / 2
+        topA = centerA.y - sizeA[1] / 2
+        leftB = centerB.x - sizeB[0] / 2
+        topB = centerB.y - sizeB[1] / 2
+
+        overlapX = min(leftB + sizeB[0] - leftA, leftA + sizeA[0] - leftB)
+        overlapY = min(topB + sizeB[1] - topA, topA + sizeA[1] - topB)
+        if overlapX <= 0 or overlapY <= 0:
+            return False, pg.Vector2(), 0
         
-        elif (first.shapeType in [SHAPE_BOX, SHAPE_POLYGON] and second.shapeType in [SHAPE_BOX, SHAPE_POLYGON]):
-            isCollided, normal, depth = collisions.IntersectPolygons(first.GetTransformedVertices(), first.position, second.GetTransformedVertices(), second.position)
+        if overlapX < overlapY:
+            normal, depth = pg.Vector2(-1, 0), overlapX
+        else:
+            normal, depth = pg.Vector2(0, 1), overlapY
+
+        if (centerB - centerA).dot(normal) < 0:
+            normal = -normal
+
+        return True, normal, depth
+
+    @staticmethod
+    def IntersectAxisAlignedBoxCircle(boxCenter: pg.Vector2, boxSize: pg.typing.Point, circleCenter: pg.Vector2, radius: float, isFirstABox: bool):
+        left = boxCenter.x - boxSize[0] / 2
+        top = boxCenter.y - boxSize[1] / 2
+        right = left + boxSize[0]
+        bottom = top + boxSize[1]
+
+        overlapX = min(circleCenter.x + radius - left, right - circleCenter.x + radius)
+        overlapY = min(circleCenter.y + radius - top, bottom - circleCenter.y + radius)
+        if overlapX <= 0 or overlapY <= 0:
+            return False, pg.Vector2(), 0
+
+        outsideX = circleCenter.x < left or circleCenter.x > right
+        outsideY = circleCenter.y < top or circleCenter.y > bottom
+        if outsideX and outsideY:
+            corner = pg.Vector2(left if circleCenter.x < left else right, top if circleCenter.y < top else bottom)
+            distance = corner.distance_to(circleCenter)
+            if distance >= radius:
+                return False, pg.Vector2(), 0
             
-        elif ((first.shapeType in [SHAPE_BOX, SHAPE_POLYGON] and second.shapeType == SHAPE_CIRCLE) or (second.shapeType in [SHAPE_BOX, SHAPE_POLYGON] and first.shapeType == SHAPE_CIRCLE)):
-            polygon = second if second.shapeType in [SHAPE_BOX, SHAPE_POLYGON] else first
-            circle = first if first.shapeType == SHAPE_CIRCLE else second
+            normal, depth = (circleCenter - corner) / distance, radius - distance
+        elif overlapX < overlapY:
+            normal, depth = pg.Vector2(-1, 0), overlapX
+        else:
+            normal, depth = pg.Vector2(0, 1), overlapY
 
-            isCollided, normal, depth = collisions.IntersectPolygonCircle(polygon.GetTransformedVertices(), polygon.position, circle.radius, circle.position, first.shapeType in [SHAPE_BOX, SHAPE_POLYGON])
+        direction = boxCenter - circleCenter
+        if (isFirstABox and direction.dot(normal) > 0) or (not isFirstABox and direction.dot(normal) < 0):
+            normal = -normal
 
-        elif ((first.shapeType == SHAPE_CAPSULE and second.shapeType == SHAPE_CIRCLE) or (second.shapeType == SHAPE_CAPSULE and first.shapeType == SHAPE_CIRCLE)):
-            capsule = second if second.shapeType == SHAPE_CAPSULE else first
-            circle = first if first.shapeType == SHAPE_CIRCLE else second
+        return True, normal, depth
 
-            isCollided, normal, depth = collisions.IntersectCapsuleCircle(capsule.radius, capsule.GetTransformedVertices(), circle.position, circle.radius) #, first.shapeType == SHAPE_BOX
+    @staticmethod
+    def ShouldCollide(first: Geometry, second: Geometry):
+        return ((first.collisionCategory & second.collisionMask) != 0 and 
+                (second.collisionCategory & first.collisionMask) != 0 and
+                (not first._cannotCollideWith or second not in first._cannotCollideWith) and 
+                (not second._cannotCollideWith or first not in second._cannotCollideWith))
 
-        elif ((first.shapeType == SHAPE_CAPSULE and second.shapeType in [SHAPE_BOX, SHAPE_POLYGON]) or (second.shapeType == SHAPE_CAPSULE and first.shapeType in [SHAPE_BOX, SHAPE_POLYGON])):
-            polygon = second if second.shapeType in [SHAPE_BOX, SHAPE_POLYGON] else first
-            capsule = first if first.shapeType == SHAPE_CAPSULE else second
+    @staticmethod
+    def __intersectCircleCircle(first: Geometry, second: Geometry):
+        return collisions.IntersectCircles(first.positionView, first.radius, second.positionView, second.radius)
 
-            isCollided, normal, depth = collisions.IntersectPolygonCapsule(polygon.GetTransformedVertices(), polygon.position, capsule.GetTransformedVertices(), capsule.radius, capsule.height, capsule.position, first.shapeType in [SHAPE_BOX, SHAPE_POLYGON])
+    @staticmethod
+    def __intersectPolygonPolygon(first: Geometry, second: Geometry):
+        if first.shapeType == SHAPE_BOX and second.shapeType == SHAPE_BOX and first.angleRadians == 0 and second.angleRadians == 0:
+            return collisions.IntersectAxisAlignedBoxes(first.positionView, (first.width, first.height), second.positionView, (second.width, second.height))
+        
+        return collisions.IntersectPolygons(first.GetTransformedVertices(), first.positionView, second.GetTransformedVertices(), second.positionView)
 
-        return isCollided, normal, depth
+    @staticmethod
+    def __intersectPolygonCircle(first: Geometry, second: Geometry):
+        isFirstABox = first.shapeType != SHAPE_CIRCLE
+        polygon, circle = (first, second) if isFirstABox else (second, first)
+
+        if polygon.shapeType == SHAPE_BOX and polygon.angleRadians == 0:
+            return collisions.IntersectAxisAlignedBoxCircle(polygon.positionView, (polygon.width, polygon.height), circle.positionView, circle.radius, isFirstABox)
+        
+        return collisions.IntersectPolygonCircle(polygon.GetTransformedVertices(), polygon.positionView, circle.radius, circle.positionView, isFirstABox)
+
+    @staticmethod
+    def __intersectCapsuleCircle(first: Geometry, second: Geometry):
+        capsule, circle = (first, second) if first.shapeType == SHAPE_CAPSULE else (second, first)
+        return collisions.IntersectCapsuleCircle(capsule.radius, capsule.GetTransformedVertices(), circle.positionView, circle.radius)
+
+    @staticmethod
+    def __intersectPolygonCapsule(first: Geometry, second: Geometry):
+        isFirstABox = first.shapeType != SHAPE_CAPSULE
+        polygon, capsule = (first, second) if isFirstABox else (second, first)
+        return collisions.IntersectPolygonCapsule(polygon.GetTransformedVertices(), polygon.positionView, capsule.GetTransformedVertices(), capsule.radius, capsule.height, capsule.positionView, isFirstABox)
+
+    __intersectionFunctions = {
+        (SHAPE_CIRCLE, SHAPE_CIRCLE): __intersectCircleCircle,
+        (SHAPE_BOX, SHAPE_BOX): __intersectPolygonPolygon,
+        (SHAPE_BOX, SHAPE_POLYGON): __intersectPolygonPolygon,
+        (SHAPE_POLYGON, SHAPE_BOX): __intersectPolygonPolygon,
+        (SHAPE_POLYGON, SHAPE_POLYGON): __intersectPolygonPolygon,
+        (SHAPE_BOX, SHAPE_CIRCLE): __intersectPolygonCircle,
+        (SHAPE_CIRCLE, SHAPE_BOX): __intersectPolygonCircle,
+        (SHAPE_POLYGON, SHAPE_CIRCLE): __intersectPolygonCircle,
+        (SHAPE_CIRCLE, SHAPE_POLYGON): __intersectPolygonCircle,
+        (SHAPE_CAPSULE, SHAPE_CIRCLE): __intersectCapsuleCircle,
+        (SHAPE_CIRCLE, SHAPE_CAPSULE): __intersectCapsuleCircle,
+        (SHAPE_BOX, SHAPE_CAPSULE): __intersectPolygonCapsule,
+        (SHAPE_CAPSULE, SHAPE_BOX): __intersectPolygonCapsule,
+        (SHAPE_POLYGON, SHAPE_CAPSULE): __intersectPolygonCapsule,
+        (SHAPE_CAPSULE, SHAPE_POLYGON): __intersectPolygonCapsule,
+    }
+
+    @staticmethod
+    def IntersectGeometries(first: Geometry, second: Geometry):
+        if not collisions.ShouldCollide(first, second):
+            return False, pg.Vector2(), 0
+        
+        function = collisions.__intersectionFunctions.get((first.shapeType, second.shapeType))
+        if function is None:
+            return False, pg.Vector2(), 0
+
+        return function(first, second)
     
     @staticmethod
     def CollideGeometries(first: Geometry, second: Geometry):
@@ -1097,6 +1568,178 @@ class collisions:
         
         return True
 
+    @staticmethod
+    def IntersectRayAABB(start: pg.Vector2, direction: pg.Vector2, aabbMin: pg.typing.Point, aabbMax: pg.typing.Point, maxFraction: float = 1):
+        lower, upper = 0.0, maxFraction
+        for axis in (0, 1):
+            if direction[axis] == 0:
+                if start[axis] < aabbMin[axis] or start[axis] > aabbMax[axis]:
+                    return None
+                continue
+
+            inverse = 1 / direction[axis]
+            near = (aabbMin[axis] - start[axis]) * inverse
+            far = (aabbMax[axis] - start[axis]) * inverse
+            if near > far:
+                near, far = far, near
+
+            lower = near if near > lower else lower
+            upper = far if far < upper else upper
+            if lower > upper:
+                return None
+
+        return lower
+
+    @staticmethod
+    def __rayCastCircle(start: pg.Vector2, direction: pg.Vector2, center: pg.Vector2, radius: float, maxFraction: float):
+        offset = start - center
+        a = direction.dot(direction)
+        b = offset.dot(direction)
+        c = offset.dot(offset) - radius * radius
+
+        # Rays starting inside of a shape don't hit it
+        if c <= 0 or a == 0:
+            return None
+        
+        discriminant = b * b - a * c
+        if discriminant < 0:
+            return None
+        
+        fraction = (-b - math.sqrt(discriminant)) / a
+        if fraction < 0 or fraction > maxFraction:
+            return None
+        
+        normal = offset + direction * fraction
+        return fraction, normal.normalize()
+
+    @staticmethod
+    def __rayCastPolygon(start: pg.Vector2, direction: pg.Vector2, vertices: list[pg.Vector2], maxFraction: float):
+        center = pg.Vector2()
+        for vertex in vertices:
+            center += vertex
+        center /= len(vertices)
+
+        lower, upper = 0.0, maxFraction
+        hitNormal = None
+        for i in range(len(vertices)):
+            vertA = vertices[i]
+            vertB = vertices[(i + 1) % len(vertices)]
+            edge = vertB - vertA
+            normal = pg.Vector2(edge.y, -edge.x)
+            if normal.dot(vertA - center) < 0:
+                normal = -normal
+
+            numerator = normal.dot(vertA - start)
+            denominator = normal.dot(direction)
+
+            if denominator == 0:
+                if numerator < 0:
+                    return None
+                continue
+
+            if denominator < 0 and numerator < lower * denominator:
+                lower = numerator / denominator
+                hitNormal = normal
+            elif denominator > 0 and numerator < upper * denominator:
+                upper = numerator / denominator
+
+            if upper < lower:
+                return None
+            
+        if hitNormal is None:
+            return None
+        
+        return lower, hitNormal.normalize()
+
+    @staticmethod
+    def RayCastGeometry(geometry: Geometry, start: pg.Vector2, end: pg.Vector2, maxFraction: float = 1):
+        start = pg.Vector2(start)
+        direction = pg.Vector2(end) - start
+        result = None
+
+        if geometry.shapeType == SHAPE_CIRCLE:
+            result = collisions.__rayCastCircle(start, direction, geometry.position, geometry.radius, maxFraction)
+
+        elif geometry.shapeType in [SHAPE_BOX, SHAPE_POLYGON]:
+            result = collisions.__rayCastPolygon(start, direction, geometry.GetTransformedVertices(), maxFraction)
+
+        elif geometry.shapeType == SHAPE_CAPSULE:
+            if collisions.CollidePoint(geometry, start):
+                return None
+            
+            vertices = geometry.GetTransformedVertices()
+            side = (vertices[1] - vertices[0]).rotate(90)
+            side.scale_to_length(geometry.radius)
+            body = [vertices[0] + side, vertices[1] + side, vertices[1] - side, vertices[0] - side]
+
+            for candidate in (collisions.__rayCastPolygon(start, direction, body, maxFraction),
+                              collisions.__rayCastCircle(start, direction, vertices[0], geometry.radius, maxFraction),
+                              collisions.__rayCastCircle(start, direction, vertices[1], geometry.radius, maxFraction)):
+                if candidate and (result is None or candidate[0] < result[0]):
+                    result = candidate
+
+        if result is None:
+            return None
+
+        fraction, normal = result
+        return fraction, start + direction * fraction, normal
+
+    @staticmethod
+    def ShapeCastGeometry(geometry: Geometry, end: pg.Vector2, other: Geometry, maxFraction: float = 1, tolerance: float = 0.5):
+        # Moves a copy of "geometry" towards "end" and returns where it first touches "other", the geometry itself is left alone.
+        # The slab test against "other" grown by half of the shape's size limits the part of the path that has to be sampled
+        geometry = geometry.Copy()
+        start = pg.Vector2(geometry.position)
+        motion = pg.Vector2(end) - start
+        aabb, otherAABB = geometry.GetAABB(), other.GetAABB()
+        offset = start - (aabb.min + aabb.max) / 2
+        halfSize = aabb.size / 2
+        enter = collisions.IntersectRayAABB(start - offset, motion, otherAABB.min - halfSize, otherAABB.max + halfSize, maxFraction)
+        if enter is None:
+            return None
+
+        distance = motion.length()
+        if geometry.shapeType in [SHAPE_CIRCLE, SHAPE_CAPSULE]:
+            extent = geometry.radius
+        else:
+            extent = min(aabb.width, aabb.height) / 2
+
+        def isColliding(fraction: float):
+            geometry.SetPosition(start + motion * fraction)
+            return collisions.IntersectGeometries(geometry, other)
+
+        free, hit = enter, None
+        result = isColliding(enter)
+        if result[0]:
+            hit = enter
+        elif distance > 0 and extent > 0:
+            samples = max(math.ceil((maxFraction - enter) * distance / extent), 1)
+            for i in range(1, samples + 1):
+                fraction = enter + (maxFraction - enter) * i / samples
+                result = isColliding(fraction)
+                if result[0]:
+                    hit = fraction
+                    break
+                free = fraction
+
+        if hit is not None and hit > 0:
+            while (hit - free) * distance > tolerance:
+                middle = (free + hit) / 2
+                middleResult = isColliding(middle)
+                if middleResult[0]:
+                    hit, result = middle, middleResult
+                else:
+                    free = middle
+
+            isColliding(hit)
+
+        if hit is None:
+            return None
+        
+        contact1, contact2, count = collisions.FindContactPoints(geometry, other)
+        point = (contact1 + contact2) / 2 if count == 2 else pg.Vector2(contact1)
+        return hit, point, -result[1]
+
     @staticmethod
     def CollidePoint(geometry: Geometry, point: pg.Vector2):
         if geometry.shapeType == SHAPE_CIRCLE:
@@ -1131,6 +1774,8 @@ class collisions:
 
 
 class Component:
+    __slots__ = ("__type", "_object")
+
     def __init__(self, type: str):
         self.__type = type
         self._object: GameObject = None
@@ -1565,6 +2210,10 @@ class PhysicsMaterial:
         return PhysicsMaterial(self.density, self.restitution, self.staticFriction, self.dynamicFriction)
 
 class Rigidbody(Component):
+    __slots__ = ("__shape", "mass", "invMass", "inertia", "invInertia", "material", "__freezedRotations", "__isStatic", 
+                 "_batch", "_batchIndex", "_unpacked", "_integratedByLayer", "__continuousCollision", 
+                 "__linearVelocity", "__angularVelocity", "__force", "__torque", "__isSleeping", "_sleepTime", "_sleepIsland")
+
     def __init__(self, material: PhysicsMaterial, isStatic: bool = False, freezeRotation: bool = False):
         super().__init__("object")
         self.__shape: Geometry = None
@@ -1578,11 +2227,21 @@ class Rigidbody(Component):
         self.__freezedRotations = freezeRotation
         self.__isStatic = isStatic
         
-        self.linearVelocity = pg.Vector2()
-        self.angularVelocity = 0
+        self._batch: RigidbodyBatch = None
+        self._batchIndex = -1
+        self._unpacked = False
+        self._integratedByLayer = False
+        self.__continuousCollision = False
 
-        self.force = pg.Vector2()
-        self.torque = 0
+        self.__linearVelocity = pg.Vector2()
+        self.__angularVelocity = 0
+
+        self.__force = pg.Vector2()
+        self.__torque = 0
+
+        self.__isSleeping = False
+        self._sleepTime = 0
+        self._sleepIsland: list[Rigidbody] = None
 
         # self.cannotCollideWith: list[Rigidbody] = []
 
@@ -1593,17 +2252,110 @@ class Rigidbody(Component):
 
         return self.__shape
     
+    @property
+    def linearVelocity(self):
+        if not self._unpacked and self._batch:
+            return Vector2View(self, "linearVelocity")
+        return self.__linearVelocity
+    
+    @linearVelocity.setter
+    def linearVelocity(self, value: pg.Vector2 | tuple):
+        if not self._unpacked and self._batch:
+            self._batch.linearVelocity[self._batchIndex] = (value[0], value[1])
+        else:
+            self.__linearVelocity.update(value)
+
+    @property
+    def angularVelocity(self):
+        if not self._unpacked and self._batch:
+            return float(self._batch.angularVelocity[self._batchIndex])
+        return self.__angularVelocity
+    
+    @angularVelocity.setter
+    def angularVelocity(self, value: float):
+        if not self._unpacked and self._batch:
+            self._batch.angularVelocity[self._batchIndex] = value
+        else:
+            self.__angularVelocity = value
+
+    @property
+    def force(self):
+        if not self._unpacked and self._batch:
+            return Vector2View(self, "force")
+        return self.__force
+    
+    @force.setter
+    def force(self, value: pg.Vector2 | tuple):
+        if not self._unpacked and self._batch:
+            self._batch.force[self._batchIndex] = (value[0], value[1])
+        else:
+            self.__force.update(value)
+
+    @property
+    def torque(self):
+        if not self._unpacked and self._batch:
+            return float(self._batch.torque[self._batchIndex])
+        return self.__torque
+    
+    @torque.setter
+    def torque(self, value: float):
+        if not self._unpacked and self._batch:
+            self._batch.torque[self._batchIndex] = value
+        else:
+            self.__torque = value
+
+    def _Unpack(self, linearVelocity: list[float], angularVelocity: float, force: list[float], torque: float):
+        # Until its batch packs it again, the body's own vectors hold its state instead of the batch arrays
+        self.__linearVelocity.xy = linearVelocity
+        self.__angularVelocity = angularVelocity
+        self.__force.xy = force
+        self.__torque = torque
+        self._unpacked = True
+
     def IsStatic(self):
         return self.__isStatic
     
+    def IsSleeping(self):
+        return self.__isSleeping
+    
+    def IsAwake(self):
+        return not self.__isStatic and not self.__isSleeping
+    
+    def WakeUp(self):
+        if not self.__isSleeping:
+            return
+        
+        self.__isSleeping = False
+        self._sleepTime = 0
+        if self._batch:
+            self._batch.Refresh(self)
+        island = self._sleepIsland
+        self._sleepIsland = None
+        if island:
+            for body in island:
+                body.WakeUp()
+
+    def _Sleep(self, island: list):
+        self.__isSleeping = True
+        self._sleepIsland = island
+        self.linearVelocity = (0, 0)
+        self.angularVelocity = 0
+        self.force = (0, 0)
+        self.torque = 0
+        if self._batch:
+            self._batch.Refresh(self)
+
     def SetStatic(self, value):
         self.__isStatic = value
+        self.WakeUp()
         self.invInertia = 0
         self.invMass = 0
         if not self.__isStatic:
             if not self.__freezedRotations:
                 self.invInertia = 1 / self.inertia
             self.invMass = 1 / self.mass
+        if self._batch:
+            self._batch.Refresh(self)
 
     def FreezeRotations(self):
         self.__freezedRotations = True
@@ -1614,6 +2366,18 @@ class Rigidbody(Component):
         if not self.__isStatic:
             self.invInertia = 1 / self.inertia
 
+    def AreRotationsFrozen(self):
+        return self.__freezedRotations
+
+    def EnableContinuousCollision(self):
+        self.__continuousCollision = True
+
+    def DisableContinuousCollision(self):
+        self.__continuousCollision = False
+
+    def IsContinuousCollisionEnabled(self):
+        return self.__continuousCollision
+
     def __calculateInertiaForPolygon(self, vertices: list[pg.Vector2], area: float):
         n = len(vertices)
         
@@ -1668,29 +2432,43 @@ class Rigidbody(Component):
             self.invMass = 1 / self.mass
 
     def Update(self, dt: float):
+        # Bodies of a physics layer with a fixed time step or an iterative solver are only integrated by the layer
+        if not self._integratedByLayer:
+            self._Integrate(dt)
+
+    def _Integrate(self, dt: float):
+        # Batched bodies are integrated all at once by their batch
+        if self.__isSleeping or self._batch:
+            return
+
+        self._IntegrateVelocity(dt)
+        self._IntegratePosition(dt)
+
+    def _IntegrateVelocity(self, dt: float):
         if not self.__isStatic and self._object._layer:
             self.linearVelocity += self._object._layer._gravity * dt
 
         acceleration = self.force / self.mass
 
         self.linearVelocity += acceleration * dt
-        self.angularVelocity += self.torque / self.inertia * dt
+        self.__angularVelocity += self.__torque / self.inertia * dt
         
         self.linearVelocity *= 1 - self.material.airFriction
-        self.angularVelocity *= 1 - self.material.airFriction
+        self.__angularVelocity *= 1 - self.material.airFriction
 
-        self.shape.Move(self.linearVelocity * dt)
-        self.shape.RotateRadians(self.angularVelocity * dt)
+        self.__force.xy = (0, 0)
+        self.__torque = 0
 
-        self.force.xy = (0, 0)
-        self.torque = 0
+    def _IntegratePosition(self, dt: float):
+        self.shape.Move(self.__linearVelocity * dt)
+        self.shape.RotateRadians(self.__angularVelocity * dt)
 
         if self._object.image:
             self._object.image.rotation = self.shape.angle
-        self.shape.Update()
 
     def ApplyForce(self, value: pg.Vector2 | tuple):
         self.force += pg.Vector2(value)
+        self.WakeUp()
 
     def ApplyForceAtPoint(self, value: pg.Vector2 | tuple, point: pg.Vector2, torqueFactor: float = 1):
         self.ApplyForceAtLocalPoint(pg.Vector2(value), point - self.shape.position, torqueFactor)
@@ -1699,38 +2477,326 @@ class Rigidbody(Component):
         if point is not None and value is not None:
             self.force += pg.Vector2(value)
             self.torque += point.cross(value) * torqueFactor
+            self.WakeUp()
 
     def ApplyForceAtAnchor(self, value: pg.Vector2, anchorIndex: int, torqueFactor: float = 1):
         self.ApplyForceAtPoint(value, self.shape.GetAnchor(anchorIndex), torqueFactor)
 
     def ApplyAngularForce(self, value: float):
         self.angularVelocity += value
+        self.WakeUp()
 
 
-components = [FrameAnimator, Rigidbody]
-
-
-class GameObject(object):
-    __gameObjectCount = 0
-
-    def __init__(self, geometry: Geometry, imageName: str = None, **kwargs):
-        global game
-        self.__game = game
-        self.image: Image = self.__game.assets.GetImage(imageName) if imageName else None
-        self.geometry: Geometry = geometry
+class Vector2View:
+    # Behaves like a "pg.Vector2" but reads and writes a row of a "RigidbodyBatch" array
+    def __init__(self, rigidbody: Rigidbody, name: str):
+        self.__rigidbody = rigidbody
+        self.__name = name
 
-        self._layer: ObjectsLayer = None
+    def __row(self):
+        if self.__rigidbody._batch:
+            return getattr(self.__rigidbody._batch, self.__name)[self.__rigidbody._batchIndex]
+        return getattr(self.__rigidbody, self.__name)
 
-        self.__components: dict[str, Component] = {}
+    @property
+    def x(self):
+        return float(self.__row()[0])
+    
+    @x.setter
+    def x(self, value: float):
+        self.__row()[0] = value
 
-        self.__id = GameObject.__gameObjectCount
-        self.__destroyed = False
+    @property
+    def y(self):
+        return float(self.__row()[1])
+    
+    @y.setter
+    def y(self, value: float):
+        self.__row()[1] = value
 
-        self._imageToGeometryOffset = pg.Vector2()
+    @property
+    def xy(self):
+        row = self.__row()
+        return pg.Vector2(float(row[0]), float(row[1]))
+    
+    @xy.setter
+    def xy(self, value: pg.Vector2 | tuple):
+        row = self.__row()
+        row[0], row[1] = value[0], value[1]
+
+    def __getattr__(self, name: str):
+        vector = self.xy
+        attribute = getattr(vector, name)
+        if callable(attribute) and (name.endswith("_ip") or name in ("update", "scale_to_length")):
+            def method(*args, **kwargs):
+                result = attribute(*args, **kwargs)
+                self.xy = vector
+                return result
+            return method
+        
+        return attribute
 
-        GameObject.__gameObjectCount += 1
+    def __len__(self):
+        return 2
+    
+    def __getitem__(self, index: int):
+        return self.xy[index]
+    
+    def __setitem__(self, index: int, value: float):
+        self.__row()[index] = value
 
-        for name, value in kwargs.items():
+    def __iter__(self):
+        return iter(self.xy)
+    
+    def __eq__(self, other):
+        return self.xy == other
+    
+    def __ne__(self, other):
+        return self.xy != other
+    
+    def __bool__(self):
+        return bool(self.xy)
+    
+    def __neg__(self):
+        return -self.xy
+    
+    def __pos__(self):
+        return self.xy
+    
+    def __add__(self, other):
+        return self.xy + other
+    
+    def __radd__(self, other):
+        return other + self.xy
+    
+    def __sub__(self, other):
+        return self.xy - other
+    
+    def __rsub__(self, other):
+        return other - self.xy
+    
+    def __mul__(self, other):
+        return self.xy * other
+    
+    def __rmul__(self, other):
+        return other * self.xy
+    
+    def __truediv__(self, other):
+        return self.xy / other
+    
+    def __iadd__(self, other):
+        self.xy = self.xy + other
+        return self
+    
+    def __isub__(self, other):
+        self.xy = self.xy - other
+        return self
+    
+    def __imul__(self, other):
+        self.xy = self.xy * other
+        return self
+    
+    def __itruediv__(self, other):
+        self.xy = self.xy / other
+        return self
+
+    def __str__(self):
+        return str(self.xy)
+    
+    def __repr__(self):
+        return f"Vector2View({self.x}, {self.y})"
+
+
+class RigidbodyBatch:
+    # Keeps the state of many rigidbodies in contiguous arrays and integrates them in one vectorized pass
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            ErrorHandler.Throw("ModuleNotFoundError", "RigidbodyBatch", "__init__", None, "Batched integration requires NumPy. Install it with \"pip install numpy\"")
+
+        self.__rigidbodies: list[Rigidbody] = []
+        self.__unpacked: list[Rigidbody] = []
+        self.__allocate(max(capacity, 1))
+
+    def __allocate(self, capacity: int):
+        count = len(self.__rigidbodies)
+        arrays = {"linearVelocity": (capacity, 2), "force": (capacity, 2), 
+                  "angularVelocity": (capacity,), "torque": (capacity,), 
+                  "inverseMass": (capacity,), "inverseInertia": (capacity,),
+                  "damping": (capacity,), "gravityScale": (capacity,)}
+        
+        for name, shape in arrays.items():
+            array = np.zeros(shape)
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.__rigidbodies)
+    
+    def __contains__(self, rigidbody: Rigidbody):
+        return rigidbody._batch is self
+
+    def Add(self, rigidbody: Rigidbody):
+        if rigidbody._batch:
+            ErrorHandler.ThrowExistenceError("RigidbodyBatch", "Add", "rigidbody")
+
+        index = len(self.__rigidbodies)
+        if index == len(self.torque):
+            self.__allocate(index * 2)
+
+        linearVelocity, angularVelocity = rigidbody.linearVelocity, rigidbody.angularVelocity
+        force, torque = rigidbody.force, rigidbody.torque
+
+        self.__rigidbodies.append(rigidbody)
+        rigidbody._batch = self
+        rigidbody._batchIndex = index
+
+        rigidbody.linearVelocity = linearVelocity
+        rigidbody.angularVelocity = angularVelocity
+        rigidbody.force = force
+        rigidbody.torque = torque
+        self.Refresh(rigidbody)
+
+    def Remove(self, rigidbody: Rigidbody):
+        if rigidbody._batch is not self:
+            ErrorHandler.ThrowMissingError("RigidbodyBatch", "Remove", "rigidbody")
+
+        index = rigidbody._batchIndex
+        linearVelocity, angularVelocity = rigidbody.linearVelocity.xy, rigidbody.angularVelocity
+        force, torque = rigidbody.force.xy, rigidbody.torque
+        if rigidbody._unpacked:
+            self.__unpacked.remove(rigidbody)
+            rigidbody._unpacked = False
+
+        last = len(self.__rigidbodies) - 1
+        if index != last:
+            moved = self.__rigidbodies[last]
+            self.__rigidbodies[index] = moved
+            moved._batchIndex = index
+            for name in ("linearVelocity", "force", "angularVelocity", "torque", "inverseMass", "inverseInertia", "damping", "gravityScale"):
+                array = getattr(self, name)
+                array[index] = array[last]
+        self.__rigidbodies.pop()
+
+        rigidbody._batch = None
+        rigidbody._batchIndex = -1
+        rigidbody.linearVelocity = linearVelocity
+        rigidbody.angularVelocity = angularVelocity
+        rigidbody.force = force
+        rigidbody.torque = torque
+
+    def Clear(self):
+        while self.__rigidbodies:
+            self.Remove(self.__rigidbodies[-1])
+
+    def Refresh(self, rigidbody: Rigidbody):
+        index = rigidbody._batchIndex
+        self.inverseMass[index] = 1 / rigidbody.mass if rigidbody.mass else 0
+        self.inverseInertia[index] = 1 / rigidbody.inertia if rigidbody.inertia else 0
+        self.damping[index] = 1 - rigidbody.material.airFriction
+        self.gravityScale[index] = 1 if rigidbody.IsAwake() else 0
+
+    def Unpack(self, rigidbodies: list[Rigidbody]):
+        # Solvers read and write velocities one value at a time, which is much slower through views of the arrays.
+        # Bodies about to be solved get their state copied to their own vectors, and it's copied back before the next integration
+        rigidbodies = [rigidbody for rigidbody in dict.fromkeys(rigidbodies) if rigidbody._batch is self and not rigidbody._unpacked]
+        if not rigidbodies:
+            return
+        
+        indices = [rigidbody._batchIndex for rigidbody in rigidbodies]
+        for rigidbody, linearVelocity, angularVelocity, force, torque in zip(rigidbodies, self.linearVelocity[indices].tolist(), self.angularVelocity[indices].tolist(), 
+                                                                             self.force[indices].tolist(), self.torque[indices].tolist()):
+            rigidbody._Unpack(linearVelocity, angularVelocity, force, torque)
+        self.__unpacked.extend(rigidbodies)
+
+    def Pack(self):
+        if not self.__unpacked:
+            return
+        
+        rigidbodies = self.__unpacked
+        indices = [rigidbody._batchIndex for rigidbody in rigidbodies]
+        self.linearVelocity[indices] = [tuple(rigidbody.linearVelocity) for rigidbody in rigidbodies]
+        self.angularVelocity[indices] = [rigidbody.angularVelocity for rigidbody in rigidbodies]
+        self.force[indices] = [tuple(rigidbody.force) for rigidbody in rigidbodies]
+        self.torque[indices] = [rigidbody.torque for rigidbody in rigidbodies]
+        for rigidbody in rigidbodies:
+            rigidbody._unpacked = False
+        self.__unpacked = []
+
+    def Integrate(self, gravity: pg.Vector2, dt: float):
+        self.IntegrateVelocities(gravity, dt)
+        self.IntegratePositions(dt)
+
+    def IntegrateVelocities(self, gravity: pg.Vector2, dt: float):
+        count = len(self.__rigidbodies)
+        if not count:
+            return
+        
+        self.Pack()
+        
+        linearVelocity = self.linearVelocity[:count]
+        angularVelocity = self.angularVelocity[:count]
+        force = self.force[:count]
+        torque = self.torque[:count]
+        damping = self.damping[:count]
+
+        linearVelocity += self.gravityScale[:count, None] * (gravity[0] * dt, gravity[1] * dt)
+        linearVelocity += force * (self.inverseMass[:count, None] * dt)
+        angularVelocity += torque * self.inverseInertia[:count] * dt
+
+        linearVelocity *= damping[:, None]
+        angularVelocity *= damping
+
+        force.fill(0)
+        torque.fill(0)
+
+    def IntegratePositions(self, dt: float):
+        count = len(self.__rigidbodies)
+        if not count:
+            return
+        
+        self.Pack()
+
+        displacement = self.linearVelocity[:count] * dt
+        rotation = self.angularVelocity[:count] * dt
+        moved = np.flatnonzero((displacement[:, 0] != 0) | (displacement[:, 1] != 0) | (rotation != 0))
+
+        for index, (x, y), angle in zip(moved.tolist(), displacement[moved].tolist(), rotation[moved].tolist()):
+            rigidbody = self.__rigidbodies[index]
+            shape = rigidbody.shape
+            shape.Move((x, y))
+            shape.RotateRadians(angle)
+            
+            if rigidbody._object.image:
+                rigidbody._object.image.rotation = shape.angle
+
+
+components = [FrameAnimator, Rigidbody]
+
+
+class GameObject(object):
+    # Subclasses declared by games without "__slots__" still get a "__dict__" for their own attributes
+    __slots__ = ("__game", "image", "geometry", "_layer", "__components", "__id", "__destroyed", "_imageToGeometryOffset")
+    __gameObjectCount = 0
+
+    def __init__(self, geometry: Geometry, imageName: str = None, **kwargs):
+        global game
+        self.__game = game
+        self.image: Image = self.__game.assets.GetImage(imageName) if imageName else None
+        self.geometry: Geometry = geometry
+
+        self._layer: ObjectsLayer = None
+
+        self.__components: dict[str, Component] = {}
+
+        self.__id = GameObject.__gameObjectCount
+        self.__destroyed = False
+
+        self._imageToGeometryOffset = pg.Vector2()
+
+        GameObject.__gameObjectCount += 1
+
+        for name, value in kwargs.items():
             match(name):
                 case "components":
                     if not isinstance(value, list):
@@ -1801,7 +2867,6 @@ class GameObject(object):
             self.image = self.__game.assets.LoadImage(file, f"GameObject {self.__id}", width=geometryAABB.width, height=geometryAABB.height)      
 
     def Update(self):
-        self.geometry.Update()
         for component in self.__components.values():
             component.Update(self.__game.time.GetDeltaTime())
 
@@ -1876,6 +2941,9 @@ class GameObject(object):
 
 
 class CollisionManifold:
+    __slots__ = ("bodyA", "bodyB", "normal", "depth", "contact1", "contact2", "contactCount", "featureIds", "normalImpulses", "tangentImpulses", 
+                 "_rigidbodyA", "_rigidbodyB", "_raList", "_rbList", "_normalMasses", "_tangentMasses", "_normalMatrix", "_targetVelocities", "_startPositions")
+
     def __init__(self, bodyA: GameObject, bodyB: GameObject, normal: pg.Vector2, depth: int, contacts: tuple):
         self.bodyA = bodyA
         self.bodyB = bodyB
@@ -1884,6 +2952,80 @@ class CollisionManifold:
         self.contact1 = contacts[0]
         self.contact2 = contacts[1]
         self.contactCount = contacts[2]
+        self.featureIds = (contacts[3], contacts[4]) if len(contacts) > 3 else (None, None)
+        self.normalImpulses = [0, 0]
+        self.tangentImpulses = [0, 0]
+
+        self._rigidbodyA: Rigidbody = None
+        self._rigidbodyB: Rigidbody = None
+        self._raList: list[pg.Vector2] = []
+        self._rbList: list[pg.Vector2] = []
+        self._normalMasses: list[float] = []
+        self._tangentMasses: list[float] = []
+        self._normalMatrix: tuple[float, float, float] = None
+        self._targetVelocities: list[float] = []
+        self._startPositions: tuple[pg.Vector2, pg.Vector2] = None
+
+class ContactCache:
+    # Remembers accumulated impulses of every touching pair, so the solver can start from them on the next step
+    def __init__(self, matchDistance: float = 2):
+        self.matchDistance = matchDistance
+        self.__manifolds: dict[tuple[GameObject, GameObject], list[tuple[tuple, pg.Vector2, float, float]]] = {}
+        self.__touched: set[tuple[GameObject, GameObject]] = set()
+
+    def __len__(self):
+        return len(self.__manifolds)
+
+    @staticmethod
+    def __localPoint(manifold: CollisionManifold, point: pg.Vector2):
+        geometry = manifold.bodyA.geometry
+        return (point - geometry.position).rotate_rad(-geometry.angleRadians)
+
+    def Load(self, manifold: CollisionManifold):
+        cached = self.__manifolds.get((manifold.bodyA, manifold.bodyB))
+        if not cached or len(cached) != manifold.contactCount:
+            return False
+        
+        # Contacts are matched by feature id first, and by their position on the first body when the id changed.
+        # Warm starting only some of the contacts would spin the bodies, so it's all or nothing
+        contacts = [manifold.contact1, manifold.contact2]
+        impulses: list[tuple[float, float]] = []
+        for i in range(manifold.contactCount):
+            match = next((entry for entry in cached if entry[0] == manifold.featureIds[i]), None)
+            if match is None:
+                localPoint = self.__localPoint(manifold, contacts[i])
+                match = next((entry for entry in cached if entry[1].distance_squared_to(localPoint) <= self.matchDistance ** 2), None)
+            if match is None:
+                return False
+            
+            impulses.append((match[2], match[3]))
+
+        for i, (normalImpulse, tangentImpulse) in enumerate(impulses):
+            manifold.normalImpulses[i] = normalImpulse
+            manifold.tangentImpulses[i] = tangentImpulse
+        return True
+
+    def Store(self, manifold: CollisionManifold):
+        key = (manifold.bodyA, manifold.bodyB)
+        contacts = [manifold.contact1, manifold.contact2]
+        self.__manifolds[key] = [(manifold.featureIds[i], self.__localPoint(manifold, contacts[i]), manifold.normalImpulses[i], manifold.tangentImpulses[i]) 
+                                 for i in range(manifold.contactCount)]
+        self.__touched.add(key)
+
+    def Prune(self):
+        # Pairs that didn't touch since the last prune are forgotten
+        for key in [key for key in self.__manifolds if key not in self.__touched]:
+            del self.__manifolds[key]
+        self.__touched.clear()
+
+    def Remove(self, gameObject: GameObject):
+        for key in [key for key in self.__manifolds if gameObject in key]:
+            del self.__manifolds[key]
+            self.__touched.discard(key)
+
+    def Clear(self):
+        self.__manifolds.clear()
+        self.__touched.clear()
 
 class CollisionsResolver:
     @staticmethod
@@ -2089,6 +3231,136 @@ class CollisionsResolver:
             second.linearVelocity += impulse * second.invMass
             second.angularVelocity += rbList[i].cross(impulse) * second.invInertia
 
+    @staticmethod
+    def __applyContactImpulse(contact: CollisionManifold, i: int, impulse: pg.Vector2):
+        first, second = contact._rigidbodyA, contact._rigidbodyB
+
+        first.linearVelocity += -impulse * first.invMass
+        first.angularVelocity += -contact._raList[i].cross(impulse) * first.invInertia
+
+        second.linearVelocity += impulse * second.invMass
+        second.angularVelocity += contact._rbList[i].cross(impulse) * second.invInertia
+
+    @staticmethod
+    def __relativeContactVelocity(contact: CollisionManifold, i: int):
+        first, second = contact._rigidbodyA, contact._rigidbodyB
+        ra, rb = contact._raList[i], contact._rbList[i]
+        return ((second.linearVelocity + pg.Vector2(-rb.y, rb.x) * second.angularVelocity) - 
+                (first.linearVelocity + pg.Vector2(-ra.y, ra.x) * first.angularVelocity))
+
+    @staticmethod
+    def PrepareContact(contact: CollisionManifold, warmStartingFactor: float = 1, restitutionThreshold: float = 0):
+        # Sequential impulses with accumulated impulses: the impulses of the previous step are applied first,
+        # then only the correction is solved, clamped so the total normal impulse never pulls bodies together
+        first = contact._rigidbodyA = contact.bodyA.GetComponent(Rigidbody)
+        second = contact._rigidbodyB = contact.bodyB.GetComponent(Rigidbody)
+        normal = contact.normal
+        tangent = pg.Vector2(-normal.y, normal.x)
+
+        contactList = [contact.contact1, contact.contact2]
+        positionA = contact.bodyA.geometry.position
+        positionB = contact.bodyB.geometry.position
+        contact._raList = [contactList[i] - positionA for i in range(contact.contactCount)]
+        contact._rbList = [contactList[i] - positionB for i in range(contact.contactCount)]
+
+        def effectiveMass(i: int, direction: pg.Vector2):
+            ra, rb = contact._raList[i], contact._rbList[i]
+            return 1 / (first.invMass + second.invMass + 
+                        pg.Vector2(-ra.y, ra.x).dot(direction)**2 * first.invInertia + 
+                        pg.Vector2(-rb.y, rb.x).dot(direction)**2 * second.invInertia)
+
+        e = min(first.material.restitution, second.material.restitution)
+        contact._normalMasses = [effectiveMass(i, normal) for i in range(contact.contactCount)]
+        contact._tangentMasses = [effectiveMass(i, tangent) for i in range(contact.contactCount)]
+        contact._normalMatrix = None
+        if contact.contactCount == 2:
+            # Both normal impulses of a two point contact are solved together, one after the other they would tilt resting bodies
+            rnA1, rnA2 = [pg.Vector2(-ra.y, ra.x).dot(normal) for ra in contact._raList]
+            rnB1, rnB2 = [pg.Vector2(-rb.y, rb.x).dot(normal) for rb in contact._rbList]
+            k11 = first.invMass + second.invMass + rnA1**2 * first.invInertia + rnB1**2 * second.invInertia
+            k22 = first.invMass + second.invMass + rnA2**2 * first.invInertia + rnB2**2 * second.invInertia
+            k12 = first.invMass + second.invMass + rnA1 * rnA2 * first.invInertia + rnB1 * rnB2 * second.invInertia
+            # Points too close to each other make the matrix nearly singular, they are solved one by one then
+            if k11**2 < 1000 * (k11 * k22 - k12**2):
+                contact._normalMatrix = (k11, k12, k22)
+        contact._targetVelocities = []
+        for i in range(contact.contactCount):
+            # Slow contacts don't bounce, otherwise resting bodies would keep bouncing off what they stand on
+            approachVelocity = CollisionsResolver.__relativeContactVelocity(contact, i).dot(normal)
+            contact._targetVelocities.append(-e * approachVelocity if approachVelocity < -restitutionThreshold else 0)
+
+        for i in range(contact.contactCount):
+            contact.normalImpulses[i] *= warmStartingFactor
+            contact.tangentImpulses[i] *= warmStartingFactor
+            CollisionsResolver.__applyContactImpulse(contact, i, contact.normalImpulses[i] * normal + contact.tangentImpulses[i] * tangent)
+
+    @staticmethod
+    def __solveNormalBlock(contact: CollisionManifold):
+        # Accumulated impulses of both points that meet their target velocities without pulling, found by trying
+        # both points pushing, only one of them pushing, and neither. Without a solution the impulses are kept
+        k11, k12, k22 = contact._normalMatrix
+        normal = contact.normal
+        a1, a2 = contact.normalImpulses
+        b1 = CollisionsResolver.__relativeContactVelocity(contact, 0).dot(normal) - contact._targetVelocities[0] - (k11 * a1 + k12 * a2)
+        b2 = CollisionsResolver.__relativeContactVelocity(contact, 1).dot(normal) - contact._targetVelocities[1] - (k12 * a1 + k22 * a2)
+
+        determinant = k11 * k22 - k12**2
+        x1, x2 = (k12 * b2 - k22 * b1) / determinant, (k12 * b1 - k11 * b2) / determinant
+        if x1 < 0 or x2 < 0:
+            x1, x2 = -b1 / k11, 0
+            if x1 < 0 or k12 * x1 + b2 < 0:
+                x1, x2 = 0, -b2 / k22
+                if x2 < 0 or k12 * x2 + b1 < 0:
+                    if b1 < 0 or b2 < 0:
+                        return
+                    x1, x2 = 0, 0
+
+        CollisionsResolver.__applyContactImpulse(contact, 0, (x1 - a1) * normal)
+        CollisionsResolver.__applyContactImpulse(contact, 1, (x2 - a2) * normal)
+        contact.normalImpulses[0], contact.normalImpulses[1] = x1, x2
+
+    @staticmethod
+    def SolveContactVelocity(contact: CollisionManifold, relaxation: float = 1):
+        first, second = contact._rigidbodyA, contact._rigidbodyB
+        normal = contact.normal
+        tangent = pg.Vector2(-normal.y, normal.x)
+        contactCount = contact.contactCount
+
+        staticFriction = (first.material.staticFriction + second.material.staticFriction) / 2
+        dynamicFriction = (first.material.dynamicFriction + second.material.dynamicFriction) / 2
+
+        if contact._normalMatrix:
+            CollisionsResolver.__solveNormalBlock(contact)
+        else:
+            for i in range(contactCount):
+                velocity = CollisionsResolver.__relativeContactVelocity(contact, i).dot(normal)
+                j = (contact._targetVelocities[i] - velocity) * contact._normalMasses[i] * relaxation
+
+                accumulated = max(contact.normalImpulses[i] + j, 0)
+                CollisionsResolver.__applyContactImpulse(contact, i, (accumulated - contact.normalImpulses[i]) * normal)
+                contact.normalImpulses[i] = accumulated
+
+        for i in range(contactCount):
+            jt = -CollisionsResolver.__relativeContactVelocity(contact, i).dot(tangent) * contact._tangentMasses[i] * relaxation
+
+            maxFriction = contact.normalImpulses[i] * staticFriction
+            accumulated = contact.tangentImpulses[i] + jt
+            if abs(accumulated) > maxFriction:
+                accumulated = math.copysign(contact.normalImpulses[i] * dynamicFriction, accumulated)
+
+            CollisionsResolver.__applyContactImpulse(contact, i, (accumulated - contact.tangentImpulses[i]) * tangent)
+            contact.tangentImpulses[i] = accumulated
+
+    @staticmethod
+    def SolveContactPosition(contact: CollisionManifold, slop: float = 0.5, correctionFactor: float = 0.4):
+        # The penetration is estimated from how far the bodies moved along the normal since the contact was detected
+        startA, startB = contact._startPositions
+        movement = (contact.bodyB.geometry.position - startB) - (contact.bodyA.geometry.position - startA)
+        depth = contact.depth - movement.dot(contact.normal)
+        if depth > slop:
+            CollisionsResolver.SeparateBodies(contact.bodyA, contact.bodyB, contact.normal * (depth - slop) * correctionFactor)
+        return depth
+
     @staticmethod
     def SeparateBodies(first: GameObject, second: GameObject, mtv: pg.Vector2):
         if first.GetComponent(Rigidbody).IsStatic():
@@ -2100,39 +3372,970 @@ class CollisionsResolver:
             second.geometry.Move(mtv / 2)
 
     @staticmethod
-    def BroadPhase(bodies: list[GameObject], dt: float, contactPairs: list[tuple[int, int]]):
-        for i in range(len(bodies)):
-            mainBody = bodies[i]
-            mainBody.Update()
-            mainBody.GetComponent(Rigidbody).Update(dt)
+    def SweepBody(body: GameObject, start: pg.Vector2, obstacles: list[GameObject], tolerance: float = 0.5):
+        # Moves a body back to where it first touches one of the obstacles on its way from "start" to its current position.
+        # Samples are taken half the body's size apart, so nothing thinner than a step is skipped, then the time of impact is bisected
+        geometry = body.geometry
+        end = geometry.position
+        motion = end - start
+        distance = motion.length()
+
+        if geometry.shapeType in [SHAPE_CIRCLE, SHAPE_CAPSULE]:
+            extent = geometry.radius
+        else:
+            aabb = geometry.GetAABB()
+            extent = min(aabb.width, aabb.height) / 2
+        if distance <= extent or extent <= 0:
+            return False
+        
+        def isColliding(fraction: float):
+            geometry.SetPosition(start + motion * fraction)
+            return any(collisions.IntersectGeometries(geometry, obstacle.geometry)[0] for obstacle in obstacles)
+
+        samples = math.ceil(distance / extent)
+        free = 0
+        hit = None
+        for i in range(1, samples + 1):
+            if isColliding(i / samples):
+                hit = i / samples
+                break
+            free = i / samples
+
+        if hit is None:
+            geometry.SetPosition(end)
+            return False
+        
+        # The body is left slightly overlapping, so the narrow phase still resolves its velocity
+        while (hit - free) * distance > tolerance:
+            middle = (free + hit) / 2
+            if isColliding(middle):
+                hit = middle
+            else:
+                free = middle
 
+        geometry.SetPosition(start + motion * hit)
+        return True
+
+    @staticmethod
+    def IntegrateBodies(bodies: list[GameObject], dt: float):
+        for body in bodies:
+            body.GetComponent(Rigidbody)._Integrate(dt)
+
+    @staticmethod
+    def FindContactPairs(bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        for i in range(len(bodies) - 1):
+            mainBody = bodies[i]
             mainAABB = mainBody.geometry.GetAABB()
             mainBodyComponent = mainBody.GetComponent(Rigidbody)
+            mainCategory, mainMask = mainBody.geometry.collisionCategory, mainBody.geometry.collisionMask
 
-            if i < len(bodies) - 1:
-                for j in range(i + 1, len(bodies)):
-                    otherBody = bodies[j]
-                    otherAABB = otherBody.geometry.GetAABB()
+            for j in range(i + 1, len(bodies)):
+                otherBody = bodies[j]
+                if not (mainCategory & otherBody.geometry.collisionMask and otherBody.geometry.collisionCategory & mainMask):
+                    continue
 
-                    if (mainBodyComponent.IsStatic() and otherBody.GetComponent(Rigidbody).IsStatic()) or not collisions.CollideAABB(mainAABB, otherAABB):
-                        continue
+                otherAABB = otherBody.geometry.GetAABB()
 
-                    contactPairs.append((i, j))
+                if (not mainBodyComponent.IsAwake() and not otherBody.GetComponent(Rigidbody).IsAwake()) or not collisions.CollideAABB(mainAABB, otherAABB):
+                    continue
+
+                contactPairs.append((i, j))
+
+    @staticmethod
+    def BroadPhase(bodies: list[GameObject], dt: float, contactPairs: list[tuple[int, int]]):
+        for body in bodies:
+            body.Update()
+        CollisionsResolver.IntegrateBodies(bodies, dt)
+        CollisionsResolver.FindContactPairs(bodies, contactPairs)
 
     @staticmethod   
-    def NarrowPhase(bodies: list[GameObject], contactPairs: list[tuple[int, int]], resolvingCollisionMethod: int = 2):
+    def IntersectPolygonPairs(bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        polygonPairs: list[tuple[int, int]] = []
+        for pair in contactPairs:
+            first = bodies[pair[0]]
+            second = bodies[pair[1]]
+
+            if not first.GetComponent(Rigidbody).IsAwake() and not second.GetComponent(Rigidbody).IsAwake():
+                continue
+            if first.geometry.shapeType not in [SHAPE_BOX, SHAPE_POLYGON] or second.geometry.shapeType not in [SHAPE_BOX, SHAPE_POLYGON]:
+                continue
+            if not collisions.ShouldCollide(first.geometry, second.geometry):
+                continue
+
+            polygonPairs.append(pair)
+
+        if not polygonPairs:
+            return {}
+        
+        results = collisions.IntersectPolygonsBatch([bodies[i].geometry.GetTransformedVertices() for i, _ in polygonPairs], 
+                                                    [bodies[i].geometry.position for i, _ in polygonPairs],
+                                                    [bodies[j].geometry.GetTransformedVertices() for _, j in polygonPairs],
+                                                    [bodies[j].geometry.position for _, j in polygonPairs])
+        return dict(zip(polygonPairs, results))
+
+    @staticmethod   
+    def NarrowPhase(bodies: list[GameObject], contactPairs: list[tuple[int, int]], resolvingCollisionMethod: int = 2, collidedPairs: list[tuple[int, int]] = None, batchPolygons: bool = False, contactCache: ContactCache = None, contacts: list[CollisionManifold] = None, contactTolerance: float = 0, slop: float = 0):
+        # When "contacts" is given the manifolds are collected for the caller's solver instead of being resolved.
+        # Contact points are found with the bodies just touching, then they are moved back into each other by up to "slop",
+        # so resting contacts are still found, and warm started, on the next step
+        batchedResults = CollisionsResolver.IntersectPolygonPairs(bodies, contactPairs) if batchPolygons else {}
+        # A batched result is only valid while neither body has been moved by an earlier pair
+        movedBodies: set[int] = set()
+
         for pair in contactPairs:
             mainBody = bodies[pair[0]]
             otherBody = bodies[pair[1]]
+            mainRigidbody = mainBody.GetComponent(Rigidbody)
+            otherRigidbody = otherBody.GetComponent(Rigidbody)
 
-            isCollided, normal, depth = collisions.IntersectGeometries(mainBody.geometry, otherBody.geometry)
+            if not mainRigidbody.IsAwake() and not otherRigidbody.IsAwake():
+                continue
+
+            if pair in batchedResults and pair[0] not in movedBodies and pair[1] not in movedBodies:
+                isCollided, normal, depth = batchedResults[pair]
+            else:
+                isCollided, normal, depth = collisions.IntersectGeometries(mainBody.geometry, otherBody.geometry)
                 
             if isCollided:
+                if batchedResults:
+                    movedBodies.add(pair[0])
+                    movedBodies.add(pair[1])
+                if mainRigidbody.IsSleeping():
+                    mainRigidbody.WakeUp()
+                if otherRigidbody.IsSleeping():
+                    otherRigidbody.WakeUp()
+                if collidedPairs is not None:
+                    collidedPairs.append(pair)
+
+                startPositions = (mainBody.geometry.position, otherBody.geometry.position)
                 CollisionsResolver.SeparateBodies(mainBody, otherBody, normal * depth)
-                CollisionsResolver.__ResolveCollisionsWithRotationAndFriction(CollisionManifold(mainBody, otherBody, normal, depth, collisions.FindContactPoints(mainBody.geometry, otherBody.geometry)))
+                if contacts is None:
+                    CollisionsResolver.__ResolveCollisionsWithRotationAndFriction(CollisionManifold(mainBody, otherBody, normal, depth, collisions.FindContactPoints(mainBody.geometry, otherBody.geometry)))
+                    continue
+
+                manifold = CollisionManifold(mainBody, otherBody, normal, depth, collisions.FindContactFeatures(mainBody.geometry, otherBody.geometry, contactTolerance))
+                CollisionsResolver.SeparateBodies(mainBody, otherBody, -normal * min(depth, slop))
+                manifold._startPositions = startPositions
+                if contactCache is not None:
+                    contactCache.Load(manifold)
+                if manifold.contactCount:
+                    contacts.append(manifold)
+
+    @staticmethod
+    def BuildIslands(bodies: list[GameObject], contactPairs: list[tuple[int, int]], joints: list = ()):
+        # Static bodies don't connect islands, so a whole level on one ground is not a single island
+        parents = list(range(len(bodies)))
+        dynamic = [not body.GetComponent(Rigidbody).IsStatic() for body in bodies]
+
+        def find(index: int):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        def union(a: int, b: int):
+            if dynamic[a] and dynamic[b]:
+                rootA, rootB = find(a), find(b)
+                if rootA != rootB:
+                    parents[max(rootA, rootB)] = min(rootA, rootB)
+
+        for i, j in contactPairs:
+            union(i, j)
+
+        if joints:
+            indices = {body: index for index, body in enumerate(bodies)}
+            for joint in joints:
+                a, b = indices.get(joint.objectA), indices.get(joint.objectB)
+                if a is not None and b is not None:
+                    union(a, b)
+
+        islands: dict[int, list[int]] = {}
+        for index in range(len(bodies)):
+            if dynamic[index]:
+                islands.setdefault(find(index), []).append(index)
+
+        return list(islands.values())
+
+
+class SpatialHash:
+    def __init__(self, cellSize: float):
+        self.__cellSize = max(cellSize, 1)
+        self.__inverseCellSize = 1 / self.__cellSize
+        self.__cells: dict[tuple[int, int], list] = {}
+        self.__ranges: dict[object, tuple[int, int, int, int]] = {}
+
+    @property
+    def cellSize(self):
+        return self.__cellSize
+
+    def __contains__(self, item):
+        return item in self.__ranges
+
+    def __len__(self):
+        return len(self.__ranges)
+
+    def __getRange(self, aabb: AABB):
+        return (math.floor(aabb.min.x * self.__inverseCellSize), math.floor(aabb.min.y * self.__inverseCellSize),
+                math.floor(aabb.max.x * self.__inverseCellSize), math.floor(aabb.max.y * self.__inverseCellSize))
+
+    def __addToCells(self, item, cellRange: tuple[int, int, int, int]):
+        for x in range(cellRange[0], cellRange[2] + 1):
+            for y in range(cellRange[1], cellRange[3] + 1):
+                cell = self.__cells.get((x, y))
+                if cell is None:
+                    self.__cells[(x, y)] = [item]
+                else:
+                    cell.append(item)
+
+    def __removeFromCells(self, item, cellRange: tuple[int, int, int, int]):
+        for x in range(cellRange[0], cellRange[2] + 1):
+            for y in range(cellRange[1], cellRange[3] + 1):
+                cell = self.__cells[(x, y)]
+                cell.remove(item)
+                if not cell:
+                    del self.__cells[(x, y)]
+
+    def Insert(self, item, aabb: AABB):
+        if item in self.__ranges:
+            ErrorHandler.ThrowExistenceError("SpatialHash", "Insert", "item")
+
+        cellRange = self.__getRange(aabb)
+        self.__ranges[item] = cellRange
+        self.__addToCells(item, cellRange)
+
+    def Update(self, item, aabb: AABB):
+        cellRange = self.__getRange(aabb)
+        oldRange = self.__ranges.get(item)
+
+        if oldRange == cellRange:
+            return False
+        
+        if oldRange is not None:
+            self.__removeFromCells(item, oldRange)
+        
+        self.__ranges[item] = cellRange
+        self.__addToCells(item, cellRange)
+        return True
+
+    def Remove(self, item):
+        if item in self.__ranges:
+            self.__removeFromCells(item, self.__ranges.pop(item))
+
+    def Clear(self):
+        self.__cells.clear()
+        self.__ranges.clear()
+
+    def Query(self, aabb: AABB):
+        cellRange = self.__getRange(aabb)
+        found = {}
+        for x in range(cellRange[0], cellRange[2] + 1):
+            for y in range(cellRange[1], cellRange[3] + 1):
+                cell = self.__cells.get((x, y))
+                if cell:
+                    for item in cell:
+                        found[item] = None
+
+        return list(found)
+
+    def GetCells(self):
+        return self.__cells.values()
+    
+    def GetCellItems(self):
+        return self.__cells.items()
+    
+    def GetCell(self, key: tuple[int, int]):
+        return self.__cells.get(key)
+
+
+class AABBTreeNode:
+    def __init__(self, item = None):
+        self.item = item
+        self.parent: AABBTreeNode = None
+        self.child1: AABBTreeNode = None
+        self.child2: AABBTreeNode = None
+        self.height = 0
+        self.minX = self.minY = self.maxX = self.maxY = 0.0
+
+    def IsLeaf(self):
+        return self.child1 is None
+
+    def SetUnion(self, first, second):
+        self.minX = first.minX if first.minX < second.minX else second.minX
+        self.minY = first.minY if first.minY < second.minY else second.minY
+        self.maxX = first.maxX if first.maxX > second.maxX else second.maxX
+        self.maxY = first.maxY if first.maxY > second.maxY else second.maxY
+
+    def Overlaps(self, minX: float, minY: float, maxX: float, maxY: float):
+        return not (self.maxX < minX or maxX < self.minX or self.maxY < minY or maxY < self.minY)
+
+# Dynamic bounding volume hierarchy. Leaves store "fat" AABBs, so small movements don't need a reinsert
+class AABBTree:
+    def __init__(self, margin: float = 4):
+        self.margin = margin
+        self.__root: AABBTreeNode = None
+        self.__leaves: dict[object, AABBTreeNode] = {}
+
+    def __contains__(self, item):
+        return item in self.__leaves
+    
+    def __len__(self):
+        return len(self.__leaves)
+
+    def GetHeight(self):
+        return self.__root.height if self.__root else 0
+    
+    def GetFatAABB(self, item):
+        leaf = self.__leaves[item]
+        return AABB(pg.Vector2(leaf.minX, leaf.minY), pg.Vector2(leaf.maxX, leaf.maxY))
+
+    def Insert(self, item, aabb: AABB):
+        if item in self.__leaves:
+            ErrorHandler.ThrowExistenceError("AABBTree", "Insert", "item")
+
+        leaf = AABBTreeNode(item)
+        self.__setFatAABB(leaf, aabb)
+        self.__leaves[item] = leaf
+        self.__insertLeaf(leaf)
+
+    def Update(self, item, aabb: AABB):
+        leaf = self.__leaves.get(item)
+        if leaf is None:
+            self.Insert(item, aabb)
+            return True
+
+        if (leaf.minX <= aabb.min.x and leaf.minY <= aabb.min.y and
+            leaf.maxX >= aabb.max.x and leaf.maxY >= aabb.max.y):
+            return False
+
+        self.__removeLeaf(leaf)
+        self.__setFatAABB(leaf, aabb)
+        self.__insertLeaf(leaf)
+        return True
+
+    def Remove(self, item):
+        leaf = self.__leaves.pop(item, None)
+        if leaf is not None:
+            self.__removeLeaf(leaf)
+
+    def Clear(self):
+        self.__root = None
+        self.__leaves.clear()
+
+    def Query(self, aabb: AABB):
+        found = []
+        if self.__root is None:
+            return found
+        
+        minX, minY, maxX, maxY = aabb.min.x, aabb.min.y, aabb.max.x, aabb.max.y
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if not node.Overlaps(minX, minY, maxX, maxY):
+                continue
+
+            if node.child1 is None:
+                found.append(node.item)
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+
+        return found
+
+    def QueryPoint(self, point: pg.typing.Point):
+        return self.Query(AABB(pg.Vector2(point), pg.Vector2(point)))
+
+    def RayCast(self, start: pg.Vector2, end: pg.Vector2, callback, maxFraction: float = 1):
+        # callback(item, maxFraction) returns new max fraction: 0 stops the cast, values below current clip the ray
+        if self.__root is None:
+            return maxFraction
+        
+        start = pg.Vector2(start)
+        direction = pg.Vector2(end) - start
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if collisions.IntersectRayAABB(start, direction, (node.minX, node.minY), (node.maxX, node.maxY), maxFraction) is None:
+                continue
+
+            if node.child1 is None:
+                value = callback(node.item, maxFraction)
+                if value == 0:
+                    return 0
+                if 0 < value < maxFraction:
+                    maxFraction = value
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+
+        return maxFraction
+
+    def __setFatAABB(self, leaf: AABBTreeNode, aabb: AABB):
+        leaf.minX = aabb.min.x - self.margin
+        leaf.minY = aabb.min.y - self.margin
+        leaf.maxX = aabb.max.x + self.margin
+        leaf.maxY = aabb.max.y + self.margin
+
+    @staticmethod
+    def __perimeter(minX: float, minY: float, maxX: float, maxY: float):
+        return 2 * ((maxX - minX) + (maxY - minY))
+    
+    @staticmethod
+    def __unionPerimeter(first: AABBTreeNode, second: AABBTreeNode):
+        return 2 * ((max(first.maxX, second.maxX) - min(first.minX, second.minX)) +
+                    (max(first.maxY, second.maxY) - min(first.minY, second.minY)))
+
+    def __insertLeaf(self, leaf: AABBTreeNode):
+        if self.__root is None:
+            self.__root = leaf
+            leaf.parent = None
+            return
+        
+        # Finding the best sibling with the surface area heuristic
+        node = self.__root
+        while node.child1 is not None:
+            area = AABBTree.__perimeter(node.minX, node.minY, node.maxX, node.maxY)
+            combinedArea = AABBTree.__unionPerimeter(node, leaf)
+
+            cost = 2 * combinedArea
+            inheritanceCost = 2 * (combinedArea - area)
+
+            costs = []
+            for child in (node.child1, node.child2):
+                childCost = AABBTree.__unionPerimeter(child, leaf) + inheritanceCost
+                if child.child1 is not None:
+                    childCost -= AABBTree.__perimeter(child.minX, child.minY, child.maxX, child.maxY)
+                costs.append(childCost)
+
+            if cost < costs[0] and cost < costs[1]:
+                break
+
+            node = node.child1 if costs[0] < costs[1] else node.child2
+
+        sibling = node
+        oldParent = sibling.parent
+        newParent = AABBTreeNode()
+        newParent.parent = oldParent
+        newParent.SetUnion(leaf, sibling)
+        newParent.height = sibling.height + 1
+
+        if oldParent is not None:
+            if oldParent.child1 is sibling:
+                oldParent.child1 = newParent
+            else:
+                oldParent.child2 = newParent
+        else:
+            self.__root = newParent
+
+        newParent.child1 = sibling
+        newParent.child2 = leaf
+        sibling.parent = newParent
+        leaf.parent = newParent
+
+        self.__refit(leaf.parent)
+
+    def __removeLeaf(self, leaf: AABBTreeNode):
+        if leaf is self.__root:
+            self.__root = None
+            return
+        
+        parent = leaf.parent
+        grandParent = parent.parent
+        sibling = parent.child2 if parent.child1 is leaf else parent.child1
+
+        if grandParent is not None:
+            if grandParent.child1 is parent:
+                grandParent.child1 = sibling
+            else:
+                grandParent.child2 = sibling
+            sibling.parent = grandParent
+            self.__refit(grandParent)
+        else:
+            self.__root = sibling
+            sibling.parent = None
+
+        leaf.parent = None
+
+    def __refit(self, node: AABBTreeNode):
+        while node is not None:
+            node = self.__balance(node)
+            node.height = 1 + max(node.child1.height, node.child2.height)
+            node.SetUnion(node.child1, node.child2)
+            node = node.parent
+
+    def __rotate(self, a: AABBTreeNode, up: AABBTreeNode, other: AABBTreeNode, upIsSecond: bool):
+        # Moves "up" (a child of "a") to the place of "a", "other" is the second child of "a"
+        f, g = up.child1, up.child2
+
+        up.child1 = a
+        up.parent = a.parent
+        a.parent = up
+
+        if up.parent is not None:
+            if up.parent.child1 is a:
+                up.parent.child1 = up
+            else:
+                up.parent.child2 = up
+        else:
+            self.__root = up
+
+        kept, moved = (f, g) if f.height > g.height else (g, f)
+        up.child2 = kept
+        if upIsSecond:
+            a.child2 = moved
+        else:
+            a.child1 = moved
+        moved.parent = a
+
+        a.SetUnion(other, moved)
+        up.SetUnion(a, kept)
+        a.height = 1 + max(other.height, moved.height)
+        up.height = 1 + max(a.height, kept.height)
+
+    def __balance(self, a: AABBTreeNode):
+        if a.child1 is None or a.height < 2:
+            return a
+        
+        b, c = a.child1, a.child2
+        balance = c.height - b.height
+
+        if balance > 1:
+            self.__rotate(a, c, b, True)
+            return c
+        
+        if balance < -1:
+            self.__rotate(a, b, c, False)
+            return b
+        
+        return a
+
+
+class RaycastHit:
+    def __init__(self, gameObject: GameObject, point: pg.Vector2, normal: pg.Vector2, fraction: float):
+        self.gameObject = gameObject
+        self.point = point
+        self.normal = normal
+        self.fraction = fraction
+
+    def __str__(self):
+        return f"RaycastHit({self.gameObject}, point: {self.point}, fraction: {round(self.fraction, 5)})"
+    
+    def __repr__(self):
+        return str(self)
+
+
+class BroadPhaseBackend:
+    def __init__(self):
+        self._staticTransforms: dict[GameObject, tuple[float, float, float]] = {}
+
+    def _IsInactiveBodyUnchanged(self, body: GameObject):
+        position = body.geometry.position
+        transform = (position.x, position.y, body.geometry.angleRadians)
+        if self._staticTransforms.get(body) == transform:
+            return True
+        
+        self._staticTransforms[body] = transform
+        return False
+    
+    @staticmethod
+    def _CanGroupsCollide(categoryA: int, categoryB: int, groupMasks: dict[int, int]):
+        # groupMasks holds the union of masks of all bodies in a category, so a whole group can be skipped at once
+        return categoryA & groupMasks.get(categoryB, 0) != 0 and categoryB & groupMasks.get(categoryA, 0) != 0
+
+    def AddBody(self, body: GameObject):
+        pass
+
+    def RemoveBody(self, body: GameObject):
+        pass
+
+    def Clear(self):
+        pass
+
+    def FindPairs(self, bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        pass
+
+    def Synchronize(self, bodies: list[GameObject]):
+        pass
+
+    def QueryAABB(self, bodies: list[GameObject], aabb: AABB):
+        return [body for body in bodies if collisions.CollideAABB(body.geometry.GetAABB(), aabb)]
+
+    def RayCast(self, bodies: list[GameObject], start: pg.Vector2, end: pg.Vector2, callback):
+        direction = pg.Vector2(end) - start
+        maxFraction = 1
+        for body in bodies:
+            aabb = body.geometry.GetAABB()
+            if collisions.IntersectRayAABB(start, direction, aabb.min, aabb.max, maxFraction) is None:
+                continue
+
+            value = callback(body, maxFraction)
+            if value == 0:
+                return
+            if 0 < value < maxFraction:
+                maxFraction = value
+
+class BruteForceBroadPhase(BroadPhaseBackend):
+    def FindPairs(self, bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        CollisionsResolver.FindContactPairs(bodies, contactPairs)
+
+class SpatialHashBroadPhase(BroadPhaseBackend):
+    def __init__(self, cellSize: float = None):
+        super().__init__()
+        self.__autoCellSize = cellSize is None
+        self.__cellSize = max(cellSize if cellSize else 64, 1)
+        self.__grids: dict[int, SpatialHash] = {}
+        self.__categories: dict[GameObject, int] = {}
+        self.__cellSizeDerivedFor = 0
+
+    @property
+    def cellSize(self):
+        return self.__cellSize
+
+    def SetCellSize(self, value: float = None):
+        self.__autoCellSize = value is None
+        self.__cellSizeDerivedFor = 0
+        if value:
+            self.__cellSize = max(value, 1)
+        self.Clear()
+
+    def RemoveBody(self, body: GameObject):
+        category = self.__categories.pop(body, None)
+        if category is not None:
+            self.__grids[category].Remove(body)
+        self._staticTransforms.pop(body, None)
+
+    def Clear(self):
+        self.__grids.clear()
+        self.__categories.clear()
+        self._staticTransforms.clear()
+
+    def __deriveCellSize(self, bodies: list[GameObject]):
+        sizes = sorted(max(body.geometry.GetAABB().size) for body in bodies if not body.GetComponent(Rigidbody).IsStatic())
+        if not sizes:
+            return
+
+        self.__cellSize = max(sizes[len(sizes) // 2] * 2, 1)
+        self.Clear()
+        self.__cellSizeDerivedFor = len(bodies)
+
+    def __updateBody(self, body: GameObject, category: int, isInactive: bool):
+        # Every category gets its own grid, so groups that never collide are never paired cell by cell
+        if self.__categories.get(body) != category:
+            self.RemoveBody(body)
+            self.__categories[body] = category
+            if category not in self.__grids:
+                self.__grids[category] = SpatialHash(self.__cellSize)
+        
+        grid = self.__grids[category]
+        if isInactive and self._IsInactiveBodyUnchanged(body) and body in grid:
+            return
+
+        grid.Update(body, body.geometry.GetAABB())
+
+    def FindPairs(self, bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        if self.__autoCellSize and len(bodies) >= self.__cellSizeDerivedFor * 2:
+            self.__deriveCellSize(bodies)
+
+        indices: dict[GameObject, int] = {}
+        inactive: list[bool] = []
+        masks: list[int] = []
+        categories: list[int] = []
+        groupMasks: dict[int, int] = {}
+
+        for index, body in enumerate(bodies):
+            indices[body] = index
+            isInactive = not body.GetComponent(Rigidbody).IsAwake()
+            inactive.append(isInactive)
+
+            category, mask = body.geometry.collisionCategory, body.geometry.collisionMask
+            categories.append(category)
+            masks.append(mask)
+            groupMasks[category] = groupMasks.get(category, 0) | mask
+
+            self.__updateBody(body, category, isInactive)
+
+        pairs: set[tuple[int, int]] = set()
+
+        def addPairs(cell: list, otherCell: list = None):
+            for a in range(len(cell) if otherCell else len(cell) - 1):
+                i = indices.get(cell[a])
+                if i is None:
+                    continue
+
+                for other in (otherCell if otherCell else cell[a + 1:]):
+                    j = indices.get(other)
+                    if j is None or (inactive[i] and inactive[j]) or not (categories[i] & masks[j] and categories[j] & masks[i]):
+                        continue
+
+                    pairs.add((i, j) if i < j else (j, i))
+
+        gridCategories = sorted(self.__grids)
+        for a, categoryA in enumerate(gridCategories):
+            for categoryB in gridCategories[a:]:
+                if not self._CanGroupsCollide(categoryA, categoryB, groupMasks):
+                    continue
+
+                if categoryA == categoryB:
+                    for cell in self.__grids[categoryA].GetCells():
+                        if len(cell) > 1:
+                            addPairs(cell)
+                    continue
+
+                gridB = self.__grids[categoryB]
+                for key, cell in self.__grids[categoryA].GetCellItems():
+                    otherCell = gridB.GetCell(key)
+                    if otherCell:
+                        addPairs(cell, otherCell)
+
+        for i, j in sorted(pairs):
+            if collisions.CollideAABB(bodies[i].geometry.GetAABB(), bodies[j].geometry.GetAABB()):
+                contactPairs.append((i, j))
+
+    def Synchronize(self, bodies: list[GameObject]):
+        if self.__autoCellSize and len(bodies) >= self.__cellSizeDerivedFor * 2:
+            self.__deriveCellSize(bodies)
+
+        for body in bodies:
+            self.__updateBody(body, body.geometry.collisionCategory, not body.GetComponent(Rigidbody).IsAwake())
+
+    def QueryAABB(self, bodies: list[GameObject], aabb: AABB):
+        return [body for grid in self.__grids.values() for body in grid.Query(aabb) if collisions.CollideAABB(body.geometry.GetAABB(), aabb)]
+
+
+class SweepAndPruneBroadPhase(BroadPhaseBackend):
+    def __init__(self, axisCheckInterval: int = 60):
+        super().__init__()
+        self.__endpoints: list[list] = [] # [value, isMin, body], min endpoints sort after max ones at equal values
+        self.__proxies: dict[GameObject, tuple[list, list]] = {}
+        self.__axis = 0
+        self.__axisCheckInterval = axisCheckInterval
+        self.__stepsToAxisCheck = 0
+        self.__fullSortRequired = False
+
+    def AddBody(self, body: GameObject):
+        if body in self.__proxies:
+            return
+
+        minEndpoint = [0.0, 1, body]
+        maxEndpoint = [0.0, 0, body]
+        self.__proxies[body] = (minEndpoint, maxEndpoint)
+        self.__endpoints.append(minEndpoint)
+        self.__endpoints.append(maxEndpoint)
+        self._staticTransforms.pop(body, None)
+        self.__fullSortRequired = True
+
+    def RemoveBody(self, body: GameObject):
+        if body not in self.__proxies:
+            return
+        
+        self.__proxies.pop(body)
+        self.__endpoints = [endpoint for endpoint in self.__endpoints if endpoint[2] is not body]
+        self._staticTransforms.pop(body, None)
+
+    def Clear(self):
+        self.__endpoints.clear()
+        self.__proxies.clear()
+        self._staticTransforms.clear()
+
+    def __chooseAxis(self, bodies: list[GameObject]):
+        if len(bodies) < 2:
+            return
+        
+        sums, squares = [0.0, 0.0], [0.0, 0.0]
+        for body in bodies:
+            aabb = body.geometry.GetAABB()
+            for axis in (0, 1):
+                center = (aabb.min[axis] + aabb.max[axis]) / 2
+                sums[axis] += center
+                squares[axis] += center * center
+
+        count = len(bodies)
+        variances = [squares[axis] / count - (sums[axis] / count) ** 2 for axis in (0, 1)]
+        other = 1 - self.__axis
+        
+        # Hysteresis, so the axis doesn't flip between two nearly equal spreads
+        if variances[other] > variances[self.__axis] * 2:
+            self.__axis = other
+            self._staticTransforms.clear()
+            self.__fullSortRequired = True
+
+    def __sortEndpoints(self):
+        endpoints = self.__endpoints
+        if self.__fullSortRequired:
+            endpoints.sort(key=lambda endpoint: (endpoint[0], endpoint[1]))
+            self.__fullSortRequired = False
+            return
+        
+        # Bodies barely move between sub-steps, so insertion sort is close to linear here
+        for i in range(1, len(endpoints)):
+            endpoint = endpoints[i]
+            value, isMin = endpoint[0], endpoint[1]
+            j = i - 1
+            # Max endpoints go first on equal values, touching AABBs don't collide
+            while j >= 0 and (endpoints[j][0] > value or (endpoints[j][0] == value and endpoints[j][1] > isMin)):
+                endpoints[j + 1] = endpoints[j]
+                j -= 1
+            endpoints[j + 1] = endpoint
+
+    def FindPairs(self, bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        self.__stepsToAxisCheck -= 1
+        if self.__stepsToAxisCheck <= 0:
+            self.__chooseAxis(bodies)
+            self.__stepsToAxisCheck = self.__axisCheckInterval
+
+        axis = self.__axis
+        indices: dict[GameObject, int] = {}
+        inactive: list[bool] = []
+        masks: list[int] = []
+        categories: list[int] = []
+        groupMasks: dict[int, int] = {}
+
+        for index, body in enumerate(bodies):
+            indices[body] = index
+            isInactive = not body.GetComponent(Rigidbody).IsAwake()
+            inactive.append(isInactive)
+
+            category, mask = body.geometry.collisionCategory, body.geometry.collisionMask
+            categories.append(category)
+            masks.append(mask)
+            groupMasks[category] = groupMasks.get(category, 0) | mask
+
+            if body not in self.__proxies:
+                self.AddBody(body)
+            elif isInactive and self._IsInactiveBodyUnchanged(body):
+                continue
+
+            aabb = body.geometry.GetAABB()
+            minEndpoint, maxEndpoint = self.__proxies[body]
+            minEndpoint[0] = aabb.min[axis]
+            maxEndpoint[0] = aabb.max[axis]
+
+        self.__sortEndpoints()
+
+        pairs: list[tuple[int, int]] = []
+        # Open intervals are kept per category, so a body only scans the groups it can collide with
+        active: dict[int, dict[int, None]] = {}
+        for _, isMin, body in self.__endpoints:
+            i = indices.get(body)
+            if i is None:
+                continue
+
+            category = categories[i]
+            if not isMin:
+                active[category].pop(i, None)
+                continue
+
+            aabb = body.geometry.GetAABB()
+            for otherCategory, group in active.items():
+                if not self._CanGroupsCollide(category, otherCategory, groupMasks):
+                    continue
+
+                for j in group:
+                    if (inactive[i] and inactive[j]) or not (category & masks[j] and categories[j] & masks[i]):
+                        continue
+
+                    if collisions.CollideAABB(aabb, bodies[j].geometry.GetAABB()):
+                        pairs.append((i, j) if i < j else (j, i))
+
+            group = active.get(category)
+            if group is None:
+                active[category] = {i: None}
+            else:
+                group[i] = None
+
+        pairs.sort()
+        contactPairs.extend(pairs)
+
+
+class AABBTreeBroadPhase(BroadPhaseBackend):
+    def __init__(self, margin: float = 4):
+        super().__init__()
+        self.__margin = margin
+        self.__trees: dict[int, AABBTree] = {}
+        self.__categories: dict[GameObject, int] = {}
+
+    @property
+    def trees(self):
+        return dict(self.__trees)
+
+    def RemoveBody(self, body: GameObject):
+        category = self.__categories.pop(body, None)
+        if category is not None:
+            self.__trees[category].Remove(body)
+        self._staticTransforms.pop(body, None)
+
+    def Clear(self):
+        self.__trees.clear()
+        self.__categories.clear()
+        self._staticTransforms.clear()
+
+    def Synchronize(self, bodies: list[GameObject]):
+        # Every category gets its own tree, so queries skip the groups a body can't collide with
+        for body in bodies:
+            category = body.geometry.collisionCategory
+            if self.__categories.get(body) != category:
+                self.RemoveBody(body)
+                self.__categories[body] = category
+                if category not in self.__trees:
+                    self.__trees[category] = AABBTree(self.__margin)
+
+            tree = self.__trees[category]
+            if not body.GetComponent(Rigidbody).IsAwake() and self._IsInactiveBodyUnchanged(body) and body in tree:
+                continue
+
+            tree.Update(body, body.geometry.GetAABB())
+
+    def FindPairs(self, bodies: list[GameObject], contactPairs: list[tuple[int, int]]):
+        self.Synchronize(bodies)
+
+        indices: dict[GameObject, int] = {}
+        inactive: list[bool] = []
+        groupMasks: dict[int, int] = {}
+        for index, body in enumerate(bodies):
+            indices[body] = index
+            inactive.append(not body.GetComponent(Rigidbody).IsAwake())
+            category = body.geometry.collisionCategory
+            groupMasks[category] = groupMasks.get(category, 0) | body.geometry.collisionMask
+
+        pairs: set[tuple[int, int]] = set()
+        for i, body in enumerate(bodies):
+            if inactive[i]:
+                continue
+
+            aabb = body.geometry.GetAABB()
+            category, mask = body.geometry.collisionCategory, body.geometry.collisionMask
+            for otherCategory, tree in self.__trees.items():
+                if not self._CanGroupsCollide(category, otherCategory, groupMasks):
+                    continue
+
+                for other in tree.Query(aabb):
+                    j = indices.get(other)
+                    if j is None or j == i or not (category & other.geometry.collisionMask and otherCategory & mask):
+                        continue
+
+                    pair = (i, j) if i < j else (j, i)
+                    if pair not in pairs and collisions.CollideAABB(aabb, other.geometry.GetAABB()):
+                        pairs.add(pair)
+
+        contactPairs.extend(sorted(pairs))
+
+    def QueryAABB(self, bodies: list[GameObject], aabb: AABB):
+        return [body for tree in self.__trees.values() for body in tree.Query(aabb) if collisions.CollideAABB(body.geometry.GetAABB(), aabb)]
+
+    def RayCast(self, bodies: list[GameObject], start: pg.Vector2, end: pg.Vector2, callback):
+        maxFraction = 1
+        for tree in self.__trees.values():
+            maxFraction = tree.RayCast(start, end, callback, maxFraction)
+            if maxFraction == 0:
+                return
+
+
+broadPhaseBackends = {"bruteforce": BruteForceBroadPhase, "grid": SpatialHashBroadPhase, "sap": SweepAndPruneBroadPhase, "tree": AABBTreeBroadPhase}
 
 
 class Joint:
+    # Constraint joints are solved by the iterative solver instead of applying forces in "Update"
+    isConstraint = False
+
     def __init__(self, bodyA: GameObject, bodyB: GameObject, anchorAIndex: int, anchorBIndex: int):
         self.objectA = bodyA
         self.objectB = bodyB
@@ -2145,6 +4348,12 @@ class Joint:
     def Update(self, dt: float): 
         pass
 
+    def SolveVelocity(self, dt: float):
+        pass
+
+    def SolvePosition(self):
+        return 0
+
 class ForceJoint(Joint):
     def __init__(self, bodyA: GameObject, bodyB: GameObject, anchorAIndex: int, anchorBIndex: int, strength: float):
         super().__init__(bodyA, bodyB, anchorAIndex, anchorBIndex)
@@ -2246,10 +4455,12 @@ class SpringJoint(Joint):
 	
 
 class HingeJoint(Joint):
+    isConstraint = True
+
     def __init__(self, bodyA: GameObject, bodyB: GameObject, anchorAIndex: int, anchorBIndex: int, length: float = -1, strength: float = 1):
         super().__init__(bodyA, bodyB, anchorAIndex, anchorBIndex)
 
-        self.objectA.geometry.cannotCollideWith.append(self.objectB.geometry)
+        self.objectA.geometry.cannotCollideWith.add(self.objectB.geometry)
 
         anchorA = self.objectA.geometry.GetAnchor(self.anchorAIndex)
         anchorB = self.objectB.geometry.GetAnchor(self.anchorBIndex)
@@ -2283,6 +4494,51 @@ class HingeJoint(Joint):
         if not self.bodyB.IsStatic():
             self.bodyB.ApplyForceAtAnchor(normal * (self.initialLength - distance) * self.strength, self.anchorBIndex)
 
+    def SolveVelocity(self, dt: float):
+        anchorA = self.objectA.geometry.GetAnchor(self.anchorAIndex)
+        anchorB = self.objectB.geometry.GetAnchor(self.anchorBIndex)
+
+        direction = anchorB - anchorA
+        distance = direction.length()
+        if distance < 0.001:
+            return
+        
+        normal = direction / distance
+        ra = anchorA - self.objectA.geometry.position
+        rb = anchorB - self.objectB.geometry.position
+        raPerp = pg.Vector2(-ra.y, ra.x)
+        rbPerp = pg.Vector2(-rb.y, rb.x)
+
+        relativeVelocity = ((self.bodyB.linearVelocity + rbPerp * self.bodyB.angularVelocity) - 
+                            (self.bodyA.linearVelocity + raPerp * self.bodyA.angularVelocity))
+
+        denom = (self.bodyA.invMass + self.bodyB.invMass + 
+                 raPerp.dot(normal)**2 * self.bodyA.invInertia + 
+                 rbPerp.dot(normal)**2 * self.bodyB.invInertia)
+        if denom == 0:
+            return
+
+        # The distance between the anchors is kept, so their relative velocity along it is removed
+        impulse = normal * (-relativeVelocity.dot(normal) / denom)
+
+        self.bodyA.linearVelocity += -impulse * self.bodyA.invMass
+        self.bodyA.angularVelocity += -ra.cross(impulse) * self.bodyA.invInertia
+
+        self.bodyB.linearVelocity += impulse * self.bodyB.invMass
+        self.bodyB.angularVelocity += rb.cross(impulse) * self.bodyB.invInertia
+
+    def SolvePosition(self):
+        anchorA = self.objectA.geometry.GetAnchor(self.anchorAIndex)
+        anchorB = self.objectB.geometry.GetAnchor(self.anchorBIndex)
+
+        direction = anchorB - anchorA
+        distance = direction.length()
+        if distance < 0.001:
+            return 0
+        
+        CollisionsResolver.SeparateBodies(self.objectA, self.objectB, direction / distance * (self.initialLength - distance) * 0.5)
+        return abs(self.initialLength - distance)
+
 
 # class FixedJointWIP(HingeJoint):
 #     def __init__(self, bodyA: Rigidbody, bodyB: Rigidbody, anchorAIndex: int, anchorBIndex: int, strength: float = 5, angularStrength: float = 5):
@@ -2392,9 +4648,7 @@ class Assets:
         if group is None:
             group = self.__imageGroups["All"]
             
-        for image in group.objects:
-            if image.name == name:
-                return image
+        return group.objects.get(name)
             
     def RemoveImage(self, name: str):
         image = self.GetImage(name)
@@ -2423,9 +4677,14 @@ class Camera:
         self.renderSurface = renderSurface
         self._size = pg.Vector2(size)
         self.__surface = pg.Surface(size, pg.SRCALPHA)
+        self.__zoomedSurface: pg.Surface = None
         self._lookAt = None
         self._lookAtSmoothness = 1
 
+        # Rotozoom always smooths, so zoom without rotation is smoothed too unless this is disabled
+        self.smoothZoom = True
+        self.__directRendering = False
+
         self.updateRequired = False
 
     def TransformPointToWorld(self, point: pg.Vector2 | tuple[int, int]):
@@ -2510,30 +4769,182 @@ class Camera:
 
         return pg.Vector2(width, height)
 
+    def EnableDirectRendering(self):
+        # Layers that support zoom draw straight on the screen with pre-scaled images instead of 
+        # being drawn on the camera surface and scaled with it. Rotated cameras still use the camera surface
+        self.__directRendering = True
+
+    def DisableDirectRendering(self):
+        self.__directRendering = False
+
+    def IsDirectRenderingEnabled(self):
+        return self.__directRendering
+
     def GetTransformedSurface(self):
         if self.updateRequired:
             rotatedSize = self.__getRotatedSurfaceSize()
             zoomedSize = rotatedSize / self.__zoom
-            self.__surface = pg.Surface(zoomedSize, pg.SRCALPHA)
+            if self.__surface.size != (int(zoomedSize.x), int(zoomedSize.y)):
+                self.__surface = pg.Surface(zoomedSize, pg.SRCALPHA)
             self.updateRequired = False
 
-        return self.__surface
-    
-    def _getOffset(self):
-        # surface = self.GetTransformedSurface()
-        return pg.Vector2()#(pg.Vector2(self.renderSurface.size) / 2 - pg.Vector2(surface.size) / 2) if self.renderSurface.size != surface.size else pg.Vector2(0, 0)
+        return self.__surface
+    
+    def _getOffset(self):
+        # surface = self.GetTransformedSurface()
+        return pg.Vector2()#(pg.Vector2(self.renderSurface.size) / 2 - pg.Vector2(surface.size) / 2) if self.renderSurface.size != surface.size else pg.Vector2(0, 0)
+
+    def Update(self):
+        surface = self.GetTransformedSurface()
+        
+        if self.__rotation:
+            surface = pg.transform.rotozoom(surface, self.__rotation, self.__zoom)
+        elif self.__zoom != 1:
+            # Zoom alone is a scale into a surface that is kept while the size stays the same
+            size = (round(surface.width * self.__zoom), round(surface.height * self.__zoom))
+            if self.__zoomedSurface is None or self.__zoomedSurface.size != size:
+                self.__zoomedSurface = pg.Surface(size, pg.SRCALPHA)
+
+            if self.smoothZoom:
+                surface = pg.transform.smoothscale(surface, size, self.__zoomedSurface)
+            else:
+                surface = pg.transform.scale(surface, size, self.__zoomedSurface)
+
+        self.renderSurface.blit(surface, ((self.renderSurface.width - surface.width) / 2, (self.renderSurface.height - surface.height) / 2))
+
+
+class StaticChunks:
+    # The world is split into square chunks and every chunk is drawn once from the surfaces that overlap it.
+    # Chunks are drawn again only after one of their surfaces is changed, moved or removed
+    def __init__(self, chunkSize: int = 512):
+        if chunkSize <= 0:
+            ErrorHandler.Throw("ValueError", "StaticChunks", None, "chunkSize", "Chunk size has to be positive")
+
+        self.__chunkSize = int(chunkSize)
+        self.__surfaces: dict[tuple[int, int], pg.Surface] = {}
+        self.__scaledSurfaces: dict[tuple[int, int], tuple[tuple[int, int], pg.Surface]] = {}
+        self.__chunkItems: dict[tuple[int, int], dict[object, None]] = {}
+        self.__records: dict[object, tuple[pg.Surface, tuple[float, float], list[tuple[int, int]]]] = {}
+        self.__order: dict[object, int] = {}
+        self.__nextOrder = 0
+        self.__dirtyChunks: set[tuple[int, int]] = set()
+        self.bakesCount = 0
+
+    @property
+    def chunkSize(self):
+        return self.__chunkSize
+    
+    @property
+    def items(self):
+        return self.__records.keys()
+
+    def __getKeys(self, surface: pg.Surface, position: tuple[float, float]):
+        size = self.__chunkSize
+        return [(x, y) for x in range(math.floor(position[0] / size), math.floor((position[0] + surface.width) / size) + 1)
+                       for y in range(math.floor(position[1] / size), math.floor((position[1] + surface.height) / size) + 1)]
+
+    def __removeFromChunks(self, item, keys: list[tuple[int, int]]):
+        for key in keys:
+            items = self.__chunkItems[key]
+            del items[item]
+            if not items:
+                del self.__chunkItems[key]
+            self.__dirtyChunks.add(key)
+
+    def Update(self, item, surface: pg.Surface, position: tuple[float, float]):
+        # "position" is the world position of the surface's top left corner
+        record = self.__records.get(item)
+        if record is not None:
+            if record[0] is surface and record[1] == position:
+                return
+            self.__removeFromChunks(item, record[2])
+
+        keys = self.__getKeys(surface, position)
+        self.__records[item] = (surface, position, keys)
+        if item not in self.__order:
+            self.__order[item] = self.__nextOrder
+            self.__nextOrder += 1
+
+        for key in keys:
+            self.__chunkItems.setdefault(key, {})[item] = None
+            self.__dirtyChunks.add(key)
+
+    def Remove(self, item):
+        record = self.__records.pop(item, None)
+        if record is not None:
+            self.__removeFromChunks(item, record[2])
+            del self.__order[item]
+
+    def Clear(self):
+        self.__surfaces.clear()
+        self.__scaledSurfaces.clear()
+        self.__chunkItems.clear()
+        self.__records.clear()
+        self.__order.clear()
+        self.__dirtyChunks.clear()
+
+    def __bake(self, key: tuple[int, int]):
+        self.__dirtyChunks.discard(key)
+        self.__scaledSurfaces.pop(key, None)
+        items = self.__chunkItems.get(key)
+        if not items:
+            self.__surfaces.pop(key, None)
+            return
+        
+        # A new surface every time, so a changed chunk is also noticed by dirty rendering.
+        # Positions are floored, blits would truncate the ones of surfaces sticking out of the chunk's top left
+        size = self.__chunkSize
+        chunk = pg.Surface((size, size), pg.SRCALPHA)
+        left, top = key[0] * size, key[1] * size
+        records = self.__records
+        chunk.fblits([(records[item][0], (math.floor(records[item][1][0] - left), math.floor(records[item][1][1] - top))) 
+                      for item in sorted(items, key=self.__order.__getitem__)])
+        self.__surfaces[key] = chunk
+        self.bakesCount += 1
+
+    def GetBlits(self, surface: pg.Surface, cameraPosition: pg.Vector2, zoom: float = 1):
+        # Only the chunks in view are drawn, changed chunks out of view wait until they are seen
+        size = self.__chunkSize
+        halfWidth, halfHeight = surface.width / 2, surface.height / 2
+        left, right = cameraPosition[0] - halfWidth / zoom, cameraPosition[0] + halfWidth / zoom
+        top, bottom = cameraPosition[1] - halfHeight / zoom, cameraPosition[1] + halfHeight / zoom
+
+        blits = []
+        for x in range(math.floor(left / size), math.floor(right / size) + 1):
+            for y in range(math.floor(top / size), math.floor(bottom / size) + 1):
+                key = (x, y)
+                if key in self.__dirtyChunks:
+                    self.__bake(key)
+                
+                chunk = self.__surfaces.get(key)
+                if chunk is None:
+                    continue
+
+                # Blits truncate towards zero, so chunks left or above the screen's corner would be a pixel off their neighbours
+                if zoom == 1:
+                    blits.append((chunk, (math.floor(x * size - cameraPosition[0] + halfWidth), math.floor(y * size - cameraPosition[1] + halfHeight))))
+                    continue
 
-    def Update(self):
-        surface = self.GetTransformedSurface()
-        
-        surface = pg.transform.rotozoom(surface, self.__rotation, self.__zoom)
+                # Edges are rounded on their own, so neighbouring chunks meet without gaps
+                chunkLeft = round((x * size - cameraPosition[0]) * zoom + halfWidth)
+                chunkTop = round((y * size - cameraPosition[1]) * zoom + halfHeight)
+                scaledSize = (round(((x + 1) * size - cameraPosition[0]) * zoom + halfWidth) - chunkLeft, 
+                              round(((y + 1) * size - cameraPosition[1]) * zoom + halfHeight) - chunkTop)
+                scaled = self.__scaledSurfaces.get(key)
+                if scaled is None or scaled[0] != scaledSize:
+                    scaled = (scaledSize, pg.transform.scale(chunk, scaledSize))
+                    self.__scaledSurfaces[key] = scaled
+                blits.append((scaled[1], (chunkLeft, chunkTop)))
 
-        self.renderSurface.blit(surface, pg.Vector2(self.renderSurface.size) / 2 - pg.Vector2(surface.size) / 2)
+        return blits
 
 
 class Layer:
     __layersCount = 0
 
+    # Layers which take the camera zoom in "Render" and can draw straight on the screen
+    _supportsZoom = False
+
     def __init__(self, name: str):
         self.name = name
 
@@ -2548,6 +4959,10 @@ class Layer:
 
         self._scene = None
 
+        self._blitsCount = 0
+        self._culledCount = 0
+        self._capturedBlits: list[tuple[pg.Surface, tuple[float, float]]] = None
+
     @property
     def id(self):
         return self.__id
@@ -2562,6 +4977,34 @@ class Layer:
                 leftTopCorner[1] + screenSize[1] / 2 >= -objectSize[1] and
                 leftTopCorner[1] + screenSize[1] / 2 <= screenSize[1])
 
+    def GetRenderStatistics(self):
+        return {"blits": self._blitsCount, "culled": self._culledCount}
+
+    def _SubmitBlits(self, surface: pg.Surface, blits: list[tuple[pg.Surface, tuple[float, float]]]):
+        # The whole layer is drawn with a single call instead of a blit per object
+        self._blitsCount = len(blits)
+        if self._capturedBlits is not None:
+            # Dirty rendering draws the queue later, only where the screen has changed
+            self._capturedBlits = blits
+            return
+        
+        if blits:
+            surface.fblits(blits)
+
+    def _canRenderDirty(self):
+        # Only layers which draw everything through "_SubmitBlits" can be redrawn in parts
+        return False
+
+    def _captureBlits(self, surface: pg.Surface, cameraPosition: pg.Vector2, zoom: float = 1):
+        self._capturedBlits = []
+        if self._supportsZoom:
+            self.Render(surface, cameraPosition, zoom)
+        else:
+            self.Render(surface, cameraPosition)
+
+        blits, self._capturedBlits = self._capturedBlits, None
+        return blits
+
     def Update(self, dt: float):
         pass
 
@@ -2570,6 +5013,8 @@ class Layer:
 
 # Objects and game objects are synonymns
 class ObjectsLayer(Layer):
+    _supportsZoom = True
+
     def __init__(self, name: str):
         super().__init__(name)        
         self.__gameObjects: list[GameObject] = []
@@ -2577,6 +5022,15 @@ class ObjectsLayer(Layer):
         self._showHitboxes = False
         self._hitboxColor = "red"
         self._hitboxWidth = 1
+        self._visibleHitboxes: list[Geometry] = []
+
+        self.__cullingGrid: SpatialHash = None
+        self.__cullingMargin = 64
+        self.__staticChunks: StaticChunks = None
+        self.__movedGeometries: set[Geometry] = set()
+        self.__indexedObjects: dict[Geometry, GameObject] = {}
+        self.__renderOrder: dict[GameObject, int] = {}
+        self.__nextRenderOrder = 0
 
     def ObjectsCount(self):
         return len(self.__gameObjects)
@@ -2589,32 +5043,196 @@ class ObjectsLayer(Layer):
     def HideHitboxes(self):
         self._showHitboxes = False
 
+    def _canRenderDirty(self):
+        return not self._showHitboxes
+
+    def EnableSpatialCulling(self, cellSize: float = 256, margin: float = 64):
+        # Objects are kept in a grid, so only the cells around the camera are visited while rendering.
+        # "margin" is how far images may stick out of their geometry and still be drawn
+        self.__cullingGrid = SpatialHash(cellSize)
+        self.__cullingMargin = margin
+        self.__reindexObjects()
+
+    def DisableSpatialCulling(self):
+        self.__cullingGrid = None
+        self.__reindexObjects()
+
+    def IsSpatialCullingEnabled(self):
+        return self.__cullingGrid is not None
+
+    def EnableStaticBaking(self, chunkSize: int = 512):
+        # Images are drawn once into chunks of the world and only the chunks in view are blitted.
+        # Moved, added and removed objects rebake their chunks, other image changes need "RebakeObject".
+        # Without a zoom the layer looks exactly as unbaked, zoomed chunks are scaled as a whole and may differ by a pixel
+        self.__staticChunks = StaticChunks(chunkSize)
+        self.__reindexObjects()
+
+    def DisableStaticBaking(self):
+        self.__staticChunks = None
+        self.__reindexObjects()
+
+    def IsStaticBakingEnabled(self):
+        return self.__staticChunks is not None
+    
+    def GetStaticChunks(self):
+        return self.__staticChunks
+
+    def RebakeObject(self, gameObject: GameObject):
+        if self.__staticChunks is not None and gameObject in self.__renderOrder:
+            self.__bakeObject(gameObject)
+
+    def _getObjects(self):
+        return self.__gameObjects
+    
+    def __reindexObjects(self):
+        for geometry in self.__indexedObjects:
+            geometry._movedGeometries = None
+        self.__movedGeometries.clear()
+        self.__indexedObjects.clear()
+        self.__renderOrder.clear()
+        self.__nextRenderOrder = 0
+        for gameObject in self._getObjects():
+            self._indexObject(gameObject)
+
+    def _indexObject(self, gameObject: GameObject):
+        # Objects are only tracked while spatial culling or static baking is enabled
+        if self.__cullingGrid is None and self.__staticChunks is None:
+            return
+        
+        geometry = gameObject.geometry
+        geometry._movedGeometries = self.__movedGeometries
+        self.__indexedObjects[geometry] = gameObject
+        self.__renderOrder[gameObject] = self.__nextRenderOrder
+        self.__nextRenderOrder += 1
+        if self.__cullingGrid is not None:
+            self.__cullingGrid.Update(gameObject, geometry.GetAABB())
+        if self.__staticChunks is not None:
+            self.__bakeObject(gameObject)
+
+    def _unindexObject(self, gameObject: GameObject):
+        if self.__cullingGrid is None and self.__staticChunks is None:
+            return
+        
+        geometry = gameObject.geometry
+        geometry._movedGeometries = None
+        self.__movedGeometries.discard(geometry)
+        self.__indexedObjects.pop(geometry, None)
+        self.__renderOrder.pop(gameObject, None)
+        if self.__cullingGrid is not None:
+            self.__cullingGrid.Remove(gameObject)
+        if self.__staticChunks is not None:
+            self.__staticChunks.Remove(gameObject)
+
+    def __bakeObject(self, gameObject: GameObject):
+        image = gameObject.image
+        if not image:
+            self.__staticChunks.Remove(gameObject)
+            return
+        
+        position = gameObject.geometry.positionView + gameObject._imageToGeometryOffset
+        self.__staticChunks.Update(gameObject, image.GetSurface(), image.GetBlitPosition(position))
+
+    def __updateMovedObjects(self):
+        for geometry in self.__movedGeometries:
+            gameObject = self.__indexedObjects.get(geometry)
+            if gameObject is None:
+                continue
+            if self.__cullingGrid is not None:
+                self.__cullingGrid.Update(gameObject, geometry.GetAABB())
+            if self.__staticChunks is not None:
+                self.__bakeObject(gameObject)
+        self.__movedGeometries.clear()
+
+    def _getRenderCandidates(self, surface: pg.Surface, cameraPosition: pg.Vector2, gameObjects: list[GameObject], zoom: float = 1):
+        # The surface is already sized for the camera's rotation, so with the zoom it spans the visible part of the world
+        self.__updateMovedObjects()
+        if self.__cullingGrid is None:
+            return gameObjects
+
+        halfWidth = surface.width / 2 / zoom + self.__cullingMargin
+        halfHeight = surface.height / 2 / zoom + self.__cullingMargin
+        view = AABB(pg.Vector2(cameraPosition[0] - halfWidth, cameraPosition[1] - halfHeight), 
+                    pg.Vector2(cameraPosition[0] + halfWidth, cameraPosition[1] + halfHeight))
+        
+        candidates = self.__cullingGrid.Query(view)
+        candidates.sort(key=self.__renderOrder.__getitem__)
+        self._culledCount += len(gameObjects) - len(candidates)
+        return candidates
+
     def Update(self, dt):
         super().Update(dt)
 
         for gameObject in self.__gameObjects:
             gameObject.Update()
 
-    def Render(self, surface: pg.Surface, cameraPosition: pg.Vector2):
-        for gameObject in self.__gameObjects:
+    def Render(self, surface: pg.Surface, cameraPosition: pg.Vector2, zoom: float = 1):
+        # Hitboxes are drawn per object, so a baked layer is rendered object by object while they are shown
+        if self.__staticChunks is not None and not self._showHitboxes:
+            self.__updateMovedObjects()
+            self._culledCount = 0
+            self._SubmitBlits(surface, self.__staticChunks.GetBlits(surface, cameraPosition, zoom))
+            return
+
+        blits = []
+        self._culledCount = 0
+        for gameObject in self._getRenderCandidates(surface, cameraPosition, self.__gameObjects, zoom):
             if not gameObject.image and not self._showHitboxes:
                 continue
 
-            self._renderObject(surface, cameraPosition, gameObject)
-
-    def _renderObject(self, surface: pg.Surface, cameraPosition: pg.Vector2, gameObject: GameObject):
-        position = gameObject.geometry.position - cameraPosition + pg.Vector2(surface.size) / 2 + gameObject._imageToGeometryOffset
-
-        aabb = gameObject.geometry.GetAABB()
-        visibleSize = gameObject.image.GetSurface().size if gameObject.image else aabb.size 
+            self._renderObject(surface, cameraPosition, gameObject, blits, None, zoom)
+
+        self._SubmitBlits(surface, blits)
+        self._drawHitboxes(surface, cameraPosition, zoom)
+
+    def _renderObject(self, surface: pg.Surface, cameraPosition: pg.Vector2, gameObject: GameObject, blits: list, offset: pg.Vector2 = None, zoom: float = 1):
+        # Visible images are only queued, hitboxes are drawn after the queue is submitted.
+        # With a zoom the world is scaled around the camera and images are drawn pre-scaled
+        halfWidth, halfHeight = surface.width / 2, surface.height / 2
+        offsetX, offsetY = offset if offset else (0, 0)
+        geometry = gameObject.geometry
+        position = geometry.positionView
+        imageOffset = gameObject._imageToGeometryOffset
+        if zoom == 1:
+            # The camera is snapped to whole pixels and images are floored, like the chunks of a baked layer,
+            # so baked and unbaked layers draw images at the same pixels and don't shift against each other
+            shiftX, shiftY = math.floor(halfWidth - cameraPosition[0]), math.floor(halfHeight - cameraPosition[1])
+            x = position.x + imageOffset.x + offsetX + shiftX
+            y = position.y + imageOffset.y + offsetY + shiftY
+        else:
+            x = (position.x - cameraPosition[0] + imageOffset.x + offsetX) * zoom + halfWidth
+            y = (position.y - cameraPosition[1] + imageOffset.y + offsetY) * zoom + halfHeight
+
+        image = gameObject.image
+        if image:
+            # Images are culled where they are drawn, rotated ones reach past their geometry
+            imageSurface = image.GetScaledSurface(zoom)
+            width, height = imageSurface.size
+            left, top = image.GetBlitPosition((x, y), zoom)
+            if zoom == 1:
+                left, top = math.floor(left), math.floor(top)
+        else:
+            aabb = geometry.GetAABB()
+            width, height = aabb.width * zoom, aabb.height * zoom
+            if zoom == 1:
+                left, top = aabb.min.x + offsetX + shiftX, aabb.min.y + offsetY + shiftY
+            else:
+                left = (aabb.min.x - cameraPosition[0] + offsetX) * zoom + halfWidth
+                top = (aabb.min.y - cameraPosition[1] + offsetY) * zoom + halfHeight
 
-        if self.DoesObjectFitInScreen(aabb.min - cameraPosition, pg.Vector2(visibleSize), surface.size):
-            if gameObject.image:
-                gameObject.image.RenderOn(surface, position)
+        if -width <= left <= surface.width and -height <= top <= surface.height:
+            if image:
+                blits.append((imageSurface, (left, top)))
             if self._showHitboxes:
-                gameObject.geometry.DrawOnScreen(surface, self._hitboxColor, self._hitboxWidth, cameraPosition)
+                self._visibleHitboxes.append(geometry)
+        else:
+            self._culledCount += 1
+
+        return pg.Vector2(x, y)
 
-        return position
+    def _drawHitboxes(self, surface: pg.Surface, cameraPosition: pg.Vector2, zoom: float = 1):
+        for geometry in self._visibleHitboxes:
+            geometry.DrawOnScreen(surface, self._hitboxColor, self._hitboxWidth, cameraPosition, zoom)
+        self._visibleHitboxes.clear()
 
     def AddObject(self, gameObject: GameObject):
         if gameObject.IsDestroyed():
@@ -2623,6 +5241,7 @@ class ObjectsLayer(Layer):
             ErrorHandler.Throw("InvalidObject", "ObjectsLayer", "AddObject", "gameObject", "You cannot link \"GameObject\" instance which has a \"Rigidbody\" component to \"ObjectsLayer\" ")
 
         self.__gameObjects.append(gameObject)
+        self._indexObject(gameObject)
         gameObject._layer = self
 
     def GetObjectByIndex(self, index: int):
@@ -2632,6 +5251,7 @@ class ObjectsLayer(Layer):
     def RemoveObject(self, gameObject: GameObject):
         if gameObject in self.__gameObjects:
             self.__gameObjects.remove(gameObject)
+            self._unindexObject(gameObject)
 
 
 class PhysicsLayer(ObjectsLayer):
@@ -2652,6 +5272,45 @@ class PhysicsLayer(ObjectsLayer):
 
         self.__joints: list[Joint] = []
 
+        self.__broadPhase: BroadPhaseBackend = BruteForceBroadPhase()
+        self.__broadPhaseTemplate = pickle.dumps(self.__broadPhase)
+        self.__queryStructureSynchronized = False
+        self.__queryVersions: list[int] = None
+
+        self.__sleepingEnabled = False
+        self.__linearSleepThreshold = 10
+        self.__angularSleepThreshold = 0.1
+        self.__timeToSleep = 0.5
+        self.__islandsCount = 0
+        self.__sleepingIslandsCount = 0
+
+        self.__rigidbodyBatch: RigidbodyBatch = None
+        self.__batchMinimumBodies = 0
+        self.__batchedNarrowPhase = False
+
+        self.__contactCache: ContactCache = None
+        self.__warmStartingFactor = 1
+
+        self.__fixedTimestep: float = None
+        self.__maxFixedSteps = 5
+        self.__accumulator = 0
+        self.__interpolation = False
+        self.__previousTransforms: dict[GameObject, tuple[pg.Vector2, float]] = {}
+
+        self.__islandWorkerPool: IslandWorkerPool = None
+        self.__islandWorkers: int = None
+        self.__parallelIslands = False
+        self.__parallelMinBodies = 200
+
+        self.__iterativeSolver = False
+        self.__velocityIterations = 8
+        self.__positionIterations = 3
+        self.__positionSlop = 0.5
+        self.__restitutionThreshold = 20
+
+        self.__collisionGroups: dict[str, int] = {"default": 1}
+        self.__collisionGroupMasks: dict[str, int] = {"default": 0xFFFFFFFF}
+
     def ShowHitboxes(self, color = "red", width=1, showVelocities=False):
         super().ShowHitboxes(color, width)
         self.__showVelocities = showVelocities
@@ -2668,23 +5327,36 @@ class PhysicsLayer(ObjectsLayer):
     def HideJoints(self):
         self.__showJoints = False
 
+    def EnableStaticBaking(self, chunkSize: int = 512):
+        ErrorHandler.Throw("InvalidOperation", "PhysicsLayer", "EnableStaticBaking", None, "Physics objects can move at any time, use a separate \"ObjectsLayer\" for static images")
+
+    def _canRenderDirty(self):
+        return super()._canRenderDirty() and not self.__showJoints
+
     def AddJoint(self, joint: Joint):
         if joint in self.__joints or joint._layer:
             ErrorHandler.Throw("ExistenceError", "PhysicsLayer", "AddJoint", None, "Tried to add a joint that was already added")
         
         joint._layer = self
         self.__joints.append(joint)
+        joint.bodyA.WakeUp()
+        joint.bodyB.WakeUp()
 
     def RemoveJoint(self, joint: Joint):
         if joint in self.__joints:
             self.__joints.remove(joint)
+            joint.bodyA.WakeUp()
+            joint.bodyB.WakeUp()
             return
 
         ErrorHandler.ThrowMissingError("PhysicsLayer", "RemoveJoint", "joint")
         
     def RemoveJointByIndex(self, index: int):
         if index >= 0 and index < len(self.__joints):
-            return self.__joints.pop(index)
+            joint = self.__joints.pop(index)
+            joint.bodyA.WakeUp()
+            joint.bodyB.WakeUp()
+            return joint
 
     def SetGravity(self, value: tuple | pg.Vector2):
         self._gravity = pg.Vector2(value)
@@ -2692,38 +5364,664 @@ class PhysicsLayer(ObjectsLayer):
     def SetPhysicsIterations(self, value: int):
         self.__physicsIterations = pg.math.clamp(value, 1, 128)
 
-    def Update(self, dt):
-        super().Update(dt)
+    def SetRestitutionThreshold(self, value: float):
+        # Contacts approaching slower than this, in pixels per second, don't bounce with warm starting or the iterative solver
+        self.__restitutionThreshold = max(value, 0)
+
+    def EnableSleeping(self, linearThreshold: float = 10, angularThreshold: float = 0.1, timeToSleep: float = 0.5):
+        self.__sleepingEnabled = True
+        self.__linearSleepThreshold = max(linearThreshold, 0)
+        self.__angularSleepThreshold = max(angularThreshold, 0)
+        self.__timeToSleep = max(timeToSleep, 0)
+
+    def DisableSleeping(self):
+        self.__sleepingEnabled = False
+        self.__islandsCount = 0
+        self.__sleepingIslandsCount = 0
+        for gameObject in self.__gameObjects:
+            gameObject.GetComponent(Rigidbody).WakeUp()
+
+    def IsSleepingEnabled(self):
+        return self.__sleepingEnabled
+
+    def EnableBatchedIntegration(self, minimumBodies: int = 100):
+        # Off by default, it only pays off for bodies that mostly move freely. Velocities are kept in arrays, but positions stay in 
+        # the geometries and are moved body by body, and bodies in contact are copied out of the arrays for the solvers every step.
+        # "benchmarks/integration.py": frames of 1000-5000 falling bodies take 0.57-0.64x as long, settled piles 1.06x and up to 1.95x.
+        # Below "minimumBodies" bodies NumPy's per call overhead outweighs the vectorized pass, so they are integrated one by one
+        if self.__rigidbodyBatch is None:
+            self.__rigidbodyBatch = RigidbodyBatch(len(self.__gameObjects))
+        self.__batchMinimumBodies = max(minimumBodies, 0)
+        self.__updateRigidbodyBatch()
+
+    def DisableBatchedIntegration(self):
+        if self.__rigidbodyBatch is not None:
+            self.__rigidbodyBatch.Clear()
+            self.__rigidbodyBatch = None
+
+    def IsBatchedIntegrationEnabled(self):
+        return self.__rigidbodyBatch is not None
+
+    def __updateRigidbodyBatch(self):
+        if self.__rigidbodyBatch is None:
+            return
+        
+        if len(self.__gameObjects) < self.__batchMinimumBodies:
+            self.__rigidbodyBatch.Clear()
+        elif not self.__rigidbodyBatch:
+            for gameObject in self.__gameObjects:
+                self.__rigidbodyBatch.Add(gameObject.GetComponent(Rigidbody))
+
+    def EnableBatchedNarrowPhase(self):
+        if np is None:
+            ErrorHandler.Throw("ModuleNotFoundError", "PhysicsLayer", "EnableBatchedNarrowPhase", None, "Batched narrow phase requires NumPy. Install it with \"pip install numpy\"")
+        self.__batchedNarrowPhase = True
+
+    def DisableBatchedNarrowPhase(self):
+        self.__batchedNarrowPhase = False
+
+    def IsBatchedNarrowPhaseEnabled(self):
+        return self.__batchedNarrowPhase
+
+    def EnableWarmStarting(self, factor: float = 1):
+        self.__warmStartingFactor = pg.math.clamp(factor, 0, 1)
+        if self.__contactCache is None:
+            self.__contactCache = ContactCache()
+
+    def DisableWarmStarting(self):
+        self.__contactCache = None
+
+    def IsWarmStartingEnabled(self):
+        return self.__contactCache is not None
+    
+    def GetContactCache(self):
+        return self.__contactCache
+
+    def EnableFixedTimestep(self, frequency: float = 120, maxStepsPerFrame: int = 5, interpolation: bool = True):
+        if frequency <= 0:
+            ErrorHandler.Throw("ValueError", "PhysicsLayer", "EnableFixedTimestep", "frequency", "Frequency must be greater than zero")
+
+        self.__fixedTimestep = 1 / frequency
+        self.__maxFixedSteps = pg.math.clamp(maxStepsPerFrame, 1, 128)
+        self.__accumulator = 0
+        self.__interpolation = interpolation
+        self.__previousTransforms.clear()
+        self.__updateIntegratedBodies()
+
+    def DisableFixedTimestep(self):
+        self.__checkParallelIslands("DisableFixedTimestep", self.__iterativeSolver)
+        self.__fixedTimestep = None
+        self.__accumulator = 0
+        self.__previousTransforms.clear()
+        self.__updateIntegratedBodies()
+
+    def IsFixedTimestepEnabled(self):
+        return self.__fixedTimestep is not None
+    
+    def GetInterpolationAlpha(self):
+        if self.__fixedTimestep is None or not self.__interpolation:
+            return 1
+        return pg.math.clamp(self.__accumulator / self.__fixedTimestep, 0, 1)
+
+    def EnableParallelIslands(self, workers: int = None, minBodies: int = 200):
+        self.__checkParallelIslands("EnableParallelIslands", self.__isIntegratedByLayer(), True)
+        if self.__islandWorkers != workers:
+            self.DisableParallelIslands()
+        
+        self.__parallelIslands = True
+        self.__islandWorkers = workers
+        self.__parallelMinBodies = max(minBodies, 0)
+
+    def DisableParallelIslands(self):
+        self.__parallelIslands = False
+        if self.__islandWorkerPool is not None:
+            self.__islandWorkerPool.Close()
+        self.__islandWorkerPool = None
+
+    def __checkParallelIslands(self, function: str, integratedByLayer: bool, parallelIslands: bool = None):
+        # Workers can't run "Rigidbody.Update" with the game's frame time, so the layer has to integrate the bodies itself
+        if (self.__parallelIslands if parallelIslands is None else parallelIslands) and not integratedByLayer:
+            ErrorHandler.Throw("InvalidOperation", "PhysicsLayer", function, None, "Parallel islands need a fixed time step or the iterative solver")
+
+    def IsParallelIslandsEnabled(self):
+        return self.__parallelIslands
+
+    def EnableIterativeSolver(self, velocityIterations: int = 8, positionIterations: int = 3):
+        self.__iterativeSolver = True
+        self.__velocityIterations = pg.math.clamp(velocityIterations, 1, 128)
+        self.__positionIterations = pg.math.clamp(positionIterations, 0, 128)
+        self.__updateIntegratedBodies()
+
+    def DisableIterativeSolver(self):
+        self.__checkParallelIslands("DisableIterativeSolver", self.__fixedTimestep is not None)
+        self.__iterativeSolver = False
+        self.__updateIntegratedBodies()
+
+    def __isIntegratedByLayer(self):
+        # Without a fixed time step the substep solver keeps the integration games were tuned for:
+        # bodies are also moved by their "Rigidbody.Update" with the frame's delta time on every substep
+        return self.__iterativeSolver or self.__fixedTimestep is not None
+
+    def __updateIntegratedBodies(self):
+        integratedByLayer = self.__isIntegratedByLayer()
+        for gameObject in self.__gameObjects:
+            gameObject.GetComponent(Rigidbody)._integratedByLayer = integratedByLayer
+
+    def IsIterativeSolverEnabled(self):
+        return self.__iterativeSolver
+
+    def GetSleepStatistics(self):
+        sleeping = 0
+        awake = 0
+        for gameObject in self.__gameObjects:
+            rigidbody = gameObject.GetComponent(Rigidbody)
+            if rigidbody.IsSleeping():
+                sleeping += 1
+            elif not rigidbody.IsStatic():
+                awake += 1
+
+        return {"bodies": len(self.__gameObjects), 
+                "sleeping": sleeping, 
+                "awake": awake, 
+                "islands": self.__islandsCount, 
+                "sleepingIslands": self.__sleepingIslandsCount}
+
+    def __updateSleeping(self, dt: float, collidedPairs: list[tuple[int, int]], transforms: list[tuple[float, float, float]]):
+        # Resting contacts are resolved by moving bodies apart, so gravity keeps their velocity above zero.
+        # A body is considered resting by how far it actually moved during the frame
+        linearThreshold = (self.__linearSleepThreshold * dt) ** 2
+        angularThreshold = self.__angularSleepThreshold * dt
+        for gameObject, (x, y, angle) in zip(self.__gameObjects, transforms):
+            rigidbody = gameObject.GetComponent(Rigidbody)
+            if not rigidbody.IsAwake():
+                continue
+
+            position = gameObject.geometry.position
+            if (position.x - x) ** 2 + (position.y - y) ** 2 > linearThreshold or abs(gameObject.geometry.angleRadians - angle) > angularThreshold:
+                rigidbody._sleepTime = 0
+            else:
+                rigidbody._sleepTime += dt
+
+        # Sleeping bodies don't report contacts anymore, so they are kept together by the island they fell asleep in
+        indices = {gameObject.GetComponent(Rigidbody): index for index, gameObject in enumerate(self.__gameObjects)}
+        for index, gameObject in enumerate(self.__gameObjects):
+            island = gameObject.GetComponent(Rigidbody)._sleepIsland
+            if island and island[0] in indices:
+                collidedPairs.append((indices[island[0]], index))
+
+        islands = CollisionsResolver.BuildIslands(self.__gameObjects, collidedPairs, self.__joints)
+        self.__islandsCount = len(islands)
+        self.__sleepingIslandsCount = 0
+        for island in islands:
+            rigidbodies = [self.__gameObjects[index].GetComponent(Rigidbody) for index in island]
+            if all(rigidbody.IsSleeping() for rigidbody in rigidbodies):
+                self.__sleepingIslandsCount += 1
+                continue
+
+            # An island can only sleep as a whole, one moving body keeps everything it touches awake
+            if min(rigidbody._sleepTime for rigidbody in rigidbodies) < self.__timeToSleep:
+                for rigidbody in rigidbodies:
+                    if rigidbody.IsSleeping():
+                        rigidbody.WakeUp()
+                continue
+
+            for rigidbody in rigidbodies:
+                rigidbody._Sleep(rigidbodies)
+            self.__sleepingIslandsCount += 1
+
+    def AddCollisionGroup(self, name: str):
+        if name in self.__collisionGroups:
+            ErrorHandler.ThrowExistenceError("PhysicsLayer", "AddCollisionGroup", "collision group name")
+        if len(self.__collisionGroups) >= 32:
+            ErrorHandler.Throw("ValueError", "PhysicsLayer", "AddCollisionGroup", "name", "There can be at most 32 collision groups")
+
+        self.__collisionGroups[name] = 1 << len(self.__collisionGroups)
+        self.__collisionGroupMasks[name] = 0xFFFFFFFF
+        return self.__collisionGroups[name]
+
+    def GetCollisionGroup(self, name: str):
+        if name not in self.__collisionGroups:
+            ErrorHandler.Throw("ValueError", "PhysicsLayer", "GetCollisionGroup", "name", f"Unknown collision group \"{name}\"")
+
+        return self.__collisionGroups[name]
+
+    def SetCollisionGroup(self, gameObject: GameObject, name: str):
+        category = self.GetCollisionGroup(name)
+        gameObject.geometry.collisionCategory = category
+        gameObject.geometry.collisionMask = self.__collisionGroupMasks[name]
+
+    def SetGroupsCollision(self, firstName: str, secondName: str, value: bool):
+        first = self.GetCollisionGroup(firstName)
+        second = self.GetCollisionGroup(secondName)
+
+        if value:
+            self.__collisionGroupMasks[firstName] |= second
+            self.__collisionGroupMasks[secondName] |= first
+        else:
+            self.__collisionGroupMasks[firstName] &= ~second
+            self.__collisionGroupMasks[secondName] &= ~first
+
+        for gameObject in self.__gameObjects:
+            geometry = gameObject.geometry
+            if geometry.collisionCategory == first:
+                geometry.collisionMask = self.__collisionGroupMasks[firstName]
+            elif geometry.collisionCategory == second:
+                geometry.collisionMask = self.__collisionGroupMasks[secondName]
+
+    def SetBroadPhase(self, value: str | BroadPhaseBackend, **parameters):
+        if isinstance(value, str):
+            if value not in broadPhaseBackends.keys():
+                ErrorHandler.Throw("ValueError", "PhysicsLayer", "SetBroadPhase", "value", f"Unknown broad phase \"{value}\". Available: {", ".join(broadPhaseBackends.keys())}")
+            value = broadPhaseBackends[value](**parameters)
+
+        if not issubclass(type(value), BroadPhaseBackend):
+            ErrorHandler.Throw("TypeError", "PhysicsLayer", "SetBroadPhase", "value", "Broad phase must be a name or inherit from \"BroadPhaseBackend\"")
+
+        self.__broadPhase.Clear()
+        self.__broadPhase = value
+        self.__broadPhaseTemplate = pickle.dumps(value)
+        self.__queryStructureSynchronized = False
+        for gameObject in self.__gameObjects:
+            self.__broadPhase.AddBody(gameObject)
+
+    def GetBroadPhase(self):
+        return self.__broadPhase
+
+    def __synchronizeQueryStructure(self):
+        # Geometries moved by game code between updates are noticed by their versions
+        versions = [gameObject.geometry.version for gameObject in self.__gameObjects]
+        if not self.__queryStructureSynchronized or versions != self.__queryVersions:
+            self.__broadPhase.Synchronize(self.__gameObjects)
+            self.__queryStructureSynchronized = True
+            self.__queryVersions = versions
+
+    @overload
+    def QueryAABB(self, aabb: AABB) -> list[GameObject]: ...
+
+    @overload
+    def QueryAABB(self, rect: pg.Rect | tuple[int, int, int, int]) -> list[GameObject]: ...
+
+    def QueryAABB(self, arg: AABB | pg.Rect | tuple):
+        if not isinstance(arg, AABB):
+            rect = pg.Rect(arg)
+            arg = AABB(pg.Vector2(rect.topleft), pg.Vector2(rect.bottomright))
+
+        self.__synchronizeQueryStructure()
+        return self.__broadPhase.QueryAABB(self.__gameObjects, arg)
+
+    def QueryPoint(self, point: pg.Vector2 | tuple):
+        point = pg.Vector2(point)
+        self.__synchronizeQueryStructure()
+        return [body for body in self.__broadPhase.QueryAABB(self.__gameObjects, AABB(point, point)) if collisions.CollidePoint(body.geometry, point)]
+
+    def __rayCast(self, start: pg.Vector2 | tuple, end: pg.Vector2 | tuple):
+        start, end = pg.Vector2(start), pg.Vector2(end)
+        closest: list[RaycastHit] = [None]
+
+        def callback(body: GameObject, maxFraction: float):
+            result = collisions.RayCastGeometry(body.geometry, start, end, maxFraction)
+            if result is None:
+                return -1
+            
+            fraction, point, normal = result
+            closest[0] = RaycastHit(body, point, normal, fraction)
+            return fraction
+
+        self.__broadPhase.RayCast(self.__gameObjects, start, end, callback)
+        return closest[0]
+
+    def __shapeCast(self, geometry: Geometry, end: pg.Vector2 | tuple, tolerance: float):
+        end = pg.Vector2(end)
+        start = pg.Vector2(geometry.position)
+        aabb = geometry.GetAABB()
+        motion = end - start
+        swept = AABB(pg.Vector2(min(aabb.min.x, aabb.min.x + motion.x), min(aabb.min.y, aabb.min.y + motion.y)),
+                     pg.Vector2(max(aabb.max.x, aabb.max.x + motion.x), max(aabb.max.y, aabb.max.y + motion.y)))
+
+        closest = None
+        for body in self.__broadPhase.QueryAABB(self.__gameObjects, swept):
+            if body.geometry is geometry or not collisions.ShouldCollide(geometry, body.geometry):
+                continue
+
+            result = collisions.ShapeCastGeometry(geometry, end, body.geometry, closest.fraction if closest else 1, tolerance)
+            if result is not None and (closest is None or result[0] < closest.fraction):
+                fraction, point, normal = result
+                closest = RaycastHit(body, point, normal, fraction)
+
+        return closest
+
+    def RayCast(self, start: pg.Vector2 | tuple, end: pg.Vector2 | tuple):
+        self.__synchronizeQueryStructure()
+        return self.__rayCast(start, end)
+
+    def RayCastBatch(self, rays: list[tuple[pg.Vector2 | tuple, pg.Vector2 | tuple]]):
+        self.__synchronizeQueryStructure()
+        return [self.__rayCast(start, end) for start, end in rays]
+
+    def ShapeCast(self, geometry: Geometry, end: pg.Vector2 | tuple, tolerance: float = 0.5):
+        self.__synchronizeQueryStructure()
+        return self.__shapeCast(geometry, end, tolerance)
+
+    def ShapeCastBatch(self, casts: list[tuple[Geometry, pg.Vector2 | tuple]], tolerance: float = 0.5):
+        self.__synchronizeQueryStructure()
+        return [self.__shapeCast(geometry, end, tolerance) for geometry, end in casts]
+
+    def OverlapShape(self, geometry: Geometry):
+        self.__synchronizeQueryStructure()
+        return [body for body in self.__broadPhase.QueryAABB(self.__gameObjects, geometry.GetAABB()) 
+                if body.geometry is not geometry and collisions.IntersectGeometries(geometry, body.geometry)[0]]
+
+    def __updateIterative(self, dt: float, collidedPairs: list[tuple[int, int]]):
+        # Collisions are detected once per step, only the built constraints are iterated
+        rigidbodies = [gameObject.GetComponent(Rigidbody) for gameObject in self.__gameObjects]
+        constraints: list[Joint] = []
+        for joint in self.__joints:
+            if joint.bodyA.IsAwake() or joint.bodyB.IsAwake():
+                if joint.isConstraint:
+                    constraints.append(joint)
+                else:
+                    joint.Update(dt)
+
+        contactPairs = []
+        contacts: list[CollisionManifold] = []
+        self.__broadPhase.FindPairs(self.__gameObjects, contactPairs)
+        CollisionsResolver.NarrowPhase(self.__gameObjects, contactPairs, collidedPairs=collidedPairs, batchPolygons=self.__batchedNarrowPhase, 
+                                       contactCache=self.__contactCache, contacts=contacts, contactTolerance=self.__positionSlop, 
+                                       slop=self.__positionSlop / 2)
+
+        if self.__rigidbodyBatch:
+            self.__rigidbodyBatch.IntegrateVelocities(self._gravity, dt)
+            self.__unpackSolvedBodies(contactPairs, constraints)
+        for rigidbody in rigidbodies:
+            if not rigidbody._batch and not rigidbody.IsSleeping():
+                rigidbody._IntegrateVelocity(dt)
+
+        for contact in contacts:
+            CollisionsResolver.PrepareContact(contact, self.__warmStartingFactor if self.__contactCache is not None else 0, self.__restitutionThreshold)
+
+        for _ in range(self.__velocityIterations):
+            for joint in constraints:
+                joint.SolveVelocity(dt)
+            for contact in contacts:
+                CollisionsResolver.SolveContactVelocity(contact)
+
+        if self.__contactCache is not None:
+            for contact in contacts:
+                self.__contactCache.Store(contact)
+
+        continuousBodies = self.__getContinuousBodies()
+        starts = [gameObject.geometry.position for gameObject in continuousBodies]
+        if self.__rigidbodyBatch:
+            self.__rigidbodyBatch.IntegratePositions(dt)
+        for rigidbody in rigidbodies:
+            if not rigidbody._batch and not rigidbody.IsSleeping():
+                rigidbody._IntegratePosition(dt)
+        self.__sweepBodies(continuousBodies, starts)
+
+        for _ in range(self.__positionIterations):
+            contactsError = max((CollisionsResolver.SolveContactPosition(contact, self.__positionSlop) for contact in contacts), default=0)
+            jointsError = max((joint.SolvePosition() for joint in constraints), default=0)
+            if contactsError <= self.__positionSlop and jointsError <= self.__positionSlop:
+                break
+
+        self.__queryStructureSynchronized = False
+
+    def __unpackSolvedBodies(self, contactPairs: list[tuple[int, int]], joints: list[Joint]):
+        rigidbodies = [self.__gameObjects[index].GetComponent(Rigidbody) for pair in contactPairs for index in pair]
+        rigidbodies += [body for joint in joints for body in (joint.bodyA, joint.bodyB)]
+        self.__rigidbodyBatch.Unpack(rigidbodies)
+
+    def __sweepBodies(self, bodies: list[GameObject], starts: list[pg.Vector2]):
+        # Only static bodies are swept against, fast bodies hitting each other are left to the narrow phase
+        for gameObject, start in zip(bodies, starts):
+            aabb = gameObject.geometry.GetAABB()
+            offset = start - gameObject.geometry.position
+            sweptAABB = AABB(pg.Vector2(min(aabb.min.x, aabb.min.x + offset.x), min(aabb.min.y, aabb.min.y + offset.y)), 
+                             pg.Vector2(max(aabb.max.x, aabb.max.x + offset.x), max(aabb.max.y, aabb.max.y + offset.y)))
+            
+            obstacles = [body for body in self.QueryAABB(sweptAABB) 
+                         if body is not gameObject and body.GetComponent(Rigidbody).IsStatic() and collisions.ShouldCollide(gameObject.geometry, body.geometry)]
+            if obstacles:
+                CollisionsResolver.SweepBody(gameObject, start, obstacles)
+
+        if bodies:
+            self.__queryStructureSynchronized = False
+
+    def __getContinuousBodies(self):
+        return [gameObject for gameObject in self.__gameObjects 
+                if gameObject.GetComponent(Rigidbody).IsContinuousCollisionEnabled() and gameObject.GetComponent(Rigidbody).IsAwake()]
+
+    def __updateSubsteps(self, dt: float, collidedPairs: list[tuple[int, int]]):
         contactPairs = []
-        dt = self.__game.time.GetDeltaTime() / self.__physicsIterations
+        dt /= self.__physicsIterations
         for _ in range(self.__physicsIterations):
             contactPairs.clear()
-
-            CollisionsResolver.BroadPhase(self.__gameObjects, dt, contactPairs)
-            CollisionsResolver.NarrowPhase(self.__gameObjects, contactPairs)
+            # Fast bodies are swept from where they were before any move of the substep, including the frame move of "Rigidbody.Update"
+            continuousBodies = self.__getContinuousBodies()
+            starts = [gameObject.geometry.position for gameObject in continuousBodies]
+            if not self.__isIntegratedByLayer():
+                for gameObject in self.__gameObjects:
+                    gameObject.Update()
+                # Batched bodies are skipped by "Rigidbody.Update", this integrates them over the frame like the others
+                if self.__rigidbodyBatch:
+                    self.__rigidbodyBatch.Integrate(self._gravity, self.__game.time.GetDeltaTime())
+
+            if self.__rigidbodyBatch:
+                self.__rigidbodyBatch.Integrate(self._gravity, dt)
+            CollisionsResolver.IntegrateBodies(self.__gameObjects, dt)
+            self.__sweepBodies(continuousBodies, starts)
+            self.__broadPhase.FindPairs(self.__gameObjects, contactPairs)
+            if self.__rigidbodyBatch:
+                self.__unpackSolvedBodies(contactPairs, self.__joints)
+            # Warm started contacts are solved once all of them are found, so no pair is solved while its bodies still overlap others
+            contacts = [] if self.__contactCache is not None else None
+            CollisionsResolver.NarrowPhase(self.__gameObjects, contactPairs, collidedPairs=collidedPairs, batchPolygons=self.__batchedNarrowPhase, 
+                                           contactCache=self.__contactCache, contacts=contacts, contactTolerance=self.__positionSlop, slop=self.__positionSlop / 2)
+            if contacts:
+                for contact in contacts:
+                    CollisionsResolver.PrepareContact(contact, self.__warmStartingFactor, self.__restitutionThreshold)
+                for contact in contacts:
+                    CollisionsResolver.SolveContactVelocity(contact)
+                    self.__contactCache.Store(contact)
+            self.__queryStructureSynchronized = False
 
             for joint in self.__joints:
-                joint.Update(dt)
+                if joint.bodyA.IsAwake() or joint.bodyB.IsAwake():
+                    joint.Update(dt)
+
+    def __findMovingPairs(self, dt: float):
+        # Bodies that don't touch yet may collide during the step, their bounds are grown by how far they can move so they end up in the same island
+        indices = {gameObject: index for index, gameObject in enumerate(self.__gameObjects)}
+        gravity = self._gravity.length() * dt
+        movingPairs = []
+        for index, gameObject in enumerate(self.__gameObjects):
+            rigidbody = gameObject.GetComponent(Rigidbody)
+            if rigidbody.IsStatic() or not rigidbody.IsAwake():
+                continue
 
-    def Render(self, surface: pg.Surface, cameraPosition: pg.Vector2):
+            aabb = gameObject.geometry.GetAABB()
+            radius = (aabb.max - aabb.min).length() / 2
+            margin = (rigidbody.linearVelocity.length() + gravity + rigidbody.force.length() * rigidbody.invMass * dt + abs(rigidbody.angularVelocity) * radius) * dt
+            margin += self.__positionSlop
+            grownAABB = AABB(aabb.min - pg.Vector2(margin, margin), aabb.max + pg.Vector2(margin, margin))
+            movingPairs += [(index, indices[body]) for body in self.QueryAABB(grownAABB) if body is not gameObject]
+        return movingPairs
+
+    def __updateIslands(self, dt: float, collidedPairs: list[tuple[int, int]]):
+        # Disconnected islands are stepped by worker processes, each one as if it was alone in the layer.
+        # Results are merged back in island order, so they don't depend on the number of workers
+        contactPairs = []
+        self.__broadPhase.FindPairs(self.__gameObjects, contactPairs)
+        contactPairs += self.__findMovingPairs(dt)
+        islands = CollisionsResolver.BuildIslands(self.__gameObjects, contactPairs, self.__joints)
+        islands = [island for island in islands if any(self.__gameObjects[index].GetComponent(Rigidbody).IsAwake() for index in island)]
+        if len(islands) < 2 or sum(len(island) for island in islands) < self.__parallelMinBodies:
+            return False
+
+        islandOf = {index: number for number, island in enumerate(islands) for index in island}
+        statics: list[set[int]] = [set() for _ in islands]
+        indices = {gameObject: index for index, gameObject in enumerate(self.__gameObjects)}
+        connections = contactPairs + [(indices[joint.objectA], indices[joint.objectB]) for joint in self.__joints if joint.objectA in indices and joint.objectB in indices]
+        for i, j in connections:
+            if i in islandOf and j not in islandOf:
+                statics[islandOf[i]].add(j)
+            elif j in islandOf and i not in islandOf:
+                statics[islandOf[j]].add(i)
+
+        if self.__islandWorkerPool is None:
+            self.__islandWorkerPool = IslandWorkerPool(self.__islandWorkers or os.cpu_count() or 1)
+
+        # Island layers of the workers get the same settings as this one, they are stepped with its fixed time step
+        settings = (tuple(self._gravity), self.__physicsIterations, (self.__velocityIterations, self.__positionIterations) if self.__iterativeSolver else None, 
+                    self.__warmStartingFactor if self.__contactCache is not None else None, self.__broadPhaseTemplate, self.__batchedNarrowPhase, 
+                    self.__batchMinimumBodies if self.__rigidbodyBatch is not None else None, self.__restitutionThreshold)
+        slots = self.__islandWorkerPool.Synchronize(self.__gameObjects, settings)
+        state = self.__islandWorkerPool.GetState()
+        geometryRows = {gameObject.geometry: row for row, gameObject in enumerate(self.__gameObjects)}
+        tasks = []
+        islandRows = []
+        for island, islandStatics in zip(islands, statics):
+            rows = sorted(island + list(islandStatics))
+            for row in rows:
+                gameObject = self.__gameObjects[row]
+                rigidbody = gameObject.GetComponent(Rigidbody)
+                slot = slots[row]
+                state[slot * ISLAND_STATE_STRIDE:(slot + 1) * ISLAND_STATE_STRIDE] = [*gameObject.geometry.position, gameObject.geometry.angleRadians, 
+                                                                                    *rigidbody.linearVelocity, rigidbody.angularVelocity, 
+                                                                                    *rigidbody.force, rigidbody.torque, rigidbody.IsStatic(), rigidbody.IsSleeping(), 
+                                                                                    rigidbody.AreRotationsFrozen(), rigidbody.IsContinuousCollisionEnabled()]
+
+            rowIndices = {row: i for i, row in enumerate(rows)}
+            joints = [(type(joint), rowIndices[indices[joint.objectA]], rowIndices[indices[joint.objectB]], 
+                       {name: value for name, value in joint.__dict__.items() if name not in ["objectA", "objectB", "bodyA", "bodyB", "_layer"]})
+                      for joint in self.__joints if indices.get(joint.objectA) in rowIndices and indices.get(joint.objectB) in rowIndices]
+            exclusions = [(i, rowIndices[geometryRows[geometry]]) for i, row in enumerate(rows) if self.__gameObjects[row].geometry._cannotCollideWith 
+                          for geometry in self.__gameObjects[row].geometry._cannotCollideWith if geometryRows.get(geometry) in rowIndices]
+            tasks.append(([slots[row] for row in rows], joints, exclusions))
+            islandRows.append(rows)
+
+        for rows, (islandPairs, awake) in zip(islandRows, self.__islandWorkerPool.Step(tasks, dt)):
+            for row, isAwake in zip(rows, awake):
+                gameObject = self.__gameObjects[row]
+                rigidbody = gameObject.GetComponent(Rigidbody)
+                if rigidbody.IsStatic():
+                    continue
+
+                slot = slots[row]
+                x, y, angle, vx, vy, angularVelocity, fx, fy, torque = state[slot * ISLAND_STATE_STRIDE:slot * ISLAND_STATE_STRIDE + 9]
+                if isAwake and rigidbody.IsSleeping():
+                    rigidbody.WakeUp()
+                gameObject.geometry.SetPosition((x, y))
+                gameObject.geometry.SetAngleRadians(angle)
+                rigidbody.linearVelocity = (vx, vy)
+                rigidbody.angularVelocity = angularVelocity
+                rigidbody.force = (fx, fy)
+                rigidbody.torque = torque
+
+                if gameObject.image:
+                    gameObject.image.rotation = gameObject.geometry.angle
+
+            if collidedPairs is not None:
+                collidedPairs.extend((rows[i], rows[j]) for i, j in islandPairs)
+
+        # Static bodies still move with their own velocity. Islands may share them, so they are moved here like "_Solve" would and not by the workers
+        staticBodies = []
         for gameObject in self.__gameObjects:
+            rigidbody = gameObject.GetComponent(Rigidbody)
+            if rigidbody.IsStatic() and not rigidbody.IsSleeping():
+                staticBodies.append(rigidbody)
+        if staticBodies and self.__rigidbodyBatch:
+            self.__rigidbodyBatch.Unpack(staticBodies)
+
+        substeps = 1 if self.__iterativeSolver else self.__physicsIterations
+        for rigidbody in staticBodies:
+            for _ in range(substeps):
+                rigidbody._IntegrateVelocity(dt / substeps)
+                rigidbody._IntegratePosition(dt / substeps)
+
+        self.__queryStructureSynchronized = False
+        return True
+
+    def _Solve(self, dt: float, collidedPairs: list[tuple[int, int]]):
+        if self.__iterativeSolver:
+            self.__updateIterative(dt, collidedPairs)
+        else:
+            self.__updateSubsteps(dt, collidedPairs)
+
+    def __step(self, dt: float):
+        collidedPairs = None
+        if self.__sleepingEnabled:
+            collidedPairs = []
+            transforms = [(*gameObject.geometry.position, gameObject.geometry.angleRadians) for gameObject in self.__gameObjects]
+
+        if not (self.__parallelIslands and self.__updateIslands(dt, collidedPairs)):
+            self._Solve(dt, collidedPairs)
+
+        if self.__sleepingEnabled:
+            self.__updateSleeping(dt, collidedPairs, transforms)
+
+        if self.__contactCache is not None:
+            self.__contactCache.Prune()
+
+    def Update(self, dt):
+        super().Update(dt)
+        dt = self.__game.time.GetDeltaTime()
+        # Components and animations are updated once per frame, however many physics steps it takes.
+        # The substep solver without a fixed time step updates them on every substep instead
+        if self.__isIntegratedByLayer():
+            for gameObject in self.__gameObjects:
+                gameObject.Update()
+
+        if self.__fixedTimestep is None:
+            self.__step(dt)
+            return
+
+        self.__accumulator += dt
+        steps = 0
+        while self.__accumulator >= self.__fixedTimestep and steps < self.__maxFixedSteps:
+            if self.__interpolation:
+                self.__previousTransforms = {gameObject: (gameObject.geometry.position, gameObject.geometry.angle) for gameObject in self.__gameObjects}
+            self.__step(self.__fixedTimestep)
+            self.__accumulator -= self.__fixedTimestep
+            steps += 1
+
+        # After a hitch the remaining time is dropped instead of being caught up during the next frames
+        if steps == self.__maxFixedSteps:
+            self.__accumulator = min(self.__accumulator, self.__fixedTimestep)
+
+    def Render(self, surface: pg.Surface, cameraPosition: pg.Vector2, zoom: float = 1):
+        alpha = self.GetInterpolationAlpha()
+        blits = []
+        velocities: list[tuple[pg.Vector2, pg.Vector2]] = []
+        self._culledCount = 0
+        for gameObject in self._getRenderCandidates(surface, cameraPosition, self.__gameObjects, zoom):
             if not gameObject.image and not self._showHitboxes:
                 continue
 
-            position = self._renderObject(surface, cameraPosition, gameObject)
+            # Objects are drawn between their last two physics steps, so motion stays smooth when steps and frames don't line up
+            offset = None
+            previous = self.__previousTransforms.get(gameObject) if self.__interpolation else None
+            if previous:
+                offset = (previous[0] - gameObject.geometry.position) * (1 - alpha)
+                angle = previous[1] + (gameObject.geometry.angle - previous[1]) * alpha
+                if gameObject.image and gameObject.image.rotation != angle:
+                    gameObject.image.rotation = angle
+
+            position = self._renderObject(surface, cameraPosition, gameObject, blits, offset, zoom)
             if self.__showVelocities:
-                pg.draw.line(surface, 
-                             self._hitboxColor, 
-                             position, 
-                             position + gameObject.GetComponent(Rigidbody).linearVelocity, 
-                             self._hitboxWidth)
+                velocities.append((position, position + gameObject.GetComponent(Rigidbody).linearVelocity * zoom))
+
+        self._SubmitBlits(surface, blits)
+        self._drawHitboxes(surface, cameraPosition, zoom)
+        for start, end in velocities:
+            pg.draw.line(surface, self._hitboxColor, start, end, self._hitboxWidth)
                 
         if self.__showJoints:
             for joint in self.__joints:
                 pg.draw.line(surface,
                                 self.__jointsColor,
-                                joint.objectA.geometry.GetAnchor(joint.anchorAIndex) - cameraPosition + pg.Vector2(surface.size) / 2,
-                                joint.objectB.geometry.GetAnchor(joint.anchorBIndex) - cameraPosition + pg.Vector2(surface.size) / 2,
+                                (joint.objectA.geometry.GetAnchor(joint.anchorAIndex) - cameraPosition) * zoom + pg.Vector2(surface.size) / 2,
+                                (joint.objectB.geometry.GetAnchor(joint.anchorBIndex) - cameraPosition) * zoom + pg.Vector2(surface.size) / 2,
                                 self.__jointsWidth)
 
     def AddObject(self, gameObject: GameObject):
@@ -2733,8 +6031,294 @@ class PhysicsLayer(ObjectsLayer):
             ErrorHandler.Throw("MissingError", "PhysicsLayer", "AddObject", None, "You cannot add a \"GameObject\" to PhysicsLayer if it hasn't got a \"Rigidbody\" component")
 
         self.__gameObjects.append(gameObject)
+        self.__broadPhase.AddBody(gameObject)
+        if self.__rigidbodyBatch:
+            self.__rigidbodyBatch.Add(gameObject.GetComponent(Rigidbody))
+        self.__updateRigidbodyBatch()
+        gameObject.GetComponent(Rigidbody)._integratedByLayer = self.__isIntegratedByLayer()
+        self._indexObject(gameObject)
         gameObject._layer = self
 
+    def RemoveObject(self, gameObject: GameObject):
+        if gameObject in self.__gameObjects:
+            gameObject.GetComponent(Rigidbody).WakeUp()
+            self.__gameObjects.remove(gameObject)
+            self.__broadPhase.RemoveBody(gameObject)
+            if self.__rigidbodyBatch:
+                self.__rigidbodyBatch.Remove(gameObject.GetComponent(Rigidbody))
+                self.__updateRigidbodyBatch()
+            if self.__contactCache is not None:
+                self.__contactCache.Remove(gameObject)
+            self.__previousTransforms.pop(gameObject, None)
+            gameObject.GetComponent(Rigidbody)._integratedByLayer = False
+            self._unindexObject(gameObject)
+
+    def ObjectsCount(self):
+        return len(self.__gameObjects)
+
+    def _getObjects(self):
+        return self.__gameObjects
+
+    def GetObjectByIndex(self, index: int):
+        if index >= 0 and index < len(self.__gameObjects):
+            return self.__gameObjects[index]
+
+
+class IslandWorkerPool:
+    # Worker processes that keep every body of a physics layer and a layer for each island they step, for as long as the island lasts.
+    # Transforms and velocities go through shared memory, the pipes only carry added and removed bodies, settings and the islands to step
+    def __init__(self, workers: int):
+        # Workers share the resource tracker of this process, otherwise each one would unlink the shared memory it attached to when it exits
+        resource_tracker.ensure_running()
+        self.__connections = []
+        self.__processes: list[Process] = []
+        for _ in range(max(workers, 1)):
+            connection, workerConnection = Pipe()
+            process = Process(target=_runIslandWorker, args=(workerConnection,), daemon=True)
+            process.start()
+            workerConnection.close()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+
+        self.__slots: dict[GameObject, int] = {}
+        self.__freeSlots: list[int] = []
+        self.__capacity = 0
+        # The shared memory and the array viewing it, both replaced when the layer outgrows them
+        self.__memory = [None, None]
+        self.__settings = None
+        self.__islandWorkers: dict[tuple[int, ...], int] = {}
+        self.__finalizer = weakref.finalize(self, _closeIslandWorkers, self.__connections, self.__processes, self.__memory)
+
+    def Close(self):
+        self.__finalizer()
+
+    def GetState(self):
+        return self.__memory[1]
+
+    def __broadcast(self, message: tuple):
+        for connection in self.__connections:
+            connection.send(message)
+
+    def __resize(self, capacity: int):
+        memory = SharedMemory(create=True, size=capacity * ISLAND_STATE_STRIDE * ctypes.sizeof(ctypes.c_double))
+        self.__broadcast(("memory", memory.name, capacity))
+        for connection in self.__connections:
+            connection.recv()
+
+        _releaseIslandMemory(self.__memory)
+        self.__memory[:] = [memory, (ctypes.c_double * (capacity * ISLAND_STATE_STRIDE)).from_buffer(memory.buf)]
+        self.__capacity = capacity
+
+    def Synchronize(self, gameObjects: list[GameObject], settings: tuple):
+        # Bodies keep their slot in the shared state while they are in the layer, workers only hear about the ones added and removed since the last step
+        present = set(gameObjects)
+        removed = [gameObject for gameObject in self.__slots if gameObject not in present]
+        if removed:
+            slots = [self.__slots.pop(gameObject) for gameObject in removed]
+            self.__freeSlots.extend(slots)
+            self.__broadcast(("remove", slots))
+
+        added = []
+        for gameObject in gameObjects:
+            if gameObject in self.__slots:
+                continue
+
+            slot = self.__freeSlots.pop() if self.__freeSlots else len(self.__slots)
+            self.__slots[gameObject] = slot
+            rigidbody = gameObject.GetComponent(Rigidbody)
+            # Geometries the body can't collide with are sent with the islands holding both of them
+            geometry = gameObject.geometry
+            cannotCollideWith, geometry._cannotCollideWith = geometry._cannotCollideWith, None
+            try:
+                added.append((slot, pickle.dumps((geometry, rigidbody.material, rigidbody.IsStatic(), rigidbody.AreRotationsFrozen()))))
+            finally:
+                geometry._cannotCollideWith = cannotCollideWith
+
+        if len(self.__slots) > self.__capacity:
+            self.__resize(max(len(self.__slots) * 2, 64))
+        if added:
+            self.__broadcast(("add", added))
+        if settings != self.__settings:
+            self.__settings = settings
+            self.__broadcast(("settings", settings))
+
+        return [self.__slots[gameObject] for gameObject in gameObjects]
+
+    def Step(self, tasks: list[tuple[list[int], list, list[tuple[int, int]]]], dt: float):
+        # An island stays with the worker that stepped it last, so its layer and contact cache are reused. New islands go to the least loaded worker
+        loads = [0] * len(self.__connections)
+        workerTasks: list[list[int]] = [[] for _ in self.__connections]
+        islandWorkers = {}
+        for number, (slots, *_) in enumerate(tasks):
+            key = tuple(slots)
+            worker = self.__islandWorkers.get(key)
+            if worker is None:
+                worker = loads.index(min(loads))
+            loads[worker] += len(slots)
+            islandWorkers[key] = worker
+            workerTasks[worker].append(number)
+        self.__islandWorkers = islandWorkers
+
+        for connection, numbers in zip(self.__connections, workerTasks):
+            connection.send(("step", [tasks[number] for number in numbers], dt))
+
+        results = [None] * len(tasks)
+        for connection, numbers in zip(self.__connections, workerTasks):
+            for number, result in zip(numbers, connection.recv()):
+                results[number] = result
+        return results
+
+
+def _releaseIslandMemory(memory: list):
+    # The array viewing the shared memory has to go before the memory can be closed
+    if memory[0] is not None:
+        memory[1] = None
+        memory[0].close()
+        memory[0].unlink()
+        memory[0] = None
+
+def _closeIslandWorkers(connections: list, processes: list[Process], memory: list):
+    for connection in connections:
+        try:
+            connection.send(("close",))
+        except (BrokenPipeError, OSError):
+            pass
+    for connection, process in zip(connections, processes):
+        process.join(1)
+        if process.is_alive():
+            process.terminate()
+        connection.close()
+    _releaseIslandMemory(memory)
+
+def _runIslandWorker(connection):
+    # Runs in a worker process until its pool is closed
+    memory: SharedMemory = None
+    state = None
+    descriptions: dict[int, bytes] = {}
+    layers: dict[tuple[int, ...], PhysicsLayer] = {}
+    settings = None
+    while True:
+        message = connection.recv()
+        match message[0]:
+            case "close":
+                break
+
+            case "memory":
+                if memory is not None:
+                    state = None
+                    memory.close()
+                memory = SharedMemory(message[1])
+                state = (ctypes.c_double * (message[2] * ISLAND_STATE_STRIDE)).from_buffer(memory.buf)
+                connection.send(True)
+
+            case "add":
+                descriptions.update(message[1])
+
+            case "remove":
+                removed = set(message[1])
+                for key in [key for key in layers if removed.intersection(key)]:
+                    del layers[key]
+                for slot in removed:
+                    del descriptions[slot]
+
+            case "settings":
+                settings = message[1]
+                layers.clear()
+
+            case "step":
+                _, tasks, dt = message
+                keys = [tuple(slots) for slots, *_ in tasks]
+                for key in layers.keys() - set(keys):
+                    del layers[key]
+
+                results = []
+                for key, (slots, joints, exclusions) in zip(keys, tasks):
+                    if key not in layers:
+                        layers[key] = _createIslandLayer([descriptions[slot] for slot in slots], settings)
+                    results.append(_stepIsland(layers[key], slots, joints, exclusions, state, dt))
+                connection.send(results)
+
+    state = None
+    if memory is not None:
+        memory.close()
+
+def _createIslandLayer(descriptions: list[bytes], settings: tuple):
+    gravity, physicsIterations, iterativeSolver, warmStartingFactor, broadPhase, batchedNarrowPhase, batchMinimumBodies, restitutionThreshold = settings
+
+    layer = PhysicsLayer("Island")
+    layer.SetGravity(gravity)
+    layer.SetPhysicsIterations(physicsIterations)
+    layer.SetRestitutionThreshold(restitutionThreshold)
+    layer.SetBroadPhase(pickle.loads(broadPhase))
+    if iterativeSolver:
+        layer.EnableIterativeSolver(*iterativeSolver)
+    else:
+        layer.EnableFixedTimestep(interpolation=False)
+    if warmStartingFactor is not None:
+        layer.EnableWarmStarting(warmStartingFactor)
+    if batchedNarrowPhase:
+        layer.EnableBatchedNarrowPhase()
+    if batchMinimumBodies is not None:
+        layer.EnableBatchedIntegration(batchMinimumBodies)
+
+    for description in descriptions:
+        geometry, material, isStatic, frozenRotations = pickle.loads(description)
+        layer.AddObject(GameObject(geometry, components=[Rigidbody(material, isStatic, frozenRotations)]))
+    return layer
+
+def _stepIsland(layer: PhysicsLayer, slots: list[int], joints: list, exclusions: list[tuple[int, int]], state, dt: float):
+    # Steps one island with the bodies' state from the shared memory and writes them back to it
+    gameObjects = layer._getObjects()
+
+    while layer.RemoveJointByIndex(0):
+        pass
+    for jointType, a, b, attributes in joints:
+        joint: Joint = jointType.__new__(jointType)
+        joint.__dict__.update(attributes)
+        joint.objectA, joint.objectB = gameObjects[a], gameObjects[b]
+        joint.bodyA, joint.bodyB = gameObjects[a].GetComponent(Rigidbody), gameObjects[b].GetComponent(Rigidbody)
+        joint._layer = None
+        layer.AddJoint(joint)
+
+    for gameObject in gameObjects:
+        gameObject.geometry._cannotCollideWith = None
+    for a, b in exclusions:
+        gameObjects[a].geometry.cannotCollideWith.add(gameObjects[b].geometry)
+
+    for slot, gameObject in zip(slots, gameObjects):
+        x, y, angle, vx, vy, angularVelocity, fx, fy, torque, isStatic, isSleeping, frozenRotations, continuousCollision = state[slot * ISLAND_STATE_STRIDE:(slot + 1) * ISLAND_STATE_STRIDE]
+        rigidbody = gameObject.GetComponent(Rigidbody)
+        if rigidbody.IsStatic() != bool(isStatic):
+            rigidbody.SetStatic(bool(isStatic))
+        if rigidbody.AreRotationsFrozen() != bool(frozenRotations):
+            rigidbody.FreezeRotations() if frozenRotations else rigidbody.UnfreezeRotations()
+        rigidbody.EnableContinuousCollision() if continuousCollision else rigidbody.DisableContinuousCollision()
+
+        gameObject.geometry.SetPosition((x, y))
+        gameObject.geometry.SetAngleRadians(angle)
+        rigidbody.linearVelocity = (vx, vy)
+        rigidbody.angularVelocity = angularVelocity
+        rigidbody.force = (fx, fy)
+        rigidbody.torque = torque
+        if isSleeping and not rigidbody.IsSleeping():
+            rigidbody._Sleep([rigidbody])
+        elif not isSleeping and rigidbody.IsSleeping():
+            rigidbody.WakeUp()
+
+    collidedPairs: list[tuple[int, int]] = []
+    layer._Solve(dt, collidedPairs)
+    if layer.GetContactCache() is not None:
+        layer.GetContactCache().Prune()
+
+    # Forces of joints updated after the last substep are integrated with the next step
+    for slot, gameObject in zip(slots, gameObjects):
+        rigidbody = gameObject.GetComponent(Rigidbody)
+        if not rigidbody.IsStatic():
+            state[slot * ISLAND_STATE_STRIDE:slot * ISLAND_STATE_STRIDE + 9] = [*gameObject.geometry.position, gameObject.geometry.angleRadians, 
+                                                                              *rigidbody.linearVelocity, rigidbody.angularVelocity, *rigidbody.force, rigidbody.torque]
+
+    return collidedPairs, [not gameObject.GetComponent(Rigidbody).IsSleeping() for gameObject in gameObjects]
+
 
 class Light:
     def __init__(self, position: pg.Vector2 | tuple, radius: float, brightness: float, intensity: float, color: str | pg.Color | tuple[int, int, int] = "white"):
@@ -2853,6 +6437,9 @@ class ParticleTemplate:
         self.alwaysMovingStrength = alwaysMovingSpeed
 
 class Particle:
+    __slots__ = ("__lifetime", "template", "__scale", "position", "color", "__originalSurface", "_currentSurface", "linearVelocity", 
+                 "constantVelocity", "alwaysMoveTo", "alwaysMovingStrength", "scaleVelocity", "colorVelocity")
+
     def __init__(self, lifetime: float, position: pg.Vector2, template: ParticleTemplate, shape):
         self.__lifetime = lifetime
         
@@ -3028,6 +6615,9 @@ class ParticleSystem(Layer):
     def AddTemplate(self, name: str, template: ParticleTemplate):
         self.particleTemplates[name] = template
 
+    def _canRenderDirty(self):
+        return True
+
     def EmitCustomShape(self, templateName: str, lifetime: float, shape: EmitterShape, count: int = 1):
         if templateName in self.particleTemplates.keys():
             for _ in range(count):
@@ -3058,11 +6648,20 @@ class ParticleSystem(Layer):
             idx += 1
 
     def Render(self, surface, cameraPosition):
+        blits = []
+        self._culledCount = 0
+        halfWidth, halfHeight = surface.width / 2, surface.height / 2
         for particle in self.__particles:
-            position = particle.position - cameraPosition + pg.Vector2(surface.size) / 2
+            particleSurface = particle._currentSurface
+            x = particle.position.x - cameraPosition[0]
+            y = particle.position.y - cameraPosition[1]
 
-            if self.DoesObjectFitInScreen(position - pg.Vector2(surface.size) / 2, particle._currentSurface.size, surface.size):
-                surface.blit(particle._currentSurface, position - pg.Vector2(particle._currentSurface.size) / 2)
+            if self.DoesObjectFitInScreen((x, y), particleSurface.size, surface.size):
+                blits.append((particleSurface, (x + halfWidth - particleSurface.width / 2, y + halfHeight - particleSurface.height / 2)))
+            else:
+                self._culledCount += 1
+
+        self._SubmitBlits(surface, blits)
 
 
 class TileType:
@@ -3084,6 +6683,8 @@ class TileType:
 """
 
 class Tile(GameObject):
+    __slots__ = ("__tileType", "properties")
+
     def __init__(self, position: tuple, size: float, tileType: TileType):
         super().__init__(Geometry(position[0], position[1], (size, size)), tileType.imageName)
 
@@ -3100,44 +6701,283 @@ class Tile(GameObject):
         return pg.Vector2(self.__tileType.imageOffset)
 
 class Tilemap(Layer):
-    def __init__(self, name, tileSize: float, tileTypes: list[TileType]):
+    # Tiles are kept as tile type indices in square chunks of the grid. "Tile" objects are only created 
+    # for tiles which need one: types with a custom update function, tiles with properties and tiles looked up by "tilemap[x, y]"
+    def __init__(self, name, tileSize: float, tileTypes: list[TileType], chunkSize: int = 16):
         super().__init__(name)
         
+        if chunkSize <= 0:
+            ErrorHandler.Throw("ValueError", "Tilemap", None, "chunkSize", "Chunk size has to be positive")
+
         self.__tileSize = tileSize
+        self.__chunkSize = int(chunkSize)
         self.__tileTypes = {type.ID: type for type in tileTypes}
-        self.tiles: list[Tile] = []
+        # Index 0 is an empty cell
+        self.__typeList: list[TileType] = [None] + list(self.__tileTypes.values())
+        self.__typeIndices = {type.ID: index for index, type in enumerate(self.__typeList) if type}
+        self.__typeImages: list[Image] = [None] * len(self.__typeList)
+        self.__chunks: dict[tuple[int, int], array] = {}
+        self.__tiles: dict[tuple[int, int], dict[int, Tile]] = {}
+        self.__tilesCount = 0
+        self.__bakedChunks: dict[tuple[int, int], pg.Surface] = None
+        self.__bakeMargin = 0
+        self.__warnedTiles = False
+
+    def __getitem__(self, cell: tuple[int, int]):
+        return self.GetTile(cell[0], cell[1])
+    
+    def __setitem__(self, cell: tuple[int, int], tileTypeID: str):
+        self.SetTile(cell[0], cell[1], tileTypeID)
+
+    def __delitem__(self, cell: tuple[int, int]):
+        self.RemoveTile(cell[0], cell[1])
 
-    def __getitem__(self, key):
-        return self.tiles[key]
+    def __contains__(self, cell: tuple[int, int]):
+        return self.GetTileType(cell[0], cell[1]) is not None
 
     @property
     def tileSize(self):
         return self.__tileSize
+    
+    @property
+    def chunkSize(self):
+        return self.__chunkSize
+
+    @property
+    def tiles(self):
+        # Kept for code written against the old list of every "Tile". Every tile gets a "Tile" object,
+        # the tuple is a snapshot and tiles are added or removed by "SetTile" and "RemoveTile"
+        if not self.__warnedTiles:
+            ErrorHandler.Warn("DeprecationWarning", "Tilemap", "tiles", None, "\"tiles\" creates a \"Tile\" for every tile, use \"GetTile\", \"GetTileType\" or \"GetTiles\" instead")
+            self.__warnedTiles = True
+
+        size = self.__chunkSize
+        return tuple(self.GetTile(key[0] * size + local % size, key[1] * size + local // size) 
+                     for key, chunk in self.__chunks.items() for local, index in enumerate(chunk) if index)
+
+    def TilesCount(self):
+        return self.__tilesCount
+    
+    def WorldToCell(self, position: pg.Vector2 | tuple[float, float]):
+        return (math.floor(position[0] / self.__tileSize), math.floor(position[1] / self.__tileSize))
+
+    def __locate(self, x: int, y: int):
+        key = (x // self.__chunkSize, y // self.__chunkSize)
+        return key, (y - key[1] * self.__chunkSize) * self.__chunkSize + x - key[0] * self.__chunkSize
+    
+    def GetTileType(self, x: int, y: int):
+        # Looks the cell up without creating a "Tile"
+        key, local = self.__locate(x, y)
+        chunk = self.__chunks.get(key)
+        return self.__typeList[chunk[local]] if chunk else None
+
+    def GetTile(self, x: int, y: int):
+        key, local = self.__locate(x, y)
+        chunk = self.__chunks.get(key)
+        if not chunk or not chunk[local]:
+            return None
+        
+        tiles = self.__tiles.get(key)
+        tile = tiles.get(local) if tiles else None
+        if tile is None:
+            tile = self.__createTile(x, y, key, local, self.__typeList[chunk[local]])
+        return tile
+    
+    def GetTiles(self):
+        # Only tiles which already have a "Tile" object
+        return [tile for tiles in self.__tiles.values() for tile in tiles.values()]
+
+    def __createTile(self, x: int, y: int, key: tuple[int, int], local: int, tileType: TileType):
+        tile = Tile((x * self.__tileSize, y * self.__tileSize), self.__tileSize, tileType)
+        self.__tiles.setdefault(key, {})[local] = tile
+        return tile
+
+    def SetTile(self, x: int, y: int, tileTypeID: str, properties: dict = None):
+        index = self.__typeIndices.get(tileTypeID)
+        if index is None:
+            ErrorHandler.ThrowMissingError("Tilemap", "SetTile", "tile type", "set")
+
+        self.__setCell(x, y, index, properties)
+
+    def RemoveTile(self, x: int, y: int):
+        self.__setCell(x, y, 0)
+
+    def __setCell(self, x: int, y: int, index: int, properties: dict = None):
+        key, local = self.__locate(x, y)
+        chunk = self.__chunks.get(key)
+        if chunk is None:
+            if not index:
+                return
+            chunk = self.__chunks[key] = array("H", bytes(2 * self.__chunkSize * self.__chunkSize))
+
+        self.__tilesCount += bool(index) - bool(chunk[local])
+        chunk[local] = index
+
+        tiles = self.__tiles.get(key)
+        if tiles and tiles.pop(local, None) and not tiles:
+            del self.__tiles[key]
+
+        tileType = self.__typeList[index]
+        if tileType and (tileType.cuf or properties):
+            tile = self.__createTile(x, y, key, local, tileType)
+            if properties:
+                tile.properties.update(properties)
+
+        if self.__bakedChunks:
+            margin = self.__bakeMargin
+            for chunkX in range((x - margin) // self.__chunkSize, (x + margin) // self.__chunkSize + 1):
+                for chunkY in range((y - margin) // self.__chunkSize, (y + margin) // self.__chunkSize + 1):
+                    self.__bakedChunks.pop((chunkX, chunkY), None)
+
+    def _canRenderDirty(self):
+        return True
+
+    def EnableStaticBaking(self):
+        # Every chunk of the grid is drawn once on its own surface and only the chunks in view are blitted.
+        # "SetTile" and "RemoveTile" rebake their chunks, changed images need "RebakeTiles"
+        self.__bakedChunks = {}
+        self.__bakeMargin = self.__getTypeSurfaces()[2]
+
+    def DisableStaticBaking(self):
+        self.__bakedChunks = None
+
+    def IsStaticBakingEnabled(self):
+        return self.__bakedChunks is not None
+
+    def RebakeTiles(self):
+        if self.__bakedChunks is not None:
+            self.EnableStaticBaking()
 
     def Update(self, dt: float):
         super().Update(dt)
-        for tile in self.tiles:
+        for tile in self.GetTiles():
             tile.Update()
 
+    def __getTypeSurfaces(self):
+        # Images of the tile types, how much they stick out of their cells is kept as a margin of cells around the view
+        surfaces, offsets, margin = [None], [None], 0
+        for index in range(1, len(self.__typeList)):
+            tileType = self.__typeList[index]
+            if self.__typeImages[index] is None and tileType.imageName:
+                self.__typeImages[index] = game.assets.GetImage(tileType.imageName)
+
+            image = self.__typeImages[index]
+            surface = image.GetSurface() if image else None
+            offset = pg.Vector2(tileType.imageOffset)
+            surfaces.append(surface)
+            offsets.append((offset.x, offset.y))
+            if surface:
+                margin = max(margin, math.ceil((max(surface.size) + max(abs(offset.x), abs(offset.y))) / self.__tileSize))
+
+        return surfaces, offsets, margin
+
+    def __getCellBlits(self, blits: list, left: int, top: int, right: int, bottom: int, offsetX: int, offsetY: int, typeSurfaces: tuple):
+        # Blits of the tiles in the cells from (left, top) to (right, bottom), floored and moved by the whole pixel offset,
+        # so a tile lands on the same pixel in a baked chunk and on the screen.
+        # Rows go across all chunks, so images sticking out of their cells overlap in the same order everywhere
+        surfaces, offsets, _ = typeSurfaces
+        size, tileSize, chunks = self.__chunkSize, self.__tileSize, self.__chunks
+        for y in range(top, bottom + 1):
+            chunkY = y // size
+            rowStart = (y - chunkY * size) * size
+            for chunkX in range(left // size, right // size + 1):
+                key = (chunkX, chunkY)
+                chunk = chunks.get(key)
+                if chunk is None:
+                    continue
+                
+                tiles = self.__tiles.get(key)
+                startX = chunkX * size
+                row = rowStart - startX
+                for x in range(max(left, startX), min(right, startX + size - 1) + 1):
+                    index = chunk[row + x]
+                    if not index:
+                        continue
+
+                    tile = tiles.get(row + x) if tiles else None
+                    if tile is not None:
+                        if tile.image:
+                            position, imageOffset = tile.geometry.positionView, tile.GetImageOffset()
+                            blits.append((tile.image.GetSurface(), (math.floor(position.x + imageOffset.x) + offsetX, math.floor(position.y + imageOffset.y) + offsetY)))
+                        continue
+
+                    surface = surfaces[index]
+                    if surface:
+                        blits.append((surface, (math.floor(x * tileSize + offsets[index][0]) + offsetX, math.floor(y * tileSize + offsets[index][1]) + offsetY)))
+
+    def __getChunkOrigin(self, chunkX: int, chunkY: int):
+        # Chunks start at whole pixels and end where the next one starts, also with a fractional tile size
+        chunkPixels = self.__chunkSize * self.__tileSize
+        return math.floor(chunkX * chunkPixels), math.floor(chunkY * chunkPixels)
+
+    def __bakeChunk(self, key: tuple[int, int], typeSurfaces: tuple):
+        size = self.__chunkSize
+        left, top = self.__getChunkOrigin(key[0], key[1])
+        right, bottom = self.__getChunkOrigin(key[0] + 1, key[1] + 1)
+        margin = typeSurfaces[2]
+        blits = []
+        self.__getCellBlits(blits, key[0] * size - margin, key[1] * size - margin, key[0] * size + size - 1 + margin, 
+                            key[1] * size + size - 1 + margin, -left, -top, typeSurfaces)
+        if not blits:
+            return None
+        
+        chunk = pg.Surface((right - left, bottom - top), pg.SRCALPHA)
+        chunk.fblits(blits)
+        return chunk
+
     def Render(self, surface: pg.Surface, cameraPosition: pg.Vector2):
-        for tile in self.tiles:
-            imageSurface = tile.image.GetSurface()
-            position = tile.geometry.position - cameraPosition + tile.GetImageOffset() + pg.Vector2(surface.size) / 2
+        typeSurfaces = self.__getTypeSurfaces()
+        halfWidth, halfHeight = surface.width / 2, surface.height / 2
+        # The camera moves the tiles by whole pixels, the same for baked chunks and for tiles drawn one by one
+        shiftX, shiftY = math.floor(halfWidth - cameraPosition[0]), math.floor(halfHeight - cameraPosition[1])
+        blits = []
+        if self.__bakedChunks is not None:
+            chunkPixels = self.__chunkSize * self.__tileSize
+            for chunkY in range(math.floor(-shiftY / chunkPixels), math.floor((surface.height - shiftY) / chunkPixels) + 1):
+                for chunkX in range(math.floor(-shiftX / chunkPixels), math.floor((surface.width - shiftX) / chunkPixels) + 1):
+                    key = (chunkX, chunkY)
+                    if key not in self.__bakedChunks:
+                        self.__bakedChunks[key] = self.__bakeChunk(key, typeSurfaces)
+                    
+                    chunk = self.__bakedChunks[key]
+                    if chunk is not None:
+                        left, top = self.__getChunkOrigin(chunkX, chunkY)
+                        blits.append((chunk, (left + shiftX, top + shiftY)))
 
-            if self.DoesObjectFitInScreen(position, imageSurface.size, surface.size):
-                surface.blit(imageSurface, position)
+            self._culledCount = 0
+            self._SubmitBlits(surface, blits)
+            return
+
+        # Only the cells in view are visited, widened by how far images stick out of their cells
+        margin = typeSurfaces[2]
+        left, top = self.WorldToCell((cameraPosition[0] - halfWidth, cameraPosition[1] - halfHeight))
+        right, bottom = self.WorldToCell((cameraPosition[0] + halfWidth, cameraPosition[1] + halfHeight))
+        self.__getCellBlits(blits, left - margin, top - margin, right + margin, bottom + margin, shiftX, shiftY, typeSurfaces)
+
+        self._culledCount = self.__tilesCount - len(blits)
+        self._SubmitBlits(surface, blits)
 
     def LoadTilesFromTileList(self, tiles: list[dict]):
         for tile in tiles:
-            if tile["ID"] in self.__tileTypes.keys():
-                self.tiles.append(Tile(pg.Vector2(tile["position"]) * self.__tileSize, self.__tileSize, self.__tileTypes[tile["ID"]]))
-
-    def LoadTilesFromStringList(self, tiles: list[str], startWithPosition: pg.Vector2 = pg.Vector2(0, 0)):
+            index = self.__typeIndices.get(tile["ID"])
+            if index is not None:
+                self.__setCell(int(tile["position"][0]), int(tile["position"][1]), index, tile.get("properties"))
+
+    def LoadTilesFromStringList(self, tiles: list[str], startWithPosition: pg.Vector2 = pg.Vector2(0, 0), snapToGrid: bool = False):
+        # Tiles are kept in the cells of the grid, a start position between cells is only moved onto the nearest one with "snapToGrid"
+        startX, startY = startWithPosition[0] / self.__tileSize, startWithPosition[1] / self.__tileSize
+        if snapToGrid:
+            startX, startY = round(startX), round(startY)
+        elif not (float(startX).is_integer() and float(startY).is_integer()):
+            ErrorHandler.Throw("ValueError", "Tilemap", "LoadTilesFromStringList", "startWithPosition", 
+                               "The start position has to be on the grid of the tilemap, pass \"snapToGrid=True\" to move it onto the nearest cell")
+        startX, startY = int(startX), int(startY)
+        typeIndices = self.__typeIndices
         for y, string in enumerate(tiles):
             for x, ID in enumerate(string):
-                if ID in self.__tileTypes.keys():
-                    self.tiles.append(Tile(startWithPosition + pg.Vector2(x, y) * self.__tileSize, 
-                                             self.__tileSize, self.__tileTypes[ID]))
+                index = typeIndices.get(ID)
+                if index is not None:
+                    self.__setCell(startX + x, startY + y, index)
 
     @classmethod
     def FromDictionary(cls, name: str, dict: dict, tileListType: type = Tile):
@@ -3185,6 +7025,12 @@ class Scene:
 
         self.__drawQueue = []
 
+        self.__dirtyRendering = False
+        self.__maxDirtyArea = 0.5
+        self.__previousBlits: list[tuple[Layer, set]] = None
+        self.__previousView: tuple = None
+        self._dirtyRects: list[pg.Rect] = None
+
     def AddLayer(self, layer: Layer):
         if layer._scene:
             ErrorHandler.ThrowExistenceError("Scene", "AddLayer", "layer")
@@ -3242,16 +7088,42 @@ class Scene:
         
         self.__drawQueue.append(["rect", color, pg.Rect(pg.Vector2(args[1]) - pg.Vector2(args[2]) / 2, args[2]), 0])
 
+    def EnableDirtyRendering(self, maxDirtyArea: float = 0.5):
+        # Only the parts of the screen where something has changed are redrawn and shown. 
+        # Camera movement, a bigger changed area than "maxDirtyArea" of the screen, the draw queue and layers 
+        # which can't be redrawn in parts (hitboxes, joints, "Darkness", rotated cameras) fall back to a full redraw
+        if not 0 < maxDirtyArea <= 1:
+            ErrorHandler.Throw("ValueError", "Scene", "EnableDirtyRendering", "maxDirtyArea", "Dirty area has to be between 0 and 1")
+
+        self.__dirtyRendering = True
+        self.__maxDirtyArea = maxDirtyArea
+
+    def DisableDirtyRendering(self):
+        self.__dirtyRendering = False
+        self.__previousBlits = None
+
+    def IsDirtyRenderingEnabled(self):
+        return self.__dirtyRendering
+    
+    def GetDirtyRects(self):
+        # Redrawn parts of the screen in the last frame, the whole screen's rect after a full redraw. None before the first frame
+        return self._dirtyRects
+
     def _render(self):
-        self._screenSurface.fill(self._fillColor)
         if self.camera._lookAt:
             self.camera.position += (pg.Vector2(self.camera._lookAt.geometry.position) - (self.camera.position)) / self.camera._lookAtSmoothness
 
-        self.camera.updateRequired = True
-        cameraSurface = self.camera.GetTransformedSurface()
-        cameraSurface.fill(self._fillColor)
-        layersWithoutZoomAndRotation = []
         layers = sorted(self.__layers.values(), key=lambda layer: layer.zIndex)
+        if self.__dirtyRendering and self.__canRenderDirty(layers):
+            self.__renderDirty(layers)
+            return
+        
+        self._dirtyRects = [self._screenSurface.get_rect()]
+        self.__previousBlits = None
+        self._screenSurface.fill(self._fillColor)
+        direct = self.camera.IsDirectRenderingEnabled() and not self.camera.rotation
+        cameraSurface = None if direct else self.__getCameraSurface(direct)
+        layersWithoutZoomAndRotation = []
         dt = self.__game.time.GetDeltaTime()
         for layer in layers:
             if not layer.active:
@@ -3261,11 +7133,24 @@ class Scene:
                 layer.Update(dt)
                 self.__iteration = 0
 
-            if layer.renderWithZoomAndRotation:
-                layer.Render(cameraSurface, self.camera.position)
+            if not layer.renderWithZoomAndRotation:
+                layersWithoutZoomAndRotation.append(layer)
+                continue
+
+            if direct and layer._supportsZoom:
+                # Layers drawn on the camera surface so far go on the screen first to keep their order
+                if cameraSurface is not None:
+                    self.camera.Update()
+                    cameraSurface = None
+                layer.Render(self._screenSurface, self.camera.position, self.camera.zoom)
                 continue
 
-            layersWithoutZoomAndRotation.append(layer)
+            if cameraSurface is None:
+                cameraSurface = self.__getCameraSurface(direct)
+            layer.Render(cameraSurface, self.camera.position)
+
+        if self.__drawQueue and cameraSurface is None:
+            cameraSurface = self.__getCameraSurface(direct)
 
         for drawing in self.__drawQueue:
             match (drawing[0]):
@@ -3277,13 +7162,108 @@ class Scene:
 
         self.__drawQueue.clear()
 
-        self.camera.Update()
+        if cameraSurface is not None:
+            self.camera.Update()
 
         for layer in layersWithoutZoomAndRotation:
             layer.Render(self._screenSurface, self.camera.position)
 
         self.__iteration += 1
 
+    def __canRenderDirty(self, layers: list[Layer]):
+        camera = self.camera
+        if self.__drawQueue or camera.rotation or (camera.zoom != 1 and not camera.IsDirectRenderingEnabled()):
+            return False
+        
+        for layer in layers:
+            if not layer.active:
+                continue
+            if not layer._canRenderDirty() or (camera.zoom != 1 and layer.renderWithZoomAndRotation and not layer._supportsZoom):
+                return False
+            
+        return True
+
+    def __renderDirty(self, layers: list[Layer]):
+        # Layers only queue their blits, the queues are compared with the last frame's to find what changed
+        screen = self._screenSurface
+        captured: list[tuple[Layer, list]] = []
+        layersWithoutZoomAndRotation = []
+        dt = self.__game.time.GetDeltaTime()
+        for layer in layers:
+            if not layer.active:
+                continue
+
+            if self.__iteration >= self.__game.time._slowDown:
+                layer.Update(dt)
+                self.__iteration = 0
+
+            if not layer.renderWithZoomAndRotation:
+                layersWithoutZoomAndRotation.append(layer)
+                continue
+
+            captured.append((layer, layer._captureBlits(screen, self.camera.position, self.camera.zoom)))
+
+        for layer in layersWithoutZoomAndRotation:
+            captured.append((layer, layer._captureBlits(screen, self.camera.position)))
+
+        self.__iteration += 1
+
+        screenRect = screen.get_rect()
+        view = (tuple(self.camera.position), self.camera.zoom, screen.size, self._fillColor, [layer for layer, _ in captured])
+        current = [(layer, set(blits)) for layer, blits in captured]
+        previous, previousView = self.__previousBlits, self.__previousView
+        self.__previousBlits, self.__previousView = current, view
+
+        rects = None
+        if previous is not None and view == previousView:
+            changed = []
+            for (_, blits), (_, previousBlits) in zip(current, previous):
+                for surface, position in blits ^ previousBlits:
+                    changed.append(pg.Rect(position[0] - 1, position[1] - 1, surface.width + 2, surface.height + 2))
+
+            rects = [rect.clip(screenRect) for rect in self.__mergeRects(changed)]
+            if sum(rect.w * rect.h for rect in rects) > screenRect.w * screenRect.h * self.__maxDirtyArea:
+                rects = None
+
+        if rects is None:
+            screen.fill(self._fillColor)
+            for layer, blits in captured:
+                if blits:
+                    screen.fblits(blits)
+            self._dirtyRects = [screenRect]
+            return
+        
+        # Every blit that touches a changed part is drawn again, clipped to it, so the rest of the screen stays as it is
+        blitRects = [[pg.Rect(position[0] - 1, position[1] - 1, surface.width + 2, surface.height + 2) for surface, position in blits] 
+                     for _, blits in captured]
+        for rect in rects:
+            screen.set_clip(rect)
+            screen.fill(self._fillColor, rect)
+            for (_, blits), layerRects in zip(captured, blitRects):
+                indices = rect.collidelistall(layerRects)
+                if indices:
+                    screen.fblits([blits[index] for index in indices])
+        screen.set_clip(None)
+        self._dirtyRects = rects
+
+    @staticmethod
+    def __mergeRects(rects: list[pg.Rect]):
+        merged: list[pg.Rect] = []
+        for rect in rects:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+
+        return merged
+
+    def __getCameraSurface(self, direct: bool):
+        # In direct rendering the screen is already filled, so the camera surface only adds what is drawn on it
+        cameraSurface = self.camera.GetTransformedSurface()
+        cameraSurface.fill((0, 0, 0, 0) if direct else self._fillColor)
+        return cameraSurface
+
     def SetStartFunction(self, function):
         self.start = function
 
@@ -3589,6 +7569,7 @@ class Game:
         self.input = Input()
         self.__transitions: list[SceneTransition] = []
         self.__runningTransition = None
+        self.__presentedScene: Scene = None
 
         self.projectName = projectName
         self.version = version
@@ -3673,6 +7654,7 @@ class Game:
                 display = window.get_surface()
                 self.winSize.xy = display.size
                 self._screen = pg.Surface(self.winSize, pg.SRCALPHA).convert_alpha()
+                self.__presentedScene = None
                 for scene in self.scenes:
                     scene._screenSurface = pg.Surface(display.size, pg.SRCALPHA).convert_alpha()
                     scene.camera.renderSurface = scene._screenSurface
@@ -3699,24 +7681,33 @@ class Game:
         while True:
             self.__eventsUpdate()
 
-            self._screen.fill((0, 0, 0, 0))
-
             if not self.__runningTransition:
-                self.scenes[self.__currentScene]._render()
-                self.scenes[self.__currentScene].loop()
-
-                self._screen.blit(self.scenes[self.__currentScene]._screenSurface, (0, 0))
+                scene = self.scenes[self.__currentScene]
+                scene._render()
+                scene.loop()
+
+                # Only the redrawn parts are copied, if the display still shows this scene
+                if scene._dirtyRects is not None and self.__presentedScene is scene:
+                    for rect in scene._dirtyRects:
+                        display.fill(scene._fillColor, rect)
+                        display.blit(scene._screenSurface, rect, rect)
+                else:
+                    self._screen.fill((0, 0, 0, 0))
+                    self._screen.blit(scene._screenSurface, (0, 0))
+                    display.fill(scene._fillColor)
+                    display.blit(self._screen, (0, 0))
 
-                display.fill(self.scenes[self.__currentScene]._fillColor)
+                self.__presentedScene = scene
             else:
+                self._screen.fill((0, 0, 0, 0))
                 stopped = self.__runningTransition.Update()
                 self._screen.blit(self.__runningTransition._surface, (0, 0))
                 if stopped:
                     self.__runningTransition = None
 
                 display.fill("black")
-
-            display.blit(self._screen, (0, 0))
+                display.blit(self._screen, (0, 0))
+                self.__presentedScene = None
 
             window.flip()
             self.time.Update()
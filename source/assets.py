@@ -1 +1 @@
-from .__infinova import Image, Assets, ImageGroup
\ No newline at end of file
+from .__infinova import Image, Assets, ImageGroup, SurfaceCache, imageSurfaceCache
\ No newline at end of file
@@ -1 +1 @@
-from .__infinova import Geometry, collisions
\ No newline at end of file
+from .__infinova import Geometry, collisions, SpatialHash, AABBTree
\ No newline at end of file
@@ -1,2 +1,4 @@
 from .__infinova import PhysicsMaterial as Material
-from .__infinova import Rigidbody, Joint, ForceJoint, SpringJoint, HingeJoint
\ No newline at end of file
+from .__infinova import Rigidbody, Joint, ForceJoint, SpringJoint, HingeJoint
+from .__infinova import BroadPhaseBackend, BruteForceBroadPhase, SpatialHashBroadPhase, SweepAndPruneBroadPhase, AABBTreeBroadPhase, RaycastHit
+from .__infinova import RigidbodyBatch, Vector2View, ContactCache
\ No newline at end of file